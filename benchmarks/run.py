@@ -0,0 +1,319 @@
+"""
+Benchmarks of the download, parsing and reshaping paths against a local stand-in of
+the World Bank API.
+
+Run all benchmarks and write the results as JSON:
+
+    python -m benchmarks.run --output results.json
+
+Compare against the results of an earlier run and fail on regressions:
+
+    python -m benchmarks.run --baseline results.json --threshold 0.2
+"""
+
+import argparse
+import gc
+import importlib.metadata
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+
+import polars as pl
+
+from wbwdi import WDIClient, wdi_clear_metadata_cache, wdi_get, wdi_get_indicators
+from wbwdi.perform_request import perform_request
+from wbwdi.wdi_get import parse_indicator, reshape_indicators
+
+from .server import StandInServer
+
+RESULTS_VERSION = 1
+INDICATORS = [
+    "SP.POP.TOTL",
+    "NY.GDP.PCAP.KD",
+    "SP.DYN.LE00.IN",
+    "NY.GDP.MKTP.CD",
+    "SL.UEM.TOTL.ZS",
+]
+
+
+class Benchmark:
+    """A named function whose result has a number of rows."""
+
+    def __init__(self, name: str, function: Callable, setup: Optional[Callable] = None):
+        self.name = name
+        self.function = function
+        self.setup = setup
+
+
+def create_benchmarks(server: StandInServer, quick: bool = False) -> List[Benchmark]:
+    client = WDIClient(base_url=server.base_url)
+    start_year = 2015 if quick else 2000
+    indicator_resource = "country/all/indicator/SP.POP.TOTL"
+
+    def get(*args, **kwargs):
+        return wdi_get(*args, progress=False, client=client, **kwargs)
+
+    def fetch_records():
+        return perform_request(indicator_resource, "en", 1000, client=client)
+
+    def fetch_long():
+        return get("all", INDICATORS)
+
+    return [
+        Benchmark("wdi_get_all_entities", lambda: get("all", "SP.POP.TOTL")),
+        Benchmark(
+            "wdi_get_all_entities_concurrent",
+            lambda: get("all", "SP.POP.TOTL", max_concurrency=8),
+        ),
+        Benchmark(
+            "wdi_get_all_entities_auto",
+            lambda: get("all", "SP.POP.TOTL", per_page="auto", max_concurrency=8),
+        ),
+        Benchmark(
+            "wdi_get_all_entities_pipeline",
+            lambda: get("all", "SP.POP.TOTL", max_concurrency=8, pipeline=True),
+        ),
+        Benchmark(
+            "wdi_get_multiple_indicators",
+            lambda: get("all", INDICATORS, max_workers=len(INDICATORS)),
+        ),
+        Benchmark(
+            "wdi_get_wide",
+            lambda: get("all", INDICATORS, format="wide", max_workers=len(INDICATORS)),
+        ),
+        Benchmark(
+            "wdi_get_wide_spill",
+            lambda: get(
+                "all",
+                INDICATORS,
+                format="wide",
+                max_workers=len(INDICATORS),
+                memory_budget=0,
+            ),
+        ),
+        Benchmark(
+            "wdi_get_quarterly",
+            lambda: get("all", "SP.POP.TOTL", start_year, 2023, frequency="quarter"),
+        ),
+        Benchmark(
+            "wdi_get_monthly",
+            lambda: get("all", "SP.POP.TOTL", start_year, 2023, frequency="month"),
+        ),
+        Benchmark("wdi_get_indicators", lambda: wdi_get_indicators(client=client)),
+        Benchmark("perform_request_pagination", fetch_records),
+        Benchmark("parse_indicator", parse_indicator, setup=fetch_records),
+        Benchmark(
+            "wide_pivot",
+            lambda long: reshape_indicators(long, "wide"),
+            setup=fetch_long,
+        ),
+    ]
+
+
+def run_benchmark(
+    benchmark: Benchmark, server: StandInServer, repeat: int
+) -> Dict[str, object]:
+    argument = benchmark.setup() if benchmark.setup else None
+    function = benchmark.function
+    if benchmark.setup:
+        function = lambda: benchmark.function(argument)  # noqa: E731
+
+    # The first run fills the response cache of the server and is not measured
+    count_rows(function())
+
+    seconds = []
+    requests = 0
+    for _ in range(repeat):
+        wdi_clear_metadata_cache()
+        gc.collect()
+        requests_before = server.requests
+        start = time.perf_counter()
+        result = function()
+        seconds.append(time.perf_counter() - start)
+        requests = server.requests - requests_before
+        rows = count_rows(result)
+        del result
+
+    # Allocations are traced in a separate run, because tracing slows down the code
+    wdi_clear_metadata_cache()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        function()
+        _, peak_memory = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    seconds_median = statistics.median(seconds)
+    return {
+        "name": benchmark.name,
+        "repeat": repeat,
+        "seconds": seconds,
+        "seconds_min": min(seconds),
+        "seconds_median": seconds_median,
+        "rows": rows,
+        "rows_per_second": rows / seconds_median if seconds_median else None,
+        "seconds_per_row": seconds_median / rows if rows else None,
+        "requests": requests,
+        "peak_memory_bytes": peak_memory,
+    }
+
+
+def run_import_benchmark(repeat: int) -> Dict[str, object]:
+    """Measure `import wbwdi` in fresh interpreters, where nothing is cached yet."""
+    code = (
+        "import time; start = time.perf_counter(); import wbwdi; "
+        "print(time.perf_counter() - start)"
+    )
+    seconds = [
+        float(
+            subprocess.run(
+                [sys.executable, "-c", code], capture_output=True, check=True
+            ).stdout
+        )
+        for _ in range(repeat)
+    ]
+    return {
+        "name": "import_wbwdi",
+        "repeat": repeat,
+        "seconds": seconds,
+        "seconds_min": min(seconds),
+        "seconds_median": statistics.median(seconds),
+        "rows": 0,
+        "rows_per_second": None,
+        "seconds_per_row": None,
+        "requests": 0,
+        "peak_memory_bytes": 0,
+    }
+
+
+def count_rows(result) -> int:
+    if isinstance(result, pl.DataFrame):
+        return result.height
+    return len(result)
+
+
+def run_benchmarks(
+    repeat: int = 5,
+    latency: float = 0.0,
+    quick: bool = False,
+    names: Optional[List[str]] = None,
+) -> Dict[str, object]:
+    """Run the benchmarks against a new stand-in server and return the results."""
+    settings = {
+        "repeat": repeat,
+        "latency": latency,
+        "quick": quick,
+        "entities": 60 if quick else 266,
+        "indicators": 2000 if quick else 29000,
+    }
+    results = []
+    if not names or any(name in "import_wbwdi" for name in names):
+        results.append(run_import_benchmark(repeat))
+    with StandInServer(
+        entities=settings["entities"],
+        indicators=settings["indicators"],
+        latency=latency,
+    ) as server:
+        for benchmark in create_benchmarks(server, quick):
+            if names and not any(name in benchmark.name for name in names):
+                continue
+            results.append(run_benchmark(benchmark, server, repeat))
+
+    return {
+        "version": RESULTS_VERSION,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "wbwdi": get_version(),
+            "polars": pl.__version__,
+        },
+        "settings": settings,
+        "benchmarks": results,
+    }
+
+
+def get_version() -> Optional[str]:
+    try:
+        return importlib.metadata.version("wbwdi")
+    except importlib.metadata.PackageNotFoundError:
+        return None
+
+
+def compare_results(results: dict, baseline: dict, threshold: float) -> List[str]:
+    """Return a message for every benchmark whose median time regressed."""
+    baseline_seconds = {
+        benchmark["name"]: benchmark["seconds_median"]
+        for benchmark in baseline["benchmarks"]
+    }
+    regressions = []
+    for benchmark in results["benchmarks"]:
+        previous = baseline_seconds.get(benchmark["name"])
+        if previous and benchmark["seconds_median"] > previous * (1 + threshold):
+            regressions.append(
+                f"{benchmark['name']}: {benchmark['seconds_median']:.4f}s "
+                f"(baseline {previous:.4f}s)"
+            )
+    return regressions
+
+
+def print_results(results: dict):
+    for benchmark in results["benchmarks"]:
+        print(
+            f"{benchmark['name']:<34} {benchmark['seconds_median']:>9.4f}s "
+            f"{benchmark['rows']:>9} rows {benchmark['requests']:>5} requests "
+            f"{benchmark['peak_memory_bytes'] / 1024**2:>9.1f} MiB"
+        )
+
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--output", help="Write the results as JSON to this file.")
+    parser.add_argument("--baseline", help="Compare against results in this file.")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="The relative slowdown that counts as a regression. Defaults to 0.2.",
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=0.0,
+        help="The delay in seconds of every response of the stand-in server.",
+    )
+    parser.add_argument(
+        "--quick", action="store_true", help="Use smaller synthetic responses."
+    )
+    parser.add_argument(
+        "names", nargs="*", help="Only run benchmarks whose name contains these."
+    )
+    arguments = parser.parse_args(arguments)
+
+    results = run_benchmarks(
+        arguments.repeat, arguments.latency, arguments.quick, arguments.names
+    )
+    print_results(results)
+    if arguments.output:
+        with open(arguments.output, "w") as file:
+            json.dump(results, file, indent=2)
+
+    if arguments.baseline:
+        with open(arguments.baseline) as file:
+            regressions = compare_results(results, json.load(file), arguments.threshold)
+        for regression in regressions:
+            print(f"Regression: {regression}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
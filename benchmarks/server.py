@@ -0,0 +1,248 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from itertools import product
+from string import ascii_uppercase
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlsplit
+
+# The maximum page size of the World Bank API
+MAX_PER_PAGE = 32500
+
+
+class StandInServer:
+    """
+    A local stand-in for the World Bank API that serves synthetic responses.
+
+    The server runs in a background thread and answers the indicator, entity,
+    indicator catalog and source endpoints that the package uses, with the same JSON
+    structure and pagination as the API. Responses are generated deterministically on
+    the first request and replayed from memory afterwards, so repeated runs measure the
+    client and not the generator.
+
+    Parameters
+    ----------
+    entities (int): The number of entities of `countries/all`. Defaults to 266.
+    start_year (int): The first year of indicator data. Defaults to 1960.
+    end_year (int): The last year of indicator data. Defaults to 2023.
+    indicators (int): The number of indicators of the catalog. Defaults to 29,000.
+    latency (float): The delay in seconds before each response. Defaults to 0.
+
+    Examples
+    --------
+    >>> with StandInServer(latency=0.05) as server:
+    ...     wdi_get("all", "SP.POP.TOTL", client=WDIClient(base_url=server.base_url))
+    """
+
+    def __init__(
+        self,
+        entities: int = 266,
+        start_year: int = 1960,
+        end_year: int = 2023,
+        indicators: int = 29000,
+        latency: float = 0.0,
+    ):
+        self.entities = create_entities(entities)
+        self.start_year = start_year
+        self.end_year = end_year
+        self.indicators = indicators
+        self.latency = latency
+        self.requests = 0
+        self._responses: Dict[str, bytes] = {}
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v2/"
+
+    def start(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                if server.latency:
+                    time.sleep(server.latency)
+                status, body = server.respond(self.path)
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json;charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def respond(self, path: str):
+        with self._lock:
+            self.requests += 1
+            body = self._responses.get(path)
+        if body is not None:
+            return 200, body
+
+        try:
+            body = json.dumps(self.create_body(path)).encode()
+        except LookupError:
+            return 404, b""
+        with self._lock:
+            self._responses[path] = body
+        return 200, body
+
+    def create_body(self, path: str) -> list:
+        url = urlsplit(path)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        segments = [segment for segment in url.path.split("/") if segment][1:]
+        if segments and len(segments[0]) == 2:
+            segments = segments[1:]
+
+        if len(segments) == 4 and segments[0] == "country":
+            records = self.create_indicator_records(
+                segments[1].split(";"), segments[3].split(";"), query
+            )
+        elif segments == ["countries", "all"]:
+            records = self.entities
+        elif segments == ["indicators"]:
+            records = create_indicator_catalog(self.indicators)
+        elif segments == ["sources"]:
+            records = [create_source(2, "World Development Indicators")]
+        else:
+            raise LookupError(path)
+        return paginate(records, int(query.get("per_page", 50)), query)
+
+    def create_indicator_records(self, entities, indicators, query) -> List[dict]:
+        if entities != ["all"]:
+            codes = {entity.upper() for entity in entities}
+            selected = [
+                entity
+                for entity in self.entities
+                if entity["id"] in codes or entity["iso2Code"] in codes
+            ]
+        else:
+            selected = self.entities
+        periods = create_periods(query.get("date"), self.start_year, self.end_year)
+        if query.get("mrv"):
+            periods = periods[:1]
+
+        records = []
+        for indicator, entity in product(indicators, selected):
+            for position, period in enumerate(periods):
+                records.append(
+                    create_indicator_record(indicator, entity, period, position)
+                )
+        return records
+
+
+def paginate(records: list, per_page: int, query: dict) -> list:
+    per_page = min(per_page, MAX_PER_PAGE)
+    page = int(query.get("page", 1))
+    pages = max(1, -(-len(records) // per_page))
+    return [
+        {"page": page, "pages": pages, "per_page": per_page, "total": len(records)},
+        records[(page - 1) * per_page : page * per_page],
+    ]
+
+
+def create_entities(count: int) -> List[dict]:
+    codes = ["".join(pair) for pair in product(ascii_uppercase, repeat=2)][:count]
+    nested = {"id": "", "iso2code": "", "value": ""}
+    return [
+        {
+            "id": f"{code}X",
+            "iso2Code": code,
+            "name": f"Entity {code}",
+            "region": {"id": "NAC", "iso2code": "XU", "value": "North America"},
+            "adminregion": nested,
+            "incomeLevel": {"id": "HIC", "iso2code": "XD", "value": "High income"},
+            "lendingType": {"id": "LNX", "iso2code": "XX", "value": "Not classified"},
+            "capitalCity": f"Capital {code}",
+            "longitude": "-77.032",
+            "latitude": "38.8895",
+        }
+        for code in codes
+    ]
+
+
+def create_periods(date: Optional[str], start_year: int, end_year: int) -> List[str]:
+    if date:
+        start, _, end = date.partition(":")
+        start_year, end_year = int(start[:4]), int(end[:4])
+    years = range(end_year, start_year - 1, -1)
+    # Like the API, the most recent period comes first
+    if date and "Q" in date:
+        return [f"{year}Q{quarter}" for year in years for quarter in range(4, 0, -1)]
+    if date and "M" in date:
+        return [f"{year}M{month:02d}" for year in years for month in range(12, 0, -1)]
+    return [str(year) for year in years]
+
+
+def create_indicator_record(indicator, entity, period, position) -> dict:
+    # Every seventh value is missing, as many series have gaps
+    value = None if position % 7 == 6 else round(1000.0 + 1.5 * position, 2)
+    return {
+        "indicator": {"id": indicator, "value": f"Indicator {indicator}"},
+        "country": {"id": entity["iso2Code"], "value": entity["name"]},
+        "countryiso3code": entity["id"],
+        "date": period,
+        "value": value,
+        "unit": "",
+        "obs_status": "",
+        "decimal": 0,
+    }
+
+
+def create_indicator_catalog(count: int) -> List[dict]:
+    return [
+        {
+            "id": f"IND.{position:05d}",
+            "name": f"Indicator {position} with a descriptive name",
+            "unit": "",
+            "source": {
+                "id": str(position % 60 + 1),
+                "value": f"Source {position % 60}",
+            },
+            "sourceNote": "A long description of the indicator. " * 8,
+            "sourceOrganization": "World Bank",
+            "topics": [
+                {"id": str(topic), "value": f"Topic {topic}"}
+                for topic in range(1 + position % 21, 1 + position % 21 + position % 3)
+            ],
+        }
+        for position in range(count)
+    ]
+
+
+def create_source(source_id: int, name: str) -> dict:
+    return {
+        "id": str(source_id),
+        "lastupdated": "2025-01-28",
+        "name": name,
+        "code": "WDI",
+        "description": "",
+        "url": "",
+        "dataavailability": "Y",
+        "metadataavailability": "Y",
+        "concepts": "3",
+    }
@@ -0,0 +1,10 @@
+import pytest
+
+from wbwdi import wdi_clear_metadata_cache
+
+
+@pytest.fixture(autouse=True)
+def clear_metadata_cache():
+    wdi_clear_metadata_cache()
+    yield
+    wdi_clear_metadata_cache()
@@ -0,0 +1,48 @@
+import json
+
+from benchmarks.run import compare_results, main
+from benchmarks.server import StandInServer
+from wbwdi import WDIClient, wdi_get
+
+
+def test_stand_in_server_serves_indicator_pages():
+    with StandInServer(entities=3, start_year=2020, end_year=2023) as server:
+        client = WDIClient(base_url=server.base_url)
+        result = wdi_get(
+            "all", "SP.POP.TOTL", per_page=5, progress=False, client=client
+        )
+        quarterly = wdi_get(
+            ["AA", "AB"], "SP.POP.TOTL", 2022, 2023, frequency="quarter", client=client
+        )
+
+    assert result.height == 12
+    assert sorted(set(result["entity_id"])) == ["AAX", "ABX", "ACX"]
+    assert quarterly.height == 16
+    assert quarterly.columns == [
+        "entity_id",
+        "indicator_id",
+        "value",
+        "year",
+        "quarter",
+    ]
+
+
+def test_benchmarks_write_results(tmp_path):
+    output = tmp_path / "results.json"
+
+    assert main(["--quick", "--repeat", "1", "--output", str(output), "parse"]) == 0
+
+    results = json.loads(output.read_text())
+    assert [benchmark["name"] for benchmark in results["benchmarks"]] == [
+        "parse_indicator"
+    ]
+    assert results["benchmarks"][0]["rows"] > 0
+    assert results["benchmarks"][0]["peak_memory_bytes"] > 0
+
+
+def test_compare_results():
+    baseline = {"benchmarks": [{"name": "a", "seconds_median": 1.0}]}
+    results = {"benchmarks": [{"name": "a", "seconds_median": 1.5}]}
+
+    assert compare_results(results, baseline, 0.2) == ["a: 1.5000s (baseline 1.0000s)"]
+    assert compare_results(results, baseline, 0.6) == []
@@ -0,0 +1,64 @@
+import subprocess
+import sys
+
+import pytest
+
+import wbwdi
+
+
+def run_python(code: str) -> str:
+    return subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout.strip()
+
+
+def test_import_does_not_load_dependencies():
+    """Test that importing the package does not import polars, httpx or submodules"""
+    loaded = run_python(
+        "import sys, wbwdi; "
+        "print(sorted(name for name in sys.modules "
+        "if name.split('.')[0] in ('polars', 'httpx') or name.startswith('wbwdi.')))"
+    )
+    assert loaded == "[]"
+
+
+def test_client_does_not_load_scan_plugin():
+    """Test that the Polars IO plugin of `wdi_scan()` is only imported on use"""
+    loaded = run_python(
+        "import sys, wbwdi.wdi_client; print('wbwdi.wdi_scan' in sys.modules)"
+    )
+    assert loaded == "False"
+
+
+def test_import_time():
+    """Test that importing the package stays fast
+
+    The bound is generous for cold caches on CI runners; whether heavy dependencies
+    are loaded is checked deterministically in the test above.
+    """
+    seconds = float(
+        run_python(
+            "import time; start = time.perf_counter(); import wbwdi; "
+            "print(time.perf_counter() - start)"
+        )
+    )
+    assert seconds < 1
+
+
+def test_public_names_are_loaded_on_first_use():
+    assert all(callable(getattr(wbwdi, name)) for name in wbwdi.__all__)
+    assert set(wbwdi.__all__) <= set(dir(wbwdi))
+
+
+def test_submodules_do_not_shadow_functions():
+    import wbwdi.wdi_get_sources
+    from wbwdi.wdi_scan import parse_predicate  # noqa: F401
+
+    assert wbwdi.wdi_get_sources.__name__ == "wdi_get_sources"
+    assert wbwdi.wdi_scan.__name__ == "wdi_scan"
+
+
+def test_unknown_attribute():
+    name = "wdi_unknown"
+    with pytest.raises(AttributeError, match=name):
+        getattr(wbwdi, name)
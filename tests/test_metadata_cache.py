@@ -0,0 +1,140 @@
+import asyncio
+import threading
+
+import pytest
+from pytest_httpx import HTTPXMock
+
+from wbwdi import (
+    WDIClient,
+    wdi_clear_metadata_cache,
+    wdi_get_languages,
+    wdi_get_languages_async,
+    wdi_get_topics,
+    wdi_set_metadata_cache,
+)
+from wbwdi.metadata_cache import METADATA_CACHE, MetadataCache
+
+LANGUAGES_BODY = [
+    {"page": 1, "pages": 1, "per_page": 1000, "total": 1},
+    [{"code": "en", "name": "English", "nativeForm": "English"}],
+]
+TOPICS_BODY = [
+    {"page": 1, "pages": 1, "per_page": 1000, "total": 1},
+    [{"id": "1", "value": "Agriculture ", "sourceNote": "Note"}],
+]
+
+
+@pytest.fixture
+def restore_metadata_cache():
+    yield
+    wdi_set_metadata_cache()
+
+
+def test_metadata_is_memoized(httpx_mock: HTTPXMock):
+    httpx_mock.add_response(json=LANGUAGES_BODY)
+
+    first = wdi_get_languages()
+    second = wdi_get_languages()
+    third = asyncio.run(wdi_get_languages_async())
+
+    assert first.equals(second)
+    assert first.equals(third)
+    assert len(httpx_mock.get_requests()) == 1
+
+
+def test_metadata_is_keyed_by_language(httpx_mock: HTTPXMock):
+    httpx_mock.add_response(json=TOPICS_BODY, is_reusable=True)
+
+    wdi_get_topics(language="en")
+    wdi_get_topics(language="es")
+    wdi_get_topics("es")
+
+    assert len(httpx_mock.get_requests()) == 2
+
+
+def test_metadata_is_keyed_by_base_url(httpx_mock: HTTPXMock):
+    httpx_mock.add_response(json=LANGUAGES_BODY, is_reusable=True)
+
+    wdi_get_languages()
+    wdi_get_languages(client=WDIClient(base_url="http://localhost:8000/v2/"))
+
+    assert len(httpx_mock.get_requests()) == 2
+
+
+def test_wdi_clear_metadata_cache(httpx_mock: HTTPXMock):
+    httpx_mock.add_response(
+        url="https://api.worldbank.org/v2/languages?format=json&per_page=1000",
+        json=LANGUAGES_BODY,
+        is_reusable=True,
+    )
+    httpx_mock.add_response(
+        url="https://api.worldbank.org/v2/en/topics?format=json&per_page=1000",
+        json=TOPICS_BODY,
+    )
+
+    wdi_get_languages()
+    wdi_get_topics()
+    wdi_clear_metadata_cache("languages")
+    wdi_get_languages()
+    wdi_get_topics()
+
+    assert len(httpx_mock.get_requests()) == 3
+
+
+def test_wdi_set_metadata_cache_disabled(httpx_mock: HTTPXMock, restore_metadata_cache):
+    httpx_mock.add_response(json=LANGUAGES_BODY, is_reusable=True)
+    wdi_set_metadata_cache(ttl=0)
+
+    wdi_get_languages()
+    wdi_get_languages()
+
+    assert len(httpx_mock.get_requests()) == 2
+    assert len(METADATA_CACHE) == 0
+
+
+def test_wdi_set_metadata_cache_invalid():
+    with pytest.raises(ValueError, match="`ttl` must be a non-negative integer."):
+        wdi_set_metadata_cache(ttl=-1)
+    with pytest.raises(
+        ValueError, match="`max_entries` must be a non-negative integer."
+    ):
+        wdi_set_metadata_cache(max_entries="10")
+
+
+def test_metadata_cache_lru_eviction():
+    cache = MetadataCache(ttl=60, max_entries=2)
+    cache.set(("a",), 1)
+    cache.set(("b",), 2)
+    cache.get(("a",))
+    cache.set(("c",), 3)
+
+    assert cache.get(("a",)) == 1
+    assert cache.get(("b",)) is None
+    assert cache.get(("c",)) == 3
+
+
+def test_metadata_cache_ttl(monkeypatch):
+    cache = MetadataCache(ttl=60)
+    now = 1000.0
+    monkeypatch.setattr("wbwdi.metadata_cache.time.monotonic", lambda: now)
+    cache.set(("a",), 1)
+
+    now = 1061.0
+    assert cache.get(("a",)) is None
+
+
+def test_metadata_cache_thread_safety():
+    cache = MetadataCache(ttl=60, max_entries=10)
+
+    def fill(offset):
+        for i in range(1000):
+            cache.set((offset, i % 20), i)
+            cache.get((offset, i % 7))
+
+    threads = [threading.Thread(target=fill, args=(offset,)) for offset in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(cache) == 10
@@ -0,0 +1,44 @@
+import polars as pl
+
+from wbwdi.parse_records import clean_strings, parse_records
+
+
+def test_parse_records_reads_nested_fields():
+    records = [
+        {"id": "HIC", "region": {"id": "NAC", "value": "North America"}},
+        {"id": 1, "region": None},
+        {"region": {"value": "Europe"}},
+    ]
+
+    result = parse_records(
+        records,
+        {
+            "id": ("id",),
+            "region_id": ("region", "id"),
+            "region_name": ("region", "value"),
+        },
+    )
+
+    assert result.schema == pl.Schema(
+        {"id": pl.Utf8, "region_id": pl.Utf8, "region_name": pl.Utf8}
+    )
+    assert result.rows() == [
+        ("HIC", "NAC", "North America"),
+        ("1", None, None),
+        (None, None, "Europe"),
+    ]
+
+
+def test_parse_records_empty():
+    result = parse_records(None, {"id": ("id",)})
+
+    assert result.is_empty()
+    assert result.schema == pl.Schema({"id": pl.Utf8})
+
+
+def test_clean_strings():
+    result = pl.DataFrame({"name": ["", " Aruba ", None]}).with_columns(
+        clean_strings("name")
+    )
+
+    assert result["name"].to_list() == [None, "Aruba", None]
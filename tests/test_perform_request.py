@@ -1,17 +1,28 @@
+import asyncio
 import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict, List
 
 import httpx
 import pytest
 from pytest_httpx import HTTPXMock
 
+from wbwdi import WDIClient, WDIScheduler
 from wbwdi.perform_request import (
+    create_auto_per_page,
     check_for_body_error,
     create_request_url,
+    decode_body,
     handle_request_error,
     is_request_error,
+    iter_pages,
+    iter_pages_async,
     perform_request,
+    perform_request_async,
     print_progress,
+    validate_max_concurrency,
     validate_per_page,
 )
 
@@ -36,6 +47,125 @@ def test_perform_request_single_page(httpx_mock: HTTPXMock):
     assert result[1]["id"] == "LIC"
 
 
+def add_paginated_responses(httpx_mock: HTTPXMock, pages: int):
+    url = "https://api.worldbank.org/v2/languages?format=json&per_page=1"
+    for page in range(1, pages + 1):
+        body = [
+            {"page": page, "pages": pages, "per_page": 1, "total": pages},
+            [{"code": f"l{page}"}],
+        ]
+        page_url = url if page == 1 else f"{url}&page={page}"
+        httpx_mock.add_response(method="GET", url=page_url, json=body)
+
+
+def test_perform_request_reuses_first_page(httpx_mock: HTTPXMock):
+    """Test that the first response is used as page 1"""
+    add_paginated_responses(httpx_mock, 3)
+
+    result = perform_request("languages", per_page=1)
+    assert [record["code"] for record in result] == ["l1", "l2", "l3"]
+    assert len(httpx_mock.get_requests()) == 3
+
+
+def test_perform_request_concurrent_pages(httpx_mock: HTTPXMock):
+    """Test that concurrently fetched pages are returned in page order"""
+    add_paginated_responses(httpx_mock, 6)
+
+    result = perform_request("languages", per_page=1, max_concurrency=4)
+    assert [record["code"] for record in result] == [f"l{i}" for i in range(1, 7)]
+
+
+def test_perform_request_concurrent_page_error(httpx_mock: HTTPXMock):
+    """Test that errors on later pages are raised"""
+    url = "https://api.worldbank.org/v2/languages?format=json&per_page=1"
+    httpx_mock.add_response(
+        url=url,
+        json=[{"page": 1, "pages": 2, "per_page": 1, "total": 2}, [{"code": "l1"}]],
+    )
+    httpx_mock.add_response(
+        url=f"{url}&page=2",
+        status_code=500,
+        json=[{"message": [{"id": "160", "value": "Server error"}]}],
+        is_reusable=True,
+    )
+    client = WDIClient(scheduler=WDIScheduler(max_retries=2, backoff_base=0))
+
+    with pytest.raises(RuntimeError, match="Error code: 160"):
+        perform_request("languages", per_page=1, max_concurrency=2, client=client)
+    assert len(httpx_mock.get_requests(url=f"{url}&page=2")) == 3
+
+
+def test_perform_request_async_concurrent_pages(httpx_mock: HTTPXMock):
+    """Test that asynchronously gathered pages are returned in page order"""
+    add_paginated_responses(httpx_mock, 5)
+
+    result = asyncio.run(
+        perform_request_async("languages", per_page=1, max_concurrency=3)
+    )
+    assert [record["code"] for record in result] == [f"l{i}" for i in range(1, 6)]
+
+
+def test_perform_request_async_error(httpx_mock: HTTPXMock):
+    """Test that API errors are raised by the asynchronous request"""
+    httpx_mock.add_response(status_code=404)
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(perform_request_async("invalid-resource"))
+
+
+def test_iter_pages_yields_pages_lazily(httpx_mock: HTTPXMock):
+    """Test that pages are yielded in order and only requested when needed"""
+    add_paginated_responses(httpx_mock, 6)
+
+    pages = iter_pages("languages", per_page=1)
+    assert [record["code"] for record in next(pages)] == ["l1"]
+    assert len(httpx_mock.get_requests()) == 1
+    assert [page[0]["code"] for page in pages] == [f"l{i}" for i in range(2, 7)]
+
+    add_paginated_responses(httpx_mock, 6)
+    pages = iter_pages("languages", per_page=1, max_concurrency=2)
+    assert [page[0]["code"] for page in pages] == [f"l{i}" for i in range(1, 7)]
+
+
+@pytest.mark.parametrize("max_concurrency", [1, 3])
+def test_iter_pages_processes_pages_on_workers(
+    httpx_mock: HTTPXMock, max_concurrency: int
+):
+    """Test that processed pages are yielded in order and processed off the caller"""
+    add_paginated_responses(httpx_mock, 6)
+    threads = set()
+
+    def process(records):
+        threads.add(threading.get_ident())
+        return [record["code"].upper() for record in records]
+
+    pages = iter_pages(
+        "languages", per_page=1, max_concurrency=max_concurrency, process=process
+    )
+    assert [page[0] for page in pages] == [f"L{i}" for i in range(1, 7)]
+    assert threading.get_ident() not in threads
+
+
+def test_iter_pages_async(httpx_mock: HTTPXMock):
+    """Test that asynchronous pages are yielded in page order"""
+    add_paginated_responses(httpx_mock, 5)
+
+    async def collect():
+        pages = iter_pages_async("languages", per_page=1, max_concurrency=2)
+        return [page[0]["code"] async for page in pages]
+
+    assert asyncio.run(collect()) == [f"l{i}" for i in range(1, 6)]
+
+
+def test_validate_max_concurrency():
+    """Test invalid max_concurrency values"""
+    validate_max_concurrency(1)
+    with pytest.raises(ValueError):
+        validate_max_concurrency(0)
+    with pytest.raises(ValueError):
+        validate_max_concurrency("2")
+
+
 def test_create_request_url():
     """Test request URL construction with all optional parameters"""
     url = create_request_url(
@@ -56,6 +186,7 @@ def test_validate_per_page_valid():
     validate_per_page(1)
     validate_per_page(1000)
     validate_per_page(32500)
+    validate_per_page("auto")
 
 
 def test_validate_per_page_invalid():
@@ -78,6 +209,16 @@ def test_is_request_error(httpx_mock: HTTPXMock):
             perform_request(resource="invalid-resource")
 
 
+def test_decode_body(monkeypatch):
+    """Test that bodies are decoded with and without orjson"""
+    response = httpx.Response(200, json=[{"page": 1}, [{"id": "HIC"}]])
+    assert decode_body(response) == [{"page": 1}, [{"id": "HIC"}]]
+
+    monkeypatch.setattr("wbwdi.perform_request.orjson", None)
+    assert decode_body(response) == [{"page": 1}, [{"id": "HIC"}]]
+    assert not is_request_error(response, decode_body(response))
+
+
 def test_print_progress(capsys):
     """Test progress printing functionality"""
     print_progress(1, 10)
@@ -133,3 +274,121 @@ def test_error_handling2(httpx_mock: HTTPXMock):
         with pytest.raises(RuntimeError) as exc_info:
             perform_request("invalid_resource")
         assert "Error code: 120" in str(exc_info.value)
+
+
+def test_perform_request_shares_concurrent_downloads(httpx_mock: HTTPXMock):
+    """Test that concurrent requests for the same URL share one download"""
+    release = threading.Event()
+
+    def respond(request: httpx.Request) -> httpx.Response:
+        release.wait(5)
+        body = [{"page": 1, "pages": 1, "per_page": 1000, "total": 1}, [{"id": "HIC"}]]
+        return httpx.Response(200, json=body)
+
+    httpx_mock.add_callback(respond, is_reusable=True)
+    client = WDIClient()
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = [
+            executor.submit(perform_request, "incomeLevels", client=client)
+            for _ in range(4)
+        ]
+        time.sleep(0.2)
+        release.set()
+        results = [future.result() for future in futures]
+
+    assert all(result == [{"id": "HIC"}] for result in results)
+    assert len(httpx_mock.get_requests()) == 1
+
+
+def add_auto_responses(httpx_mock: HTTPXMock, total: int, per_page: int):
+    url = "https://api.worldbank.org/v2/languages?format=json&per_page="
+    httpx_mock.add_response(
+        url=f"{url}1000",
+        json=[
+            {"page": 1, "pages": -(-total // 1000), "per_page": 1000, "total": total},
+            [{"code": "l1" if per_page == 1000 else "probe"}],
+        ],
+    )
+    pages = -(-total // per_page)
+    # With the page size of the probe, the probe is reused as the first page
+    for page in range(2 if per_page == 1000 else 1, pages + 1):
+        httpx_mock.add_response(
+            url=f"{url}{per_page}" + (f"&page={page}" if page > 1 else ""),
+            json=[
+                {"page": page, "pages": pages, "per_page": per_page, "total": total},
+                [{"code": f"l{page}"}],
+            ],
+        )
+
+
+def test_perform_request_auto_per_page(httpx_mock: HTTPXMock):
+    """Test that per_page="auto" requests large results with few pages"""
+    add_auto_responses(httpx_mock, 25000, 8334)
+
+    result = perform_request("languages", per_page="auto")
+    assert [record["code"] for record in result] == ["l1", "l2", "l3"]
+
+
+def test_perform_request_auto_per_page_concurrent(httpx_mock: HTTPXMock):
+    """Test that per_page="auto" spreads rows over parallel pages"""
+    add_auto_responses(httpx_mock, 6000, 1500)
+
+    result = perform_request("languages", per_page="auto", max_concurrency=4)
+    assert [record["code"] for record in result] == ["l1", "l2", "l3", "l4"]
+
+    async def collect():
+        pages = iter_pages_async("languages", per_page="auto", max_concurrency=4)
+        return [page[0]["code"] async for page in pages]
+
+    add_auto_responses(httpx_mock, 6000, 1500)
+    assert asyncio.run(collect()) == ["l1", "l2", "l3", "l4"]
+    assert len(httpx_mock.get_requests()) == 10
+
+
+def test_perform_request_auto_per_page_reuses_probe(httpx_mock: HTTPXMock):
+    """Test that the probe is not requested again if its page size is chosen"""
+    add_auto_responses(httpx_mock, 5000, 1000)
+
+    result = perform_request("languages", per_page="auto", max_concurrency=8)
+    assert [record["code"] for record in result] == ["l1", "l2", "l3", "l4", "l5"]
+    assert len(httpx_mock.get_requests()) == 5
+
+    async def collect():
+        pages = iter_pages_async("languages", per_page="auto", max_concurrency=8)
+        return [page[0]["code"] async for page in pages]
+
+    add_auto_responses(httpx_mock, 5000, 1000)
+    assert asyncio.run(collect()) == ["l1", "l2", "l3", "l4", "l5"]
+    assert len(httpx_mock.get_requests()) == 10
+
+
+def test_perform_request_auto_per_page_keeps_min_page_size(httpx_mock: HTTPXMock):
+    """Test that results are not split into pages below the minimum page size"""
+    add_auto_responses(httpx_mock, 1500, 1500)
+
+    result = perform_request("languages", per_page="auto", max_concurrency=4)
+    assert [record["code"] for record in result] == ["l1"]
+    assert len(httpx_mock.get_requests()) == 2
+
+
+def test_perform_request_auto_per_page_single_page(httpx_mock: HTTPXMock):
+    """Test that small results are returned by the first request"""
+    httpx_mock.add_response(
+        url="https://api.worldbank.org/v2/languages?format=json&per_page=1000",
+        json=[{"page": 1, "pages": 1, "per_page": 1000, "total": 1}, [{"code": "l1"}]],
+    )
+
+    assert perform_request("languages", per_page="auto") == [{"code": "l1"}]
+    assert len(httpx_mock.get_requests()) == 1
+
+
+def test_create_auto_per_page():
+    assert create_auto_per_page(500) == 500
+    assert create_auto_per_page(17024) == 8512
+    assert create_auto_per_page(17024, max_concurrency=8) == 2128
+    assert create_auto_per_page(3000, max_concurrency=8) == 1000
+    assert create_auto_per_page(5000, max_concurrency=8) == 1000
+    assert create_auto_per_page(1500, max_concurrency=4) == 1500
+    assert create_auto_per_page(2500, max_concurrency=4) == 1250
+    assert create_auto_per_page(300000, max_concurrency=4) == 10000
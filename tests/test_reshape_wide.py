@@ -0,0 +1,93 @@
+import polars as pl
+
+from wbwdi.reshape_wide import (
+    WideJoiner,
+    create_wide_keys,
+    pivot_wide,
+    pivot_wide_lazy,
+    sort_wide,
+    widen_indicators,
+)
+
+
+def create_long(indicator, entities, quarters, value):
+    return pl.DataFrame(
+        {
+            "indicator_id": indicator,
+            "entity_id": [entity for entity in entities for _ in quarters],
+            "year": pl.Series([2020] * len(entities) * len(quarters), dtype=pl.Int32),
+            "quarter": pl.Series(quarters * len(entities), dtype=pl.Int32),
+            "value": value,
+        }
+    )
+
+
+def test_create_wide_keys():
+    assert create_wide_keys(["entity_id", "year", "value"]) == ["entity_id", "year"]
+    assert create_wide_keys(["year", "month", "entity_id"]) == [
+        "entity_id",
+        "year",
+        "month",
+    ]
+
+
+def test_widen_indicators_joins_on_entity_and_period():
+    indicators_parsed = [
+        create_long("A", ["US", "CA"], [1, 2], 1.0),
+        create_long("B", ["CA", "MX"], [2], 2.0),
+        create_long("C", [], [1], 3.0),
+    ]
+
+    result = sort_wide(widen_indicators(indicators_parsed))
+
+    assert result.columns == ["entity_id", "year", "quarter", "A", "B"]
+    assert result.rows() == [
+        ("CA", 2020, 1, 1.0, None),
+        ("CA", 2020, 2, 1.0, 2.0),
+        ("MX", 2020, 2, None, 2.0),
+        ("US", 2020, 1, 1.0, None),
+        ("US", 2020, 2, 1.0, None),
+    ]
+
+
+def test_wide_joiner_orders_columns_by_indicators():
+    wide_joiner = WideJoiner()
+    for indicator in ["X", "B", "A"]:
+        wide_joiner.add(create_long(indicator, ["US"], [1], 1.0))
+
+    assert wide_joiner.result(["A", "B"]).columns == [
+        "entity_id",
+        "year",
+        "quarter",
+        "A",
+        "B",
+        "X",
+    ]
+
+
+def test_widen_indicators_without_data():
+    result = widen_indicators([create_long("A", [], [1], 1.0)])
+
+    assert result.columns == ["entity_id", "year"]
+    assert result.height == 0
+
+
+def test_pivot_wide_lazy_matches_pivot_wide():
+    indicators_long = pl.concat(
+        [
+            create_long("A", ["US", "CA"], [1, 2], 1.0),
+            create_long("B", ["CA", "MX"], [2], 2.0),
+        ]
+    )
+
+    expected = sort_wide(pivot_wide(indicators_long))
+    result = pivot_wide_lazy(indicators_long.lazy())
+
+    assert isinstance(result, pl.LazyFrame)
+    assert result.collect().equals(expected)
+    assert pivot_wide_lazy(indicators_long.lazy(), ["B"]).collect().columns == [
+        "entity_id",
+        "year",
+        "quarter",
+        "B",
+    ]
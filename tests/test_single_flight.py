@@ -0,0 +1,83 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from wbwdi.single_flight import SingleFlight
+
+
+def test_single_flight_shares_concurrent_calls():
+    single_flight = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def function():
+        calls.append(1)
+        release.wait(5)
+        return ["result"]
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        leader = executor.submit(single_flight.do, "key", function)
+        while len(single_flight) == 0:
+            pass
+        followers = [
+            executor.submit(single_flight.do, "key", function) for _ in range(3)
+        ]
+        time.sleep(0.2)
+        release.set()
+        results = [leader.result()] + [future.result() for future in followers]
+
+    assert len(calls) == 1
+    assert all(result == ["result"] for result in results)
+    assert len(single_flight) == 0
+
+
+def test_single_flight_does_not_keep_results():
+    single_flight = SingleFlight()
+    calls = []
+
+    assert single_flight.do("key", lambda: calls.append(1) or len(calls)) == 1
+    assert single_flight.do("key", lambda: calls.append(1) or len(calls)) == 2
+
+
+def test_single_flight_shares_exceptions():
+    single_flight = SingleFlight()
+    release = threading.Event()
+
+    def function():
+        release.wait(5)
+        raise RuntimeError("failed")
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        leader = executor.submit(single_flight.do, "key", function)
+        while len(single_flight) == 0:
+            pass
+        follower = executor.submit(single_flight.do, "key", function)
+        release.set()
+        with pytest.raises(RuntimeError, match="failed"):
+            leader.result()
+        with pytest.raises(RuntimeError, match="failed"):
+            follower.result()
+
+
+def test_single_flight_async():
+    single_flight = SingleFlight()
+    calls = []
+
+    async def function():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return ["result"]
+
+    async def run():
+        return await asyncio.gather(
+            *[single_flight.do_async("key", function) for _ in range(5)],
+            single_flight.do_async("other", function),
+        )
+
+    results = asyncio.run(run())
+    assert results == [["result"]] * 6
+    assert len(calls) == 2
+    assert len(single_flight) == 0
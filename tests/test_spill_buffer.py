@@ -0,0 +1,39 @@
+from pathlib import Path
+
+import polars as pl
+
+from wbwdi.spill_buffer import SpillBuffer
+
+
+def create_frame(value, rows=100):
+    return pl.DataFrame({"position": [value] * rows, "value": [1.0 * value] * rows})
+
+
+def test_spill_buffer_keeps_frames_within_budget_in_memory():
+    frame = create_frame(0)
+
+    with SpillBuffer(memory_budget=frame.estimated_size()) as buffer:
+        buffer[1] = create_frame(1)
+        buffer[0] = frame
+        buffer[2] = create_frame(2)
+        buffer[3] = create_frame(3, rows=0)
+
+        assert len(buffer) == 3
+        assert buffer.spilled == 2
+        assert buffer.memory_size == frame.estimated_size()
+        result = buffer.scan({"position": pl.Int64, "value": pl.Float64}).collect()
+        directory = buffer._directory.name
+
+    assert result["position"].unique(maintain_order=True).to_list() == [0, 1, 2]
+    assert result.height == 300
+    assert not Path(directory).exists()
+
+
+def test_spill_buffer_empty():
+    schema = {"position": pl.Int64, "value": pl.Float64}
+
+    with SpillBuffer(memory_budget=0) as buffer:
+        result = buffer.scan(schema).collect()
+
+    assert result.schema == pl.Schema(schema)
+    assert result.height == 0
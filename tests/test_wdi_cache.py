@@ -0,0 +1,198 @@
+import asyncio
+import gzip
+
+import httpx
+import pytest
+from pytest_httpx import HTTPXMock
+
+import wbwdi.perform_request as perform_request_module
+from wbwdi import WDICache, WDIClient
+from wbwdi.perform_request import perform_request, perform_request_async
+from wbwdi.wdi_cache import is_cacheable
+
+LANGUAGES_URL = "https://api.worldbank.org/v2/languages?format=json&per_page=1000"
+LANGUAGES_BODY = [
+    {"page": 1, "pages": 1, "per_page": 1000, "total": 1},
+    [{"code": "en", "name": "English", "nativeForm": "English"}],
+]
+
+
+def test_cache_returns_fresh_entries(httpx_mock: HTTPXMock, tmp_path):
+    httpx_mock.add_response(url=LANGUAGES_URL, json=LANGUAGES_BODY)
+    cache = WDICache(tmp_path)
+
+    with WDIClient(cache=cache) as client:
+        first = perform_request("languages", client=client)
+        second = perform_request("languages", client=client)
+
+    assert first == second
+    assert len(httpx_mock.get_requests()) == 1
+    entries = cache.info()
+    assert entries["url"].to_list() == [LANGUAGES_URL]
+    assert entries["resource"].to_list() == ["languages"]
+    assert entries["is_fresh"].to_list() == [True]
+
+
+def test_cache_stores_compressed_body(httpx_mock: HTTPXMock, tmp_path):
+    httpx_mock.add_response(url=LANGUAGES_URL, json=LANGUAGES_BODY)
+
+    with WDIClient(cache=WDICache(tmp_path)) as client:
+        client.wdi_get_languages()
+
+    (body_path,) = tmp_path.glob("*.gz")
+    assert b'"en"' in gzip.decompress(body_path.read_bytes())
+
+
+def test_cache_revalidates_expired_entries(httpx_mock: HTTPXMock, tmp_path):
+    httpx_mock.add_response(
+        url=LANGUAGES_URL, json=LANGUAGES_BODY, headers={"ETag": '"v1"'}
+    )
+    httpx_mock.add_response(
+        url=LANGUAGES_URL, status_code=304, match_headers={"If-None-Match": '"v1"'}
+    )
+
+    with WDIClient(cache=WDICache(tmp_path, ttl=0)) as client:
+        perform_request("languages", client=client)
+        result = perform_request("languages", client=client)
+
+    assert result[0]["code"] == "en"
+    assert len(httpx_mock.get_requests()) == 2
+
+
+def test_cache_does_not_store_errors(httpx_mock: HTTPXMock, tmp_path):
+    httpx_mock.add_response(
+        url=LANGUAGES_URL,
+        json=[{"message": [{"id": "120", "value": "Invalid value"}]}],
+    )
+    cache = WDICache(tmp_path)
+
+    with WDIClient(cache=cache) as client:
+        with pytest.raises(RuntimeError, match="Error code: 120"):
+            client.wdi_get_languages()
+
+    assert cache.info().height == 0
+
+
+def test_cache_ttl_by_resource(tmp_path):
+    cache = WDICache(tmp_path, ttl={"country": 60})
+
+    assert cache.ttl_for("country") == 60
+    assert cache.ttl_for("sources") == 7 * 24 * 60 * 60
+    assert WDICache(tmp_path, ttl=5).ttl_for("sources") == 5
+
+
+def test_cache_evicts_least_recently_used(httpx_mock: HTTPXMock, tmp_path):
+    httpx_mock.add_response(json=LANGUAGES_BODY, is_reusable=True)
+    cache = WDICache(tmp_path, max_size=1)
+
+    with WDIClient(cache=cache) as client:
+        perform_request("languages", client=client)
+        perform_request("topics", client=client)
+
+    assert cache.info().height == 0
+
+
+def test_cache_lists_directory_only_above_max_size(
+    httpx_mock: HTTPXMock, tmp_path, monkeypatch
+):
+    httpx_mock.add_response(json=LANGUAGES_BODY, is_reusable=True)
+    cache = WDICache(tmp_path, ttl=0)
+    calls = []
+    list_bodies = cache.list_bodies
+    monkeypatch.setattr(cache, "list_bodies", lambda: calls.append(1) or list_bodies())
+
+    with WDIClient(cache=cache) as client:
+        for resource in ["languages", "topics", "sources", "languages"]:
+            perform_request(resource, client=client)
+
+    assert len(calls) == 1
+    assert cache._size == cache.info()["size"].sum()
+
+
+def test_cache_clear(httpx_mock: HTTPXMock, tmp_path):
+    httpx_mock.add_response(json=LANGUAGES_BODY, is_reusable=True)
+    cache = WDICache(tmp_path)
+
+    with WDIClient(cache=cache) as client:
+        perform_request("languages", client=client)
+        perform_request("incomeLevels", client=client)
+
+    cache.clear(resource="languages")
+    assert cache.info()["resource"].to_list() == ["incomeLevels"]
+    cache.clear()
+    assert cache.info().height == 0
+
+
+def test_cache_invalid_max_size(tmp_path):
+    with pytest.raises(ValueError, match="`max_size` must be a positive integer."):
+        WDICache(tmp_path, max_size=0)
+
+
+def test_cache_does_not_decode_pages_again(
+    httpx_mock: HTTPXMock, tmp_path, monkeypatch
+):
+    httpx_mock.add_response(url=LANGUAGES_URL, json=LANGUAGES_BODY)
+    decode_json = httpx.Response.json
+    calls = []
+    monkeypatch.setattr(perform_request_module, "orjson", None)
+    monkeypatch.setattr(
+        httpx.Response,
+        "json",
+        lambda response: calls.append(1) or decode_json(response),
+    )
+
+    with WDIClient(cache=WDICache(tmp_path)) as client:
+        perform_request("languages", client=client)
+
+    assert len(calls) == 1
+
+
+def test_cache_is_cacheable():
+    def create_response(content):
+        return httpx.Response(200, content=content)
+
+    assert is_cacheable(create_response(b'[{"page": 1}, []]'))
+    assert not is_cacheable(create_response(b' [ { "message": [{"id": "120"}]}]'))
+    assert not is_cacheable(create_response(b"<html></html>"))
+
+
+def test_cache_requests_evicted_fresh_entries(httpx_mock: HTTPXMock, tmp_path):
+    httpx_mock.add_response(url=LANGUAGES_URL, json=LANGUAGES_BODY, is_reusable=True)
+    cache = WDICache(tmp_path)
+
+    with WDIClient(cache=cache) as client:
+        perform_request("languages", client=client)
+        entry = cache.load(LANGUAGES_URL)
+        cache.path(LANGUAGES_URL).with_suffix(".gz").unlink()
+        response = cache.create_response(LANGUAGES_URL, entry)
+        result = perform_request("languages", client=client)
+
+    assert response is None
+    assert result[0]["code"] == "en"
+    assert len(httpx_mock.get_requests()) == 2
+
+
+def test_cache_requests_bodies_evicted_during_revalidation(
+    httpx_mock: HTTPXMock, tmp_path
+):
+    httpx_mock.add_response(
+        url=LANGUAGES_URL, json=LANGUAGES_BODY, headers={"ETag": '"v1"'}
+    )
+    cache = WDICache(tmp_path, ttl=0)
+
+    def evict_and_confirm(request):
+        cache.path(LANGUAGES_URL).with_suffix(".gz").unlink()
+        return httpx.Response(304)
+
+    httpx_mock.add_callback(
+        evict_and_confirm, url=LANGUAGES_URL, match_headers={"If-None-Match": '"v1"'}
+    )
+    httpx_mock.add_response(url=LANGUAGES_URL, json=LANGUAGES_BODY)
+
+    with WDIClient(cache=cache) as client:
+        perform_request("languages", client=client)
+        result = asyncio.run(perform_request_async("languages", client=client))
+
+    assert result[0]["code"] == "en"
+    assert len(httpx_mock.get_requests()) == 3
+    assert cache.info().height == 1
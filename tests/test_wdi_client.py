@@ -0,0 +1,89 @@
+import asyncio
+
+import httpx
+import pytest
+from pytest_httpx import HTTPXMock
+
+import wbwdi.wdi_client
+from wbwdi import WDIClient, wdi_get_languages, wdi_set_client
+from wbwdi.perform_request import perform_request
+from wbwdi.wdi_client import get_default_client
+
+LANGUAGES_BODY = [
+    {"page": 1, "pages": 1, "per_page": 1000, "total": 1},
+    [{"code": "en", "name": "English", "nativeForm": "English"}],
+]
+
+
+@pytest.fixture
+def restore_default_client():
+    default_client = wbwdi.wdi_client.DEFAULT_CLIENT
+    yield
+    wbwdi.wdi_client.DEFAULT_CLIENT = default_client
+
+
+def test_client_reuses_connection_pool(httpx_mock: HTTPXMock):
+    httpx_mock.add_response(json=LANGUAGES_BODY, is_reusable=True)
+
+    with WDIClient() as client:
+        http_client = client.http_client
+        perform_request("languages", client=client)
+        perform_request("languages", client=client)
+        assert client.http_client is http_client
+
+    assert len(httpx_mock.get_requests()) == 2
+    assert http_client.is_closed
+
+
+def test_client_settings():
+    client = WDIClient(
+        max_connections=5, max_keepalive_connections=2, keepalive_expiry=10, timeout=3
+    )
+
+    assert client.http_client.timeout == httpx.Timeout(3)
+    client.close()
+
+
+def test_client_base_url(httpx_mock: HTTPXMock):
+    httpx_mock.add_response(
+        url="http://localhost:8000/v2/languages?format=json&per_page=1000",
+        json=LANGUAGES_BODY,
+    )
+
+    with WDIClient(base_url="http://localhost:8000/v2/") as client:
+        result = client.wdi_get_languages()
+
+    assert result["language_code"].to_list() == ["en"]
+
+
+def test_client_async_methods(httpx_mock: HTTPXMock):
+    httpx_mock.add_response(json=LANGUAGES_BODY)
+
+    async def download():
+        async with WDIClient() as client:
+            return await client.wdi_get_languages_async()
+
+    result = asyncio.run(download())
+
+    assert result["language_code"].to_list() == ["en"]
+
+
+def test_module_functions_use_default_client(
+    httpx_mock: HTTPXMock, restore_default_client
+):
+    httpx_mock.add_response(json=LANGUAGES_BODY, is_reusable=True)
+    client = WDIClient()
+    wdi_set_client(client)
+
+    assert get_default_client() is client
+    wdi_get_languages()
+    perform_request("languages")
+    assert client._http_client is not None
+
+    wdi_set_client(None)
+    assert get_default_client() is not client
+
+
+def test_wdi_set_client_invalid():
+    with pytest.raises(TypeError, match="`client` must be a `WDIClient` or `None`."):
+        wdi_set_client("client")
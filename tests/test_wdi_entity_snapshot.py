@@ -0,0 +1,83 @@
+import json
+from datetime import date
+
+import polars as pl
+from pytest_httpx import HTTPXMock
+
+from wbwdi import wdi_get, wdi_refresh_entity_snapshot
+from wbwdi.wdi_entity_snapshot import (
+    ENTITY_SNAPSHOT_VERSION,
+    is_stale,
+    load_entity_snapshot,
+    lookup_entity_mapping,
+)
+from wbwdi.wdi_get import map_entity_ids
+from tests.test_wdi_get import (
+    add_entities_response,
+    add_indicator_response,
+    indicator_record,
+)
+
+
+def test_bundled_snapshot_maps_countries_and_aggregates(monkeypatch, tmp_path):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    snapshot = load_entity_snapshot()
+
+    assert snapshot["entities"]["US"] == "USA"
+    assert snapshot["entities"]["XK"] == "XKX"
+    assert snapshot["entities"]["1W"] == "WLD"
+    assert snapshot["entities"]["CD"] == "COD"
+
+
+def test_is_stale():
+    snapshot = {"created_at": date(2025, 1, 1), "entities": {}}
+
+    assert not is_stale(snapshot, date(2025, 12, 31))
+    assert is_stale(snapshot, date(2026, 1, 2))
+
+
+def test_map_entity_ids():
+    indicators_processed = pl.DataFrame(
+        {"entity_id": ["US", "CA", "US", None], "value": [1.0, 2.0, 3.0, 4.0]}
+    )
+
+    result = map_entity_ids(indicators_processed, {"US": "USA", "CA": "CAN"})
+
+    assert result["entity_id"].to_list() == ["USA", "CAN", "USA", None]
+
+
+def test_wdi_get_downloads_entities_for_missing_codes(
+    httpx_mock: HTTPXMock, monkeypatch, tmp_path
+):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    add_entities_response(httpx_mock)
+    add_indicator_response(
+        httpx_mock,
+        "US;ZZ",
+        "SP.POP.TOTL",
+        [
+            indicator_record("SP.POP.TOTL", "US", "USA", "2020", 1.0),
+            indicator_record("SP.POP.TOTL", "ZZ", "", "2020", 2.0),
+        ],
+    )
+
+    result = wdi_get(["US", "ZZ"], "SP.POP.TOTL", progress=False)
+
+    assert result["entity_id"].to_list() == ["USA", None]
+
+
+def test_wdi_refresh_entity_snapshot(httpx_mock: HTTPXMock, monkeypatch, tmp_path):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    add_entities_response(httpx_mock)
+
+    path = wdi_refresh_entity_snapshot()
+
+    assert path == tmp_path / "wbwdi" / "entities.json"
+    snapshot = json.loads(path.read_text())
+    assert snapshot["version"] == ENTITY_SNAPSHOT_VERSION
+    assert snapshot["entities"] == {"CA": "CAN", "US": "USA"}
+
+    # The refreshed snapshot is newer than the shipped one and replaces it
+    assert load_entity_snapshot()["entities"] == {"CA": "CAN", "US": "USA"}
+    assert lookup_entity_mapping(["US"]) == {"CA": "CAN", "US": "USA"}
+    assert lookup_entity_mapping(["GB"]) is None
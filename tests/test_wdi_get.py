@@ -1,7 +1,108 @@
+import asyncio
+import re
+
+import httpx
 import polars as pl
 import pytest
+from pytest_httpx import HTTPXMock
+
+from wbwdi import wdi_get, wdi_get_async
+from wbwdi.enum_keys import cast_indicator_keys
+from wbwdi.wdi_get import (
+    WideRequests,
+    create_entity_chunks,
+    create_indicator_batches,
+    parse_indicator,
+    parse_indicator_legacy,
+    plan_entity_chunks,
+)
+
+BASE_URL = "https://api.worldbank.org/v2/"
+
+
+def indicator_record(indicator, iso2code, iso3code, date, value):
+    return {
+        "indicator": {"id": indicator, "value": f"{indicator} name"},
+        "country": {"id": iso2code, "value": f"{iso3code} name"},
+        "countryiso3code": iso3code,
+        "date": date,
+        "value": value,
+        "unit": "",
+        "obs_status": "",
+        "decimal": 0,
+    }
+
+
+def entity_record(iso3code, iso2code):
+    nested = {"id": "", "iso2code": "", "value": ""}
+    return {
+        "id": iso3code,
+        "iso2Code": iso2code,
+        "name": f"{iso3code} name",
+        "region": {"id": "NAC", "iso2code": "XU", "value": "North America"},
+        "adminregion": nested,
+        "incomeLevel": {"id": "HIC", "iso2code": "XD", "value": "High income"},
+        "lendingType": {"id": "LNX", "iso2code": "XX", "value": "Not classified"},
+        "capitalCity": "Capital",
+        "longitude": "-77.032",
+        "latitude": "38.8895",
+    }
+
+
+def add_indicator_response(httpx_mock, entities, indicator, records, query=""):
+    httpx_mock.add_response(
+        url=(
+            f"{BASE_URL}en/country/{entities}/indicator/{indicator}"
+            f"?format=json&per_page=1000{query}"
+        ),
+        json=[
+            {"page": 1, "pages": 1, "per_page": 1000, "total": len(records)},
+            records,
+        ],
+    )
+
+
+def add_empty_indicator_response(httpx_mock, entities, indicator, query=""):
+    # The API reports empty results with 0 pages and no records
+    httpx_mock.add_response(
+        url=(
+            f"{BASE_URL}en/country/{entities}/indicator/{indicator}"
+            f"?format=json&per_page=1000{query}"
+        ),
+        json=[{"page": 0, "pages": 0, "per_page": 1000, "total": 0}, None],
+    )
+
+
+def add_entities_response(httpx_mock):
+    httpx_mock.add_response(
+        url=f"{BASE_URL}en/countries/all?format=json&per_page=1000",
+        json=[
+            {"page": 1, "pages": 1, "per_page": 1000, "total": 2},
+            [entity_record("USA", "US"), entity_record("CAN", "CA")],
+        ],
+    )
+
 
-from wbwdi import wdi_get
+def add_sources_response(httpx_mock):
+    httpx_mock.add_response(
+        url=f"{BASE_URL}en/sources?format=json&per_page=1000",
+        json=[
+            {"page": 1, "pages": 1, "per_page": 1000, "total": 1},
+            [
+                {
+                    "id": "2",
+                    "lastupdated": "2025-01-28",
+                    "name": "World Development Indicators",
+                    "code": "WDI",
+                    "description": "",
+                    "url": "",
+                    "dataavailability": "Y",
+                    "metadataavailability": "Y",
+                    "concepts": "3",
+                }
+            ],
+        ],
+    )
 
 
 def test_single_entity_single_indicator():
@@ -175,3 +276,442 @@ def test_invalid_source():
     assert expected_error_message in str(excinfo.value), (
         "The error message did not match the expected output."
     )
+
+
+def test_wdi_get_async(httpx_mock: HTTPXMock):
+    for indicator, value in [("NY.GDP.PCAP.KD", 1.5), ("SP.POP.TOTL", 2.5)]:
+        add_indicator_response(
+            httpx_mock,
+            "US;CA",
+            indicator,
+            [
+                indicator_record(indicator, "US", "USA", "2021", value),
+                indicator_record(indicator, "CA", "CAN", "2021", value),
+            ],
+            "&date=2021:2021",
+        )
+
+    result = asyncio.run(
+        wdi_get_async(
+            ["US", "CA"],
+            ["NY.GDP.PCAP.KD", "SP.POP.TOTL"],
+            start_year=2021,
+            end_year=2021,
+        )
+    )
+
+    assert result.columns == ["entity_id", "indicator_id", "value", "year"]
+    assert (
+        result["indicator_id"].to_list() == ["NY.GDP.PCAP.KD"] * 2 + ["SP.POP.TOTL"] * 2
+    )
+    assert result["entity_id"].to_list() == ["USA", "CAN", "USA", "CAN"]
+
+
+def test_wdi_get_empty_result(httpx_mock: HTTPXMock):
+    add_empty_indicator_response(httpx_mock, "US", "SP.POP.TOTL")
+    add_empty_indicator_response(httpx_mock, "US", "SP.POP.TOTL")
+
+    result = wdi_get("US", "SP.POP.TOTL", progress=False)
+    result_async = asyncio.run(wdi_get_async("US", "SP.POP.TOTL", progress=False))
+
+    assert result.shape == (0, 4)
+    assert result_async.equals(result)
+
+
+def test_wdi_get_max_workers(httpx_mock: HTTPXMock, capsys):
+    indicators = ["NY.GDP.PCAP.KD", "SP.POP.TOTL", "SP.DYN.LE00.IN"]
+    for position, indicator in enumerate(indicators):
+        add_indicator_response(
+            httpx_mock,
+            "US",
+            indicator,
+            [indicator_record(indicator, "US", "USA", "2021", position)],
+        )
+
+    result = wdi_get("US", indicators, max_workers=3)
+
+    assert result["indicator_id"].to_list() == indicators
+    assert result["value"].to_list() == [0.0, 1.0, 2.0]
+    assert "Progress: 3/3" in capsys.readouterr().out
+
+
+def test_invalid_max_workers():
+    with pytest.raises(ValueError, match="`max_workers` must be a positive integer."):
+        wdi_get("US", "NY.GDP.PCAP.KD", max_workers=0)
+
+
+@pytest.mark.parametrize("memory_budget", [None, 0])
+def test_wdi_get_batch(httpx_mock: HTTPXMock, memory_budget):
+    add_sources_response(httpx_mock)
+    add_indicator_response(
+        httpx_mock,
+        "US",
+        "NY.GDP.PCAP.KD;SP.POP.TOTL",
+        [
+            indicator_record("SP.POP.TOTL", "US", "USA", "2021", 2.0),
+            indicator_record("NY.GDP.PCAP.KD", "US", "USA", "2021", 1.0),
+            indicator_record("SP.POP.TOTL", "US", "USA", "2020", 4.0),
+            indicator_record("NY.GDP.PCAP.KD", "US", "USA", "2020", 3.0),
+        ],
+        "&source=2",
+    )
+
+    result = wdi_get(
+        "US",
+        ["NY.GDP.PCAP.KD", "SP.POP.TOTL"],
+        source=2,
+        batch=True,
+        memory_budget=memory_budget,
+    )
+
+    assert (
+        result["indicator_id"].to_list() == ["NY.GDP.PCAP.KD"] * 2 + ["SP.POP.TOTL"] * 2
+    )
+    assert result["year"].to_list() == [2020, 2021, 2020, 2021]
+    assert result["value"].to_list() == [3.0, 1.0, 4.0, 2.0]
+
+
+def test_create_indicator_batches():
+    indicators = [f"IND.{i}" for i in range(61)]
+
+    assert create_indicator_batches(indicators, ["US"], None, True) == [
+        [indicator] for indicator in indicators
+    ]
+    assert create_indicator_batches(indicators, ["US"], 2, False) == [
+        [indicator] for indicator in indicators
+    ]
+    assert create_indicator_batches(indicators, ["US"], 2, True) == [
+        indicators[:60],
+        indicators[60:],
+    ]
+
+
+def test_create_indicator_batches_long_resource():
+    indicators = [f"INDICATOR.{i:03d}" for i in range(10)]
+    entities = [f"E{i:02d}" for i in range(370)]
+
+    batches = create_indicator_batches(indicators, entities, 2, True)
+
+    assert sum(batches, []) == indicators
+    assert len(batches) > 1
+
+
+def test_invalid_batch():
+    with pytest.raises(ValueError, match="`batch` must be either True or False."):
+        wdi_get("US", "NY.GDP.PCAP.KD", batch="yes")
+
+
+def test_create_entity_chunks():
+    entities = [f"E{i:03d}" for i in range(250)]
+
+    entity_chunks = create_entity_chunks(entities)
+
+    assert sum(entity_chunks, []) == entities
+    assert all(len(";".join(chunk)) <= 500 for chunk in entity_chunks)
+    assert create_entity_chunks(["USA", "CAN"]) == [["USA", "CAN"]]
+
+
+def test_plan_entity_chunks():
+    entities_available = pl.DataFrame(
+        {"entity_id": ["USA", "CAN", "MEX"], "entity_iso2code": ["US", "CA", "MX"]}
+    )
+
+    entity_chunks, entity_filter = plan_entity_chunks(
+        ["usa", "CA"], [["usa"], ["CA"]], entities_available
+    )
+    assert entity_chunks == [["all"]]
+    assert entity_filter == ["CA", "CAN", "US", "USA"]
+
+    entity_chunks, entity_filter = plan_entity_chunks(
+        ["USA"], [["USA"]], entities_available
+    )
+    assert entity_chunks == [["USA"]]
+    assert entity_filter is None
+
+
+@pytest.mark.parametrize("memory_budget", [None, 0])
+def test_wdi_get_entity_chunks(httpx_mock: HTTPXMock, memory_budget):
+    entities = [f"E{i:03d}" for i in range(130)]
+
+    def indicator_callback(request: httpx.Request):
+        entity_chunk = request.url.path.split("/")[4].split(";")
+        records = [
+            indicator_record("SP.POP.TOTL", entity, entity, year, 1.0)
+            for year in ["2021", "2020"]
+            for entity in entity_chunk
+        ]
+        return httpx.Response(
+            200,
+            json=[{"page": 1, "pages": 1, "per_page": 1000}, records],
+        )
+
+    httpx_mock.add_callback(
+        indicator_callback,
+        url=re.compile(".*/indicator/SP.POP.TOTL.*"),
+        is_reusable=True,
+    )
+    httpx_mock.add_response(
+        url=f"{BASE_URL}en/countries/all?format=json&per_page=1000",
+        json=[
+            {"page": 1, "pages": 1, "per_page": 1000, "total": 300},
+            [entity_record(f"X{i:03d}", f"{i:02d}") for i in range(300)],
+        ],
+    )
+
+    result = wdi_get(
+        entities, "SP.POP.TOTL", progress=False, memory_budget=memory_budget
+    )
+
+    assert len(httpx_mock.get_requests(url=re.compile(".*/indicator/.*"))) == 2
+    assert result.height == 260
+    assert result["year"].is_sorted()
+    assert result.filter(pl.col("year") == 2020)["entity_id"].to_list() == entities
+
+
+def test_wide_requests_join_finished_batches():
+    def create_request(indicators, entity):
+        return pl.DataFrame(
+            {
+                "indicator_id": indicators,
+                "entity_id": entity,
+                "value": 1.0,
+                "year": pl.Series([2020] * len(indicators), dtype=pl.Int32),
+            }
+        )
+
+    wide_requests = WideRequests([["A", "B"], ["C"]], [["US"], ["CA"]], None)
+
+    wide_requests[3] = create_request(["C"], "CA")
+    wide_requests[2] = create_request(["C"], "US")
+    assert list(wide_requests.pending) == []
+    wide_requests[0] = create_request(["A", "B"], "US")
+    assert list(wide_requests.pending) == [0]
+    wide_requests[1] = create_request(["A", "B"], "CA")
+
+    result = wide_requests.result()
+    assert wide_requests.pending == {}
+    assert result.columns == ["entity_id", "year", "A", "B", "C"]
+    assert result.sort("entity_id").rows() == [
+        ("CA", 2020, 1.0, 1.0, 1.0),
+        ("US", 2020, 1.0, 1.0, 1.0),
+    ]
+
+
+def test_parse_indicator_matches_legacy_parser():
+    records = [
+        indicator_record("DPANUSSPB", "US", "USA", "2012M02", 1),
+        indicator_record("DPANUSSPB", "US", "USA", "2012M01", None),
+        indicator_record("DPANUSSPB", "CA", "CAN", "2012M01", 2.5),
+    ]
+
+    result = parse_indicator(records)
+
+    assert result.schema == pl.Schema(
+        {
+            "indicator_id": pl.Utf8,
+            "entity_id": pl.Utf8,
+            "value": pl.Float64,
+            "year": pl.Int32,
+            "month": pl.Int32,
+        }
+    )
+    assert result["month"].to_list() == [1, 1, 2]
+    assert result.drop("year", "month").equals(
+        parse_indicator_legacy(records).sort("date").drop("date")
+    )
+
+
+def test_parse_indicator_falls_back_to_legacy_parser():
+    records = [indicator_record("SP.POP.TOTL", "US", "USA", "2020", "1.5")]
+
+    result = parse_indicator(records)
+
+    assert result["value"].to_list() == [1.5]
+    assert parse_indicator([]).columns == [
+        "indicator_id",
+        "entity_id",
+        "value",
+        "year",
+    ]
+
+
+def test_wide_format_quarterly(httpx_mock: HTTPXMock):
+    for indicator, dates in [
+        ("DT.DOD.DECT.CD", ["2020Q2", "2020Q1"]),
+        ("DT.DOD.DSTC.CD", ["2020Q2"]),
+    ]:
+        add_indicator_response(
+            httpx_mock,
+            "US",
+            indicator,
+            [indicator_record(indicator, "US", "USA", date, 1.0) for date in dates],
+            "&date=2020Q1:2020Q4",
+        )
+
+    result = wdi_get(
+        "US",
+        ["DT.DOD.DECT.CD", "DT.DOD.DSTC.CD"],
+        start_year=2020,
+        end_year=2020,
+        frequency="quarter",
+        format="wide",
+        progress=False,
+    )
+
+    assert result.columns == [
+        "entity_id",
+        "year",
+        "quarter",
+        "DT.DOD.DECT.CD",
+        "DT.DOD.DSTC.CD",
+    ]
+    assert result.rows() == [("USA", 2020, 1, 1.0, None), ("USA", 2020, 2, 1.0, 1.0)]
+
+
+def test_wdi_get_categorical(httpx_mock: HTTPXMock):
+    indicators = ["SP.POP.TOTL", "NY.GDP.PCAP.KD"]
+    # Each indicator is requested once in the long and once in the wide format
+    for indicator in indicators * 2:
+        add_indicator_response(
+            httpx_mock,
+            "US;CA",
+            indicator,
+            [
+                indicator_record(indicator, "US", "USA", "2021", 1.0),
+                indicator_record(indicator, "CA", "CAN", "2021", 2.0),
+            ],
+        )
+
+    result = wdi_get(["US", "CA"], indicators, progress=False, categorical=True)
+
+    assert isinstance(result.schema["entity_id"], pl.Enum)
+    assert {"USA", "CAN", "DEU"} <= set(result.schema["entity_id"].categories)
+    assert result.schema["indicator_id"] == pl.Enum(indicators)
+    assert result.sort("indicator_id")["indicator_id"].to_list() == [
+        "SP.POP.TOTL",
+        "SP.POP.TOTL",
+        "NY.GDP.PCAP.KD",
+        "NY.GDP.PCAP.KD",
+    ]
+
+    result_wide = wdi_get(
+        ["US", "CA"], indicators, progress=False, format="wide", categorical=True
+    )
+    assert result_wide.schema["entity_id"] == result.schema["entity_id"]
+    assert result_wide["entity_id"].to_list() == ["CAN", "USA"]
+
+
+def test_categorical_output_converts_to_pandas():
+    pytest.importorskip("pyarrow")
+    pytest.importorskip("pandas")
+    indicators_processed = pl.DataFrame(
+        {"entity_id": ["USA"], "indicator_id": ["SP.POP.TOTL"], "value": [1.0]}
+    )
+
+    result = cast_indicator_keys(indicators_processed, ["SP.POP.TOTL"]).to_pandas()
+
+    assert result["entity_id"].dtype == "category"
+    assert list(result["indicator_id"].cat.categories) == ["SP.POP.TOTL"]
+
+
+def test_invalid_categorical():
+    with pytest.raises(ValueError, match="`categorical` must be either True or False."):
+        wdi_get("US", "NY.GDP.PCAP.KD", categorical="yes")
+
+
+def add_paginated_indicator_responses(httpx_mock, dates):
+    url = f"{BASE_URL}en/country/US;CA/indicator/SP.POP.TOTL?format=json&per_page=2"
+    for page, date in enumerate(dates, start=1):
+        body = [
+            {"page": page, "pages": len(dates), "per_page": 2, "total": 2 * len(dates)},
+            [
+                indicator_record("SP.POP.TOTL", "US", "USA", date, 1.0 * page),
+                indicator_record("SP.POP.TOTL", "CA", "CAN", date, 2.0 * page),
+            ],
+        ]
+        page_url = url if page == 1 else f"{url}&page={page}"
+        httpx_mock.add_response(url=page_url, json=body)
+
+
+@pytest.mark.parametrize("max_concurrency", [1, 2])
+def test_wdi_get_pipeline(httpx_mock: HTTPXMock, max_concurrency):
+    dates = ["2021", "2020", "2019"]
+    add_paginated_indicator_responses(httpx_mock, dates)
+    add_paginated_indicator_responses(httpx_mock, dates)
+
+    def get(pipeline):
+        return wdi_get(
+            ["US", "CA"],
+            "SP.POP.TOTL",
+            per_page=2,
+            progress=False,
+            max_concurrency=max_concurrency,
+            pipeline=pipeline,
+        )
+
+    result = get(pipeline=True)
+
+    assert result.equals(get(pipeline=False))
+    assert result["year"].to_list() == [2019, 2019, 2020, 2020, 2021, 2021]
+    assert result["entity_id"].to_list() == ["USA", "CAN"] * 3
+
+
+def test_wdi_get_async_pipeline(httpx_mock: HTTPXMock):
+    add_paginated_indicator_responses(httpx_mock, ["2021", "2020"])
+
+    result = asyncio.run(
+        wdi_get_async(
+            ["US", "CA"],
+            "SP.POP.TOTL",
+            per_page=2,
+            progress=False,
+            max_concurrency=2,
+            pipeline=True,
+        )
+    )
+
+    assert result["year"].to_list() == [2020, 2020, 2021, 2021]
+    assert result["value"].to_list() == [2.0, 4.0, 1.0, 2.0]
+
+
+def test_invalid_pipeline():
+    with pytest.raises(ValueError, match="`pipeline` must be either True or False."):
+        wdi_get("US", "NY.GDP.PCAP.KD", pipeline=1)
+
+
+@pytest.mark.parametrize("format", ["long", "wide"])
+def test_wdi_get_memory_budget(httpx_mock: HTTPXMock, format):
+    indicators = ["NY.GDP.PCAP.KD", "SP.POP.TOTL", "SP.DYN.LE00.IN"]
+    # Each indicator is requested once in memory and once with spilled requests
+    for indicator in indicators * 2:
+        value = float(indicators.index(indicator))
+        add_indicator_response(
+            httpx_mock,
+            "US;CA",
+            indicator,
+            [
+                indicator_record(indicator, "US", "USA", "2021", value),
+                indicator_record(indicator, "CA", "CAN", "2021", None),
+                indicator_record(indicator, "US", "USA", "2020", value),
+            ],
+        )
+
+    def get(memory_budget):
+        return wdi_get(
+            ["US", "CA"],
+            indicators,
+            progress=False,
+            format=format,
+            max_workers=2,
+            memory_budget=memory_budget,
+        )
+
+    expected = get(None)
+    result = get(0)
+
+    assert result.equals(expected)
+
+
+def test_invalid_memory_budget():
+    with pytest.raises(ValueError, match="`memory_budget` must be a non-negative"):
+        wdi_get("US", "NY.GDP.PCAP.KD", memory_budget=-1)
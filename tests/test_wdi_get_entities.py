@@ -1,6 +1,13 @@
+import polars as pl
 import pytest
 
+from tests.test_wdi_get import entity_record
 from wbwdi import wdi_get_entities
+from wbwdi.wdi_get_entities import (
+    ENTITIES_SCHEMA,
+    cast_entities_keys,
+    process_entities,
+)
 
 
 def test_wdi_get_entities_columns():
@@ -52,3 +59,39 @@ def test_wdi_get_entities_invalid_per_page():
         ValueError, match="`per_page` must be an integer between 1 and 32,500"
     ):
         wdi_get_entities(per_page="xx")
+
+
+def test_process_entities_cleans_strings():
+    aggregate = entity_record("WLD", "1W") | {
+        "name": "World ",
+        "region": {"id": "NA", "iso2code": "NA", "value": "Aggregates"},
+        "capitalCity": "",
+        "longitude": "",
+        "latitude": "",
+    }
+
+    result = process_entities([entity_record("USA", "US"), aggregate])
+
+    assert result.schema == pl.Schema(ENTITIES_SCHEMA)
+    assert result["entity_type"].to_list() == ["country", "aggregate"]
+    assert result["entity_name"].to_list() == ["USA name", "World"]
+    assert result["capital_city"].to_list() == ["Capital", None]
+    assert result["admin_region_id"].to_list() == [None, None]
+    assert result["longitude"].to_list() == [-77.032, None]
+
+
+def test_process_entities_empty_page():
+    assert process_entities(None).schema == pl.Schema(ENTITIES_SCHEMA)
+
+
+def test_cast_entities_keys():
+    entities = process_entities(
+        [entity_record("USA", "US"), entity_record("CAN", "CA")]
+    )
+
+    result = cast_entities_keys(entities)
+
+    assert result.schema["region_name"] == pl.Enum(["North America"])
+    assert result.schema["entity_type"] == pl.Enum(["country"])
+    assert result.schema["entity_id"] == pl.Utf8
+    assert result.cast(ENTITIES_SCHEMA).equals(entities)
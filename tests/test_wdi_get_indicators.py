@@ -1,6 +1,8 @@
+import polars as pl
 import pytest
 
 from wbwdi import wdi_get_indicators
+from wbwdi.wdi_get_indicators import INDICATORS_SCHEMA, process_indicators
 
 
 def test_wdi_get_indicators_columns():
@@ -40,3 +42,49 @@ def testwdi_get_indicators_invalid_per_page():
         ValueError, match="`per_page` must be an integer between 1 and 32,500"
     ):
         wdi_get_indicators(per_page="xxx")
+
+
+def test_process_indicators_nests_topics():
+    def indicator_record(indicator, topics, source_note=""):
+        return {
+            "id": indicator,
+            "name": f"{indicator} name",
+            "unit": "",
+            "source": {"id": "2", "value": "World Development Indicators"},
+            "sourceNote": source_note,
+            "sourceOrganization": "",
+            "topics": topics,
+        }
+
+    result = process_indicators(
+        [
+            indicator_record(
+                "SP.POP.TOTL",
+                [
+                    {"id": "19", "value": "Climate Change "},
+                    {"id": "8", "value": "Health"},
+                ],
+                "Total population",
+            ),
+            indicator_record("NY.GDP.PCAP.KD", []),
+        ]
+    )
+
+    assert result.schema == pl.Schema(INDICATORS_SCHEMA)
+    assert result["indicator_id"].to_list() == ["SP.POP.TOTL", "NY.GDP.PCAP.KD"]
+    assert result["topics"].to_list() == [
+        [
+            {"topic_id": 19, "topic_name": "Climate Change"},
+            {"topic_id": 8, "topic_name": "Health"},
+        ],
+        None,
+    ]
+    assert result["source_note"].to_list() == ["Total population", None]
+    assert result["source_organization"].to_list() == [None, None]
+
+
+def test_process_indicators_empty_page():
+    result = process_indicators([])
+
+    assert result.is_empty()
+    assert result.schema == pl.Schema(INDICATORS_SCHEMA)
@@ -1,6 +1,8 @@
-import pytest
+import asyncio
 
-from wbwdi import wdi_get_languages
+from pytest_httpx import HTTPXMock
+
+from wbwdi import wdi_get_languages, wdi_get_languages_async
 
 
 def test_wdi_get_languages_columns():
@@ -11,3 +13,19 @@ def test_wdi_get_languages_columns():
     assert set(result.columns) == expected_columns, (
         "DataFrame columns do not match the expected structure"
     )
+
+
+def test_wdi_get_languages_async(httpx_mock: HTTPXMock):
+    httpx_mock.add_response(
+        url="https://api.worldbank.org/v2/languages?format=json&per_page=1000",
+        json=[
+            {"page": 1, "pages": 1, "per_page": 1000, "total": 1},
+            [{"code": "en", "name": "English ", "nativeForm": "English "}],
+        ],
+    )
+
+    result = asyncio.run(wdi_get_languages_async())
+
+    assert result.to_dicts() == [
+        {"language_code": "en", "language_name": "English", "native_form": "English"}
+    ]
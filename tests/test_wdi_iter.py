@@ -0,0 +1,94 @@
+import asyncio
+
+import polars as pl
+import pytest
+from pytest_httpx import HTTPXMock
+
+from wbwdi import wdi_iter, wdi_iter_async
+from tests.test_wdi_get import BASE_URL, indicator_record
+
+
+def add_indicator_pages(httpx_mock, indicator, pages):
+    url = (
+        f"{BASE_URL}en/country/all/indicator/{indicator}"
+        "?format=json&per_page=2&date=2019:2020"
+    )
+    for page, records in enumerate(pages, start=1):
+        httpx_mock.add_response(
+            url=url if page == 1 else f"{url}&page={page}",
+            json=[
+                {"page": page, "pages": len(pages), "per_page": 2, "total": 4},
+                records,
+            ],
+        )
+
+
+def create_pages(indicator):
+    return [
+        [
+            indicator_record(indicator, "US", "USA", "2020", 1.0),
+            indicator_record(indicator, "CA", "CAN", "2020", 2.0),
+        ],
+        [
+            indicator_record(indicator, "US", "USA", "2019", 3.0),
+            indicator_record(indicator, "CA", "CAN", "2019", None),
+        ],
+    ]
+
+
+def test_wdi_iter_yields_one_frame_per_page(httpx_mock: HTTPXMock):
+    add_indicator_pages(httpx_mock, "SP.POP.TOTL", create_pages("SP.POP.TOTL"))
+    add_indicator_pages(httpx_mock, "NY.GDP.PCAP.KD", create_pages("NY.GDP.PCAP.KD"))
+
+    pages = list(
+        wdi_iter(
+            "all",
+            ["SP.POP.TOTL", "NY.GDP.PCAP.KD"],
+            start_year=2019,
+            end_year=2020,
+            per_page=2,
+        )
+    )
+
+    assert len(pages) == 4
+    assert all(page.height == 2 for page in pages)
+    assert pages[0].columns == ["entity_id", "indicator_id", "value", "year"]
+    assert pages[0].schema["value"] == pl.Float64
+    assert pages[0]["entity_id"].to_list() == ["USA", "CAN"]
+    assert [page["indicator_id"][0] for page in pages] == [
+        "SP.POP.TOTL",
+        "SP.POP.TOTL",
+        "NY.GDP.PCAP.KD",
+        "NY.GDP.PCAP.KD",
+    ]
+    assert pages[1]["value"].to_list() == [3.0, None]
+
+
+@pytest.mark.parametrize("function", [wdi_iter, wdi_iter_async])
+@pytest.mark.parametrize(
+    "arguments",
+    [
+        {"frequency": "weekly"},
+        {"most_recent_only": "yes"},
+        {"batch": "yes"},
+        {"per_page": 0},
+        {"max_concurrency": 0},
+    ],
+)
+def test_wdi_iter_validates_before_requests(function, arguments):
+    # No response is registered, so a request would fail with another error
+    with pytest.raises(ValueError):
+        function("US", "SP.POP.TOTL", **arguments)
+
+
+def test_wdi_iter_async(httpx_mock: HTTPXMock):
+    add_indicator_pages(httpx_mock, "SP.POP.TOTL", create_pages("SP.POP.TOTL"))
+
+    async def collect():
+        pages = wdi_iter_async(
+            "all", "SP.POP.TOTL", start_year=2019, end_year=2020, per_page=2
+        )
+        return [page async for page in pages]
+
+    pages = asyncio.run(collect())
+    assert [page["year"].to_list() for page in pages] == [[2020, 2020], [2019, 2019]]
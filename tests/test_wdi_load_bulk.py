@@ -0,0 +1,84 @@
+import zipfile
+
+import polars as pl
+import pytest
+
+from wbwdi import wdi_load_bulk
+
+BULK_CSV = (
+    '"Country Name","Country Code","Indicator Name","Indicator Code",'
+    '"1960","1961","1962",\n'
+    '"Canada","CAN","Population, total","SP.POP.TOTL","17909009","18271000","18614000",\n'
+    '"Canada","CAN","GDP per capita","NY.GDP.PCAP.KD","","15000.5","15500.25",\n'
+    '"United States","USA","Population, total","SP.POP.TOTL","180671000","183691000","186538000",\n'
+    '"United States","USA","GDP per capita","NY.GDP.PCAP.KD","19000","","19750.5",\n'
+)
+
+
+@pytest.fixture
+def bulk_archive(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    path = tmp_path / "WDI_CSV.zip"
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr(
+            "WDICountry.csv", '"Country Code","Short Name"\n"CAN","Canada"\n'
+        )
+        archive.writestr("WDICSV.csv", BULK_CSV)
+    return path
+
+
+def test_wdi_load_bulk_long(bulk_archive):
+    result = wdi_load_bulk(bulk_archive, "SP.POP.TOTL", entities="usa", start_year=1961)
+
+    assert result.schema == pl.Schema(
+        {
+            "entity_id": pl.Utf8,
+            "indicator_id": pl.Utf8,
+            "value": pl.Float64,
+            "year": pl.Int32,
+        }
+    )
+    assert result.rows() == [
+        ("USA", "SP.POP.TOTL", 183691000.0, 1961),
+        ("USA", "SP.POP.TOTL", 186538000.0, 1962),
+    ]
+
+
+def test_wdi_load_bulk_wide_keeps_missing_values(bulk_archive):
+    result = wdi_load_bulk(bulk_archive, format="wide").sort("entity_id", "year")
+
+    assert result.columns == ["entity_id", "year", "SP.POP.TOTL", "NY.GDP.PCAP.KD"]
+    assert result.height == 6
+    assert result["NY.GDP.PCAP.KD"].to_list() == [
+        None,
+        15000.5,
+        15500.25,
+        19000.0,
+        None,
+        19750.5,
+    ]
+
+
+def test_wdi_load_bulk_reads_csv_and_lazy_frames(bulk_archive, tmp_path):
+    csv_path = tmp_path / "WDICSV.csv"
+    csv_path.write_text(BULK_CSV)
+
+    result = wdi_load_bulk(csv_path, ["NY.GDP.PCAP.KD"], end_year=1960, lazy=True)
+
+    assert isinstance(result, pl.LazyFrame)
+    assert result.collect()["value"].to_list() == [None, 19000.0]
+    assert wdi_load_bulk(bulk_archive).equals(wdi_load_bulk(csv_path))
+
+
+def test_wdi_load_bulk_invalid_options(bulk_archive):
+    with pytest.raises(ValueError, match="format"):
+        wdi_load_bulk(bulk_archive, format="tall", lazy=True)
+
+
+def test_wdi_load_bulk_lazy_wide(bulk_archive):
+    result = wdi_load_bulk(bulk_archive, format="wide", lazy=True)
+
+    assert isinstance(result, pl.LazyFrame)
+    assert result.collect().equals(
+        wdi_load_bulk(bulk_archive, format="wide").sort("entity_id", "year")
+    )
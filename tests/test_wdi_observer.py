@@ -0,0 +1,102 @@
+import polars as pl
+from pytest_httpx import HTTPXMock
+
+from wbwdi import WDIClient, WDITimings, wdi_get, wdi_observe
+from wbwdi.perform_request import perform_request
+from tests.test_wdi_get import (
+    BASE_URL,
+    add_indicator_response,
+    indicator_record,
+)
+
+
+def add_indicator_responses(
+    httpx_mock: HTTPXMock, indicators=("SP.POP.TOTL", "NY.GDP.PCAP.KD")
+):
+    for indicator in indicators:
+        add_indicator_response(
+            httpx_mock,
+            "US;CA",
+            indicator,
+            [
+                indicator_record(indicator, "US", "USA", "2020", 1.0),
+                indicator_record(indicator, "CA", "CAN", "2020", 2.0),
+            ],
+        )
+
+
+def test_wdi_timings_summarizes_wdi_get(httpx_mock: HTTPXMock):
+    add_indicator_responses(httpx_mock)
+
+    with WDITimings() as timings:
+        wdi_get(
+            ["US", "CA"],
+            ["SP.POP.TOTL", "NY.GDP.PCAP.KD"],
+            format="wide",
+            progress=False,
+            max_workers=2,
+        )
+
+    summary = timings.summary()
+    assert set(summary["event"]) == {
+        "request_end",
+        "decode",
+        "parse",
+        "pivot",
+        "entity_join",
+        "wdi_get",
+    }
+    counts = dict(zip(summary["event"], summary["count"]))
+    assert counts["request_end"] == 2
+    assert counts["parse"] == 2
+    assert summary.filter(pl.col("event") == "wdi_get")["rows"].item() == 2
+
+    requests = timings.events().filter(pl.col("event") == "request_end")
+    assert requests["status"].to_list() == [200, 200]
+    assert requests["page"].to_list() == [1, 1]
+    assert requests["pages"].to_list() == [1, 1]
+    assert (requests["bytes"] > 0).all()
+
+
+def test_wdi_observe_is_scoped(httpx_mock: HTTPXMock):
+    add_indicator_responses(httpx_mock)
+    events = []
+
+    with wdi_observe(events.append):
+        wdi_get(["US", "CA"], "SP.POP.TOTL", progress=False)
+    wdi_get(["US", "CA"], "NY.GDP.PCAP.KD", progress=False)
+
+    assert [event["event"] for event in events] == [
+        "request_start",
+        "request_end",
+        "decode",
+        "page",
+        "parse",
+        "entity_join",
+        "wdi_get",
+    ]
+    assert events[0]["url"].endswith("indicator/SP.POP.TOTL?format=json&per_page=1000")
+
+
+def test_client_observers(httpx_mock: HTTPXMock):
+    add_indicator_responses(httpx_mock, ["SP.POP.TOTL"])
+    events = []
+    client = WDIClient(observers=[events.append])
+
+    client.wdi_get(["US", "CA"], "SP.POP.TOTL", progress=False)
+
+    assert events[-1]["event"] == "wdi_get"
+    assert events[-1]["rows"] == 2
+
+
+def test_progress_observer(httpx_mock: HTTPXMock, capsys):
+    url = f"{BASE_URL}languages?format=json&per_page=1"
+    for page in [1, 2]:
+        httpx_mock.add_response(
+            url=url if page == 1 else f"{url}&page={page}",
+            json=[{"page": page, "pages": 2, "per_page": 1, "total": 2}, [{}]],
+        )
+
+    perform_request("languages", per_page=1, progress=True)
+
+    assert capsys.readouterr().out == "Progress: 1/2\rProgress: 2/2\r"
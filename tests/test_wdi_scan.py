@@ -0,0 +1,155 @@
+import importlib
+import re
+
+import polars as pl
+import pytest
+from pytest_httpx import HTTPXMock
+
+from wbwdi import wdi_scan
+from wbwdi.wdi_scan import (
+    PUSHDOWN_MIN_POLARS_VERSION,
+    get_polars_version,
+    parse_predicate,
+)
+from tests.test_wdi_get import (
+    BASE_URL,
+    add_indicator_response,
+    entity_record,
+    indicator_record,
+)
+
+pytest.importorskip("polars.io.plugins")
+
+requires_pushdown = pytest.mark.skipif(
+    get_polars_version() < PUSHDOWN_MIN_POLARS_VERSION,
+    reason="Filters are only pushed down with newer Polars versions",
+)
+
+RECORDS = [
+    indicator_record("SP.POP.TOTL", "US", "USA", "2020", 1.0),
+    indicator_record("SP.POP.TOTL", "CA", "CAN", "2020", 2.0),
+    indicator_record("SP.POP.TOTL", "US", "USA", "2019", 3.0),
+    indicator_record("SP.POP.TOTL", "CA", "CAN", "2019", 4.0),
+]
+
+
+@requires_pushdown
+def test_wdi_scan_pushes_filters_into_request(httpx_mock: HTTPXMock):
+    add_indicator_response(
+        httpx_mock, "CAN;USA", "SP.POP.TOTL", RECORDS, "&date=2019:2020"
+    )
+
+    result = (
+        wdi_scan(["SP.POP.TOTL", "NY.GDP.PCAP.KD"])
+        .filter(
+            pl.col("entity_id").is_in(["USA", "CAN"]),
+            pl.col("year").is_between(2019, 2020),
+            pl.col("indicator_id") == "SP.POP.TOTL",
+            pl.col("value") > 1,
+        )
+        .collect()
+    )
+
+    assert result.columns == ["entity_id", "indicator_id", "value", "year"]
+    assert result.sort("value")["entity_id"].to_list() == ["CAN", "USA", "CAN"]
+
+
+@requires_pushdown
+def test_wdi_scan_projection_skips_entity_mapping(httpx_mock: HTTPXMock):
+    add_indicator_response(httpx_mock, "all", "SP.POP.TOTL", RECORDS, "&date=2020:2020")
+
+    result = (
+        wdi_scan("SP.POP.TOTL").filter(pl.col("year") == 2020).select("value").collect()
+    )
+
+    assert result["value"].to_list() == [1.0, 2.0]
+    assert len(httpx_mock.get_requests()) == 1
+
+
+def test_wdi_scan_applies_filters_that_are_not_pushed_down(httpx_mock: HTTPXMock):
+    add_indicator_response(httpx_mock, "all", "SP.POP.TOTL", RECORDS)
+
+    result = (
+        wdi_scan("SP.POP.TOTL")
+        .filter((pl.col("year") < 2020) | (pl.col("value") == 2.0))
+        .select("year", "value")
+        .collect()
+    )
+
+    assert sorted(result["value"].to_list()) == [2.0, 3.0, 4.0]
+
+
+def test_wdi_scan_limits_years_explicitly(httpx_mock: HTTPXMock):
+    add_indicator_response(
+        httpx_mock, "all", "SP.POP.TOTL", RECORDS[:2], "&date=2020:2020"
+    )
+
+    result = wdi_scan("SP.POP.TOTL", start_year=2020, end_year=2020).collect()
+
+    assert result["year"].to_list() == [2020, 2020]
+
+
+def test_wdi_scan_filters_entities_of_all_entities_request(httpx_mock: HTTPXMock):
+    entities = [f"E{i:03d}" for i in range(200)]
+    httpx_mock.add_response(
+        url=f"{BASE_URL}en/countries/all?format=json&per_page=1000",
+        json=[
+            {"page": 1, "pages": 1, "per_page": 1000, "total": 200},
+            [entity_record(entity, f"Q{i:03d}") for i, entity in enumerate(entities)],
+        ],
+    )
+    add_indicator_response(
+        httpx_mock,
+        "all",
+        "SP.POP.TOTL",
+        [
+            indicator_record("SP.POP.TOTL", entity, entity, "2020", 1.0)
+            for i, entity in enumerate(entities)
+        ],
+    )
+
+    result = wdi_scan("SP.POP.TOTL", entities[:150]).collect()
+
+    assert len(httpx_mock.get_requests(url=re.compile(".*/indicator/.*"))) == 1
+    assert result["entity_id"].to_list() == entities[:150]
+
+
+def test_parse_predicate_warns_on_old_polars_versions(monkeypatch):
+    monkeypatch.setattr(
+        importlib.import_module("wbwdi.wdi_scan"), "get_polars_version", lambda: (1, 0)
+    )
+
+    with pytest.warns(UserWarning, match="Polars 1.32 or later"):
+        assert parse_predicate(pl.col("year") == 2020) == {}
+
+
+@requires_pushdown
+def test_parse_predicate_warns_on_unreadable_filters(monkeypatch):
+    def parse_literal(literal):
+        raise ValueError("Unsupported literal")
+
+    monkeypatch.setattr(
+        importlib.import_module("wbwdi.wdi_scan"), "parse_literal", parse_literal
+    )
+
+    with pytest.warns(UserWarning, match="could not be read"):
+        assert parse_predicate(pl.col("year") == 2020) == {}
+    assert parse_predicate(pl.col("value") > 1) == {}
+
+
+@requires_pushdown
+def test_parse_predicate():
+    predicate = (
+        pl.col("year").is_between(2000, 2010)
+        & pl.col("entity_id").is_in(["usa", "CAN"])
+        & (pl.col("indicator_id") == "SP.POP.TOTL")
+        & (pl.col("year") > 2003)
+    )
+    assert parse_predicate(predicate) == {
+        "year": (2004, 2010),
+        "entity_id": {"USA", "CAN"},
+        "indicator_id": {"SP.POP.TOTL"},
+    }
+    assert parse_predicate(2005 >= pl.col("year")) == {"year": (None, 2005)}
+    assert parse_predicate((pl.col("year") > 2000) | (pl.col("year") < 1990)) == {}
+    assert parse_predicate(None) == {}
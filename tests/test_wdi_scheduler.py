@@ -0,0 +1,160 @@
+import asyncio
+import threading
+import time
+
+import httpx
+import pytest
+from pytest_httpx import HTTPXMock
+
+from wbwdi import WDIClient, WDIScheduler
+from wbwdi.perform_request import perform_request, perform_request_async
+from wbwdi.wdi_scheduler import parse_retry_after
+
+URL = "https://api.worldbank.org/v2/languages?format=json&per_page=1"
+
+
+def page_body(page, pages):
+    return [
+        {"page": page, "pages": pages, "per_page": 1, "total": pages},
+        [{"code": f"l{page}"}],
+    ]
+
+
+def test_scheduler_retries_failed_page_only(httpx_mock: HTTPXMock):
+    httpx_mock.add_response(url=URL, json=page_body(1, 3))
+    httpx_mock.add_response(url=f"{URL}&page=2", status_code=503)
+    httpx_mock.add_response(url=f"{URL}&page=2", json=page_body(2, 3))
+    httpx_mock.add_response(url=f"{URL}&page=3", json=page_body(3, 3))
+    scheduler = WDIScheduler(max_concurrency=4, backoff_base=0)
+
+    result = perform_request(
+        "languages", per_page=1, client=WDIClient(scheduler=scheduler)
+    )
+
+    assert [record["code"] for record in result] == ["l1", "l2", "l3"]
+    assert len(httpx_mock.get_requests(url=URL)) == 1
+    assert scheduler.concurrency < 4
+
+
+def test_scheduler_honors_retry_after(httpx_mock: HTTPXMock, monkeypatch):
+    delays = []
+    monkeypatch.setattr("wbwdi.wdi_scheduler.time.sleep", delays.append)
+    httpx_mock.add_response(url=URL, status_code=429, headers={"Retry-After": "7"})
+    httpx_mock.add_exception(httpx.ReadError("Connection reset"), url=URL)
+    httpx_mock.add_response(url=URL, json=page_body(1, 1))
+    scheduler = WDIScheduler(backoff_base=1, backoff_max=1.5)
+
+    result = perform_request(
+        "languages", per_page=1, client=WDIClient(scheduler=scheduler)
+    )
+
+    assert result == [{"code": "l1"}]
+    assert delays[0] == 7
+    assert 0 <= delays[1] <= 1.5
+
+
+def test_scheduler_raises_after_max_retries(httpx_mock: HTTPXMock):
+    httpx_mock.add_exception(httpx.ReadTimeout("Timed out"), url=URL, is_reusable=True)
+    client = WDIClient(scheduler=WDIScheduler(max_retries=2, backoff_base=0))
+
+    with pytest.raises(httpx.ReadTimeout):
+        perform_request("languages", per_page=1, client=client)
+    assert len(httpx_mock.get_requests()) == 3
+
+
+def test_scheduler_does_not_retry_failed_connections(httpx_mock: HTTPXMock):
+    httpx_mock.add_exception(
+        httpx.ConnectError("Name or service not known"), url=URL, is_reusable=True
+    )
+    client = WDIClient(scheduler=WDIScheduler(backoff_base=10))
+
+    with pytest.raises(httpx.ConnectError):
+        perform_request("languages", per_page=1, client=client)
+    with pytest.raises(httpx.ConnectError):
+        asyncio.run(perform_request_async("languages", per_page=1, client=client))
+    assert len(httpx_mock.get_requests()) == 2
+
+
+def test_scheduler_async_retries(httpx_mock: HTTPXMock):
+    httpx_mock.add_response(url=URL, json=page_body(1, 2))
+    httpx_mock.add_response(url=f"{URL}&page=2", status_code=502)
+    httpx_mock.add_response(url=f"{URL}&page=2", json=page_body(2, 2))
+    client = WDIClient(scheduler=WDIScheduler(backoff_base=0))
+
+    result = asyncio.run(perform_request_async("languages", per_page=1, client=client))
+
+    assert [record["code"] for record in result] == ["l1", "l2"]
+
+
+def test_scheduler_limits_requests_in_flight():
+    scheduler = WDIScheduler(max_concurrency=2)
+    in_flight, peak = 0, 0
+    lock = threading.Lock()
+
+    def request():
+        nonlocal in_flight, peak
+        with lock:
+            in_flight += 1
+            peak = max(peak, in_flight)
+        time.sleep(0.02)
+        with lock:
+            in_flight -= 1
+        return httpx.Response(200)
+
+    threads = [
+        threading.Thread(target=scheduler.send, args=(request,)) for _ in range(6)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert peak == 2
+
+
+def test_scheduler_async_waits_for_free_slot():
+    scheduler = WDIScheduler(max_concurrency=2)
+    in_flight, peak = 0, 0
+
+    async def request():
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return httpx.Response(200)
+
+    async def main():
+        return await asyncio.gather(*[scheduler.send_async(request) for _ in range(6)])
+
+    assert len(asyncio.run(main())) == 6
+    assert peak == 2
+    assert scheduler.in_flight == 0
+
+
+def test_scheduler_adapts_limit():
+    scheduler = WDIScheduler(max_concurrency=8, min_concurrency=2)
+
+    for _ in range(3):
+        scheduler.decrease()
+    assert scheduler.concurrency < 4
+
+    for _ in range(40):
+        scheduler.increase()
+    assert scheduler.concurrency == 8
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("2.5") == 2.5
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after(None) is None
+
+
+def test_scheduler_invalid_options():
+    with pytest.raises(ValueError):
+        WDIScheduler(max_concurrency=0)
+    with pytest.raises(ValueError):
+        WDIScheduler(max_concurrency=2, min_concurrency=3)
+    with pytest.raises(ValueError):
+        WDIScheduler(max_retries=-1)
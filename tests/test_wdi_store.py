@@ -0,0 +1,237 @@
+import polars as pl
+import pytest
+from pytest_httpx import HTTPXMock
+
+from wbwdi import WDIStore, wdi_clear_metadata_cache, wdi_get, wdi_refresh
+from wbwdi.wdi_store import plan_refresh
+from tests.test_wdi_get import (
+    BASE_URL,
+    add_empty_indicator_response,
+    add_entities_response,
+    add_indicator_response,
+    indicator_record,
+)
+
+
+def add_sources_response(httpx_mock, update_date):
+    httpx_mock.add_response(
+        url=f"{BASE_URL}en/sources?format=json&per_page=1000",
+        json=[
+            {"page": 1, "pages": 1, "per_page": 1000, "total": 1},
+            [
+                {
+                    "id": "2",
+                    "lastupdated": update_date,
+                    "name": "World Development Indicators",
+                    "code": "WDI",
+                    "description": "",
+                    "url": "",
+                    "dataavailability": "Y",
+                    "metadataavailability": "Y",
+                    "concepts": "3",
+                }
+            ],
+        ],
+    )
+
+
+def create_records(years):
+    return [
+        indicator_record("SP.POP.TOTL", iso2code, iso3code, str(year), value)
+        for year in years
+        for iso2code, iso3code, value in [("US", "USA", 1.0), ("CA", "CAN", 2.0)]
+    ]
+
+
+def test_refresh_downloads_missing_years_and_updated_sources(
+    httpx_mock: HTTPXMock, tmp_path
+):
+    store = WDIStore(tmp_path)
+    add_sources_response(httpx_mock, "2025-01-28")
+    add_indicator_response(
+        httpx_mock,
+        "all",
+        "SP.POP.TOTL",
+        create_records([2019, 2020]),
+        "&date=2019:2020&source=2",
+    )
+    add_indicator_response(
+        httpx_mock,
+        "all",
+        "SP.POP.TOTL",
+        create_records([2018]),
+        "&date=2018:2018&source=2",
+    )
+
+    refreshed = wdi_refresh(store, "SP.POP.TOTL", 2019, 2020, source=2, progress=False)
+    assert refreshed.row(0) == ("SP.POP.TOTL", "annual", "full", 4)
+
+    refreshed = wdi_refresh(store, "SP.POP.TOTL", 2019, 2020, source=2, progress=False)
+    assert refreshed["action"].to_list() == ["skipped"]
+
+    refreshed = wdi_refresh(store, "SP.POP.TOTL", 2018, 2020, source=2, progress=False)
+    assert refreshed.row(0) == ("SP.POP.TOTL", "annual", "incremental", 6)
+
+    stored = store.read("SP.POP.TOTL")
+    assert stored["year"].to_list() == [2018, 2018, 2019, 2019, 2020, 2020]
+    assert set(stored["entity_id"]) == {"USA", "CAN"}
+    assert store.info().select("start_year", "end_year", "rows").row(0) == (
+        2018,
+        2020,
+        6,
+    )
+
+    # A newer source release replaces the stored data
+    wdi_clear_metadata_cache("sources")
+    add_sources_response(httpx_mock, "2025-07-01")
+    add_indicator_response(
+        httpx_mock,
+        "all",
+        "SP.POP.TOTL",
+        create_records([2018, 2019, 2020]),
+        "&date=2018:2020&source=2",
+    )
+    refreshed = wdi_refresh(store, "SP.POP.TOTL", 2019, 2020, source=2, progress=False)
+    assert refreshed.row(0) == ("SP.POP.TOTL", "annual", "full", 6)
+    assert store.info()["source_update_date"].to_list() == [
+        pl.Series(["2025-07-01"]).str.to_date()[0]
+    ]
+
+
+def test_refresh_looks_up_source_of_requested_indicators(
+    httpx_mock: HTTPXMock, tmp_path
+):
+    add_sources_response(httpx_mock, "2025-01-28")
+    httpx_mock.add_response(
+        url=f"{BASE_URL}en/indicator/SP.POP.TOTL?format=json&per_page=1000",
+        json=[
+            {"page": 1, "pages": 1, "per_page": 1000, "total": 1},
+            [
+                {
+                    "id": "SP.POP.TOTL",
+                    "name": "Population, total",
+                    "source": {"id": "2", "value": "World Development Indicators"},
+                    "sourceNote": "",
+                    "sourceOrganization": "",
+                    "topics": [],
+                }
+            ],
+        ],
+    )
+    add_indicator_response(
+        httpx_mock, "all", "SP.POP.TOTL", create_records([2020]), "&date=2020:2020"
+    )
+
+    wdi_refresh(tmp_path, "SP.POP.TOTL", 2020, 2020, progress=False)
+
+    assert WDIStore(tmp_path).info().select("source_id", "rows").row(0) == (2, 2)
+    assert WDIStore(tmp_path).read("SP.POP.TOTL").columns == [
+        "entity_id",
+        "indicator_id",
+        "value",
+        "year",
+    ]
+
+
+def test_refresh_stores_empty_quarterly_data(httpx_mock: HTTPXMock, tmp_path):
+    add_sources_response(httpx_mock, "2025-01-28")
+    add_empty_indicator_response(
+        httpx_mock, "all", "DT.DOD.DECT.CD", "&date=2020Q1:2020Q4&source=2"
+    )
+
+    refreshed = wdi_refresh(
+        tmp_path,
+        "DT.DOD.DECT.CD",
+        2020,
+        2020,
+        frequency="quarter",
+        source=2,
+        progress=False,
+    )
+
+    assert refreshed.row(0) == ("DT.DOD.DECT.CD", "quarter", "full", 0)
+    assert WDIStore(tmp_path).read("DT.DOD.DECT.CD", "quarter").columns == [
+        "entity_id",
+        "indicator_id",
+        "value",
+        "year",
+        "quarter",
+    ]
+
+
+def test_wdi_get_reads_requested_entities_from_store(httpx_mock: HTTPXMock, tmp_path):
+    add_sources_response(httpx_mock, "2025-01-28")
+    add_entities_response(httpx_mock)
+    add_indicator_response(
+        httpx_mock,
+        "all",
+        "SP.POP.TOTL",
+        create_records([2019, 2020]),
+        "&date=2019:2020&source=2",
+    )
+
+    result = wdi_get(
+        "US",
+        "SP.POP.TOTL",
+        start_year=2019,
+        end_year=2020,
+        source=2,
+        progress=False,
+        store=tmp_path,
+    )
+    assert result["entity_id"].to_list() == ["USA", "USA"]
+    assert result["year"].to_list() == [2019, 2020]
+
+    # Stored years are read without sending a request
+    result = wdi_get(
+        ["CAN"],
+        "SP.POP.TOTL",
+        start_year=2020,
+        end_year=2020,
+        source=2,
+        progress=False,
+        format="wide",
+        store=tmp_path,
+    )
+    assert result.columns == ["entity_id", "year", "SP.POP.TOTL"]
+    assert result.row(0) == ("CAN", 2020, 2.0)
+
+
+def test_wdi_get_store_rejects_most_recent_only(tmp_path):
+    with pytest.raises(ValueError, match="most_recent_only"):
+        wdi_get("US", "SP.POP.TOTL", most_recent_only=True, store=tmp_path)
+
+
+def test_plan_refresh():
+    entry = {
+        "source_id": 2,
+        "source_update_date": "2025-01-28",
+        "start_year": 2010,
+        "end_year": 2020,
+    }
+    assert plan_refresh(None, 2, "2025-01-28", 2000, 2020) == (
+        "full",
+        [(2000, 2020)],
+        (2000, 2020),
+    )
+    assert plan_refresh(entry, 2, "2025-01-28", 2012, 2018) == (
+        "skipped",
+        [],
+        (2010, 2020),
+    )
+    assert plan_refresh(entry, 2, "2025-01-28", 2005, 2022) == (
+        "incremental",
+        [(2005, 2009), (2021, 2022)],
+        (2005, 2022),
+    )
+    assert plan_refresh(entry, 2, "2025-01-28", None, None) == (
+        "full",
+        [(None, None)],
+        (None, None),
+    )
+    assert plan_refresh(entry, 2, "2025-02-01", 2012, 2018) == (
+        "full",
+        [(2010, 2020)],
+        (2010, 2020),
+    )
+    assert plan_refresh(entry, 2, None, 2012, 2018)[0] == "full"
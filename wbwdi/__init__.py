@@ -1,25 +1,136 @@
-from .config import wdi_set_format
-from .wdi_get import wdi_get
-from .wdi_get_entities import wdi_get_entities
-from .wdi_get_income_levels import wdi_get_income_levels
-from .wdi_get_indicators import wdi_get_indicators
-from .wdi_get_languages import wdi_get_languages
-from .wdi_get_lending_types import wdi_get_lending_types
-from .wdi_get_regions import wdi_get_regions
-from .wdi_get_sources import wdi_get_sources
-from .wdi_get_topics import wdi_get_topics
-from .wdi_search import wdi_search
+import importlib
+import sys
+import types
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .config import wdi_set_format
+    from .metadata_cache import wdi_clear_metadata_cache, wdi_set_metadata_cache
+    from .wdi_cache import WDICache
+    from .wdi_client import WDIClient, wdi_set_client
+    from .wdi_entity_snapshot import wdi_refresh_entity_snapshot
+    from .wdi_get import wdi_get, wdi_get_async
+    from .wdi_get_entities import wdi_get_entities, wdi_get_entities_async
+    from .wdi_get_income_levels import (
+        wdi_get_income_levels,
+        wdi_get_income_levels_async,
+    )
+    from .wdi_get_indicators import wdi_get_indicators, wdi_get_indicators_async
+    from .wdi_get_languages import wdi_get_languages, wdi_get_languages_async
+    from .wdi_get_lending_types import (
+        wdi_get_lending_types,
+        wdi_get_lending_types_async,
+    )
+    from .wdi_get_regions import wdi_get_regions, wdi_get_regions_async
+    from .wdi_get_sources import wdi_get_sources, wdi_get_sources_async
+    from .wdi_get_topics import wdi_get_topics, wdi_get_topics_async
+    from .wdi_iter import wdi_iter, wdi_iter_async
+    from .wdi_load_bulk import wdi_load_bulk
+    from .wdi_observer import WDITimings, wdi_observe
+    from .wdi_scan import wdi_scan
+    from .wdi_scheduler import WDIScheduler
+    from .wdi_search import wdi_search
+    from .wdi_store import WDIStore, wdi_refresh
+
+# The module of every public name. Submodules, and with them `polars` and `httpx`, are
+# only imported when one of their names is used for the first time
+EXPORTS = {
+    "WDICache": "wdi_cache",
+    "WDIClient": "wdi_client",
+    "WDIScheduler": "wdi_scheduler",
+    "WDIStore": "wdi_store",
+    "WDITimings": "wdi_observer",
+    "wdi_clear_metadata_cache": "metadata_cache",
+    "wdi_get": "wdi_get",
+    "wdi_get_async": "wdi_get",
+    "wdi_get_entities": "wdi_get_entities",
+    "wdi_get_entities_async": "wdi_get_entities",
+    "wdi_get_income_levels": "wdi_get_income_levels",
+    "wdi_get_income_levels_async": "wdi_get_income_levels",
+    "wdi_get_indicators": "wdi_get_indicators",
+    "wdi_get_indicators_async": "wdi_get_indicators",
+    "wdi_get_languages": "wdi_get_languages",
+    "wdi_get_languages_async": "wdi_get_languages",
+    "wdi_get_lending_types": "wdi_get_lending_types",
+    "wdi_get_lending_types_async": "wdi_get_lending_types",
+    "wdi_get_regions": "wdi_get_regions",
+    "wdi_get_regions_async": "wdi_get_regions",
+    "wdi_get_sources": "wdi_get_sources",
+    "wdi_get_sources_async": "wdi_get_sources",
+    "wdi_get_topics": "wdi_get_topics",
+    "wdi_get_topics_async": "wdi_get_topics",
+    "wdi_iter": "wdi_iter",
+    "wdi_iter_async": "wdi_iter",
+    "wdi_load_bulk": "wdi_load_bulk",
+    "wdi_observe": "wdi_observer",
+    "wdi_refresh": "wdi_store",
+    "wdi_refresh_entity_snapshot": "wdi_entity_snapshot",
+    "wdi_scan": "wdi_scan",
+    "wdi_search": "wdi_search",
+    "wdi_set_client": "wdi_client",
+    "wdi_set_format": "config",
+    "wdi_set_metadata_cache": "metadata_cache",
+}
 
 __all__ = [
+    "WDICache",
+    "WDIClient",
+    "WDIScheduler",
+    "WDIStore",
+    "WDITimings",
+    "wdi_clear_metadata_cache",
     "wdi_get",
+    "wdi_get_async",
     "wdi_get_entities",
+    "wdi_get_entities_async",
     "wdi_get_income_levels",
+    "wdi_get_income_levels_async",
     "wdi_get_indicators",
+    "wdi_get_indicators_async",
     "wdi_get_languages",
+    "wdi_get_languages_async",
     "wdi_get_lending_types",
+    "wdi_get_lending_types_async",
     "wdi_get_regions",
+    "wdi_get_regions_async",
     "wdi_get_sources",
+    "wdi_get_sources_async",
     "wdi_get_topics",
+    "wdi_get_topics_async",
+    "wdi_iter",
+    "wdi_iter_async",
+    "wdi_load_bulk",
+    "wdi_observe",
+    "wdi_refresh",
+    "wdi_refresh_entity_snapshot",
+    "wdi_scan",
     "wdi_search",
+    "wdi_set_client",
     "wdi_set_format",
+    "wdi_set_metadata_cache",
 ]
+
+
+def __getattr__(name):
+    module_name = EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+
+class LazyModule(types.ModuleType):
+    def __setattr__(self, name, value):
+        # Importing a submodule binds it to the package, which would shadow the function
+        # of the same name, e.g., the module `wdi_get` the function `wdi_get`
+        if isinstance(value, types.ModuleType) and EXPORTS.get(name) == name:
+            value = getattr(value, name)
+        super().__setattr__(name, value)
+
+
+sys.modules[__name__].__class__ = LazyModule
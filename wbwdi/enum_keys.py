@@ -0,0 +1,36 @@
+from typing import Iterable, List
+
+import polars as pl
+
+from .wdi_entity_snapshot import load_entity_snapshot
+
+
+def cast_indicator_keys(
+    indicators_processed: pl.DataFrame, indicators: List[str]
+) -> pl.DataFrame:
+    """
+    Cast `entity_id` and `indicator_id` to `pl.Enum` columns.
+
+    The entities of the Enum are all ISO 3-country codes of the entity snapshot in
+    alphabetical order, so frames of different downloads usually share one type. The
+    indicators keep the requested order, which is also the order in which they sort.
+    Codes that are missing from these catalogs are added, so the cast never fails.
+    """
+    key_types = {}
+    if "entity_id" in indicators_processed.columns:
+        snapshot = load_entity_snapshot()
+        entity_ids = set(snapshot["entities"].values()) if snapshot else set()
+        entity_ids.update(indicators_processed["entity_id"].drop_nulls().unique())
+        key_types["entity_id"] = pl.Enum(sorted(entity_ids))
+    if "indicator_id" in indicators_processed.columns:
+        key_types["indicator_id"] = create_enum(
+            indicators, indicators_processed["indicator_id"].drop_nulls().unique()
+        )
+    return indicators_processed.cast(key_types)
+
+
+def create_enum(categories: Iterable[str], values: Iterable[str]) -> pl.Enum:
+    """An Enum of the categories in their order, followed by any other values."""
+    categories = list(dict.fromkeys(categories))
+    known = set(categories)
+    return pl.Enum(categories + sorted(set(values) - known))
@@ -0,0 +1,155 @@
+import functools
+import inspect
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+METADATA_CACHE_TTL = 60 * 60
+METADATA_CACHE_MAX_ENTRIES = 64
+
+
+class MetadataCache:
+    """
+    A thread-safe in-memory cache for metadata tables with a TTL and LRU eviction.
+    """
+
+    def __init__(self, ttl=METADATA_CACHE_TTL, max_entries=METADATA_CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, value = entry
+            if time.monotonic() - stored_at >= self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        if self.ttl <= 0 or self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self, resource: Optional[str] = None):
+        with self._lock:
+            if resource is None:
+                self._entries.clear()
+            else:
+                for key in [key for key in self._entries if key[0] == resource]:
+                    del self._entries[key]
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+
+METADATA_CACHE = MetadataCache()
+
+
+def memoize_metadata(resource: str):
+    """
+    Memoize a function that returns a metadata table in `METADATA_CACHE`.
+
+    Results are keyed on the resource, the arguments of the call (e.g., `language`)
+    and the base URL of the client. Synchronous and asynchronous functions of the same
+    resource share their entries.
+    """
+
+    def decorator(function):
+        signature = inspect.signature(function)
+
+        def create_key(args, kwargs):
+            arguments = signature.bind(*args, **kwargs)
+            arguments.apply_defaults()
+            client = arguments.arguments.pop("client", None)
+            base_url = getattr(client, "base_url", None)
+            return (resource, tuple(arguments.arguments.items()), base_url)
+
+        if inspect.iscoroutinefunction(function):
+
+            @functools.wraps(function)
+            async def wrapper(*args, **kwargs):
+                key = create_key(args, kwargs)
+                value = METADATA_CACHE.get(key)
+                if value is None:
+                    value = await function(*args, **kwargs)
+                    METADATA_CACHE.set(key, value)
+                return value
+
+        else:
+
+            @functools.wraps(function)
+            def wrapper(*args, **kwargs):
+                key = create_key(args, kwargs)
+                value = METADATA_CACHE.get(key)
+                if value is None:
+                    value = function(*args, **kwargs)
+                    METADATA_CACHE.set(key, value)
+                return value
+
+        return wrapper
+
+    return decorator
+
+
+def wdi_set_metadata_cache(
+    ttl: int = METADATA_CACHE_TTL, max_entries: int = METADATA_CACHE_MAX_ENTRIES
+):
+    """
+    Configure the in-memory cache for metadata tables.
+
+    Metadata tables (entities, sources, indicators, regions, topics, income levels,
+    lending types and languages) are kept in memory after the first download, so
+    repeated calls, including the lookups inside `wdi_get()`, do not send new requests.
+
+    Parameters
+    ----------
+    ttl (int): The number of seconds a table is kept. Use 0 to disable the cache.
+        Defaults to 3600.
+    max_entries (int): The maximum number of tables that are kept. The least recently
+        used table is removed first. Defaults to 64.
+
+    Examples
+    --------
+    Keep metadata tables for one day
+    >>> wdi_set_metadata_cache(ttl=24 * 60 * 60)
+
+    Disable the cache
+    >>> wdi_set_metadata_cache(ttl=0)
+    """
+    if not isinstance(ttl, int) or ttl < 0:
+        raise ValueError("`ttl` must be a non-negative integer.")
+    if not isinstance(max_entries, int) or max_entries < 0:
+        raise ValueError("`max_entries` must be a non-negative integer.")
+    METADATA_CACHE.ttl = ttl
+    METADATA_CACHE.max_entries = max_entries
+    METADATA_CACHE.clear()
+
+
+def wdi_clear_metadata_cache(resource: Optional[str] = None):
+    """
+    Remove metadata tables from the in-memory cache.
+
+    Parameters
+    ----------
+    resource (str, optional): Only remove tables of this resource, one of "entities",
+        "sources", "indicators", "regions", "topics", "income_levels", "lending_types"
+        or "languages". If None, all tables are removed.
+
+    Examples
+    --------
+    Download the sources again on the next call
+    >>> wdi_clear_metadata_cache("sources")
+    """
+    METADATA_CACHE.clear(resource)
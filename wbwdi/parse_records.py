@@ -0,0 +1,42 @@
+from typing import Dict, List, Optional, Tuple
+
+import polars as pl
+
+
+def parse_records(
+    records: Optional[List[dict]], fields: Dict[str, Tuple[str, ...]]
+) -> pl.DataFrame:
+    """
+    Build a DataFrame of string columns from a list of JSON records.
+
+    Each column is read from the path of keys in `fields` (e.g., ("region", "id") for
+    the `id` of the nested `region` object), which avoids inferring and unnesting
+    structs. Missing keys result in missing values.
+    """
+    records = records or []
+    return pl.DataFrame(
+        {column: extract_field(records, path) for column, path in fields.items()},
+        schema={column: pl.Utf8 for column in fields},
+        strict=False,
+    )
+
+
+def extract_field(records: List[dict], path: Tuple[str, ...]) -> list:
+    if len(path) == 1:
+        key = path[0]
+        return [record.get(key) for record in records]
+    values = records
+    for key in path:
+        values = [value.get(key) if value else None for value in values]
+    return values
+
+
+def clean_strings(*columns: str) -> List[pl.Expr]:
+    """Replace empty strings with missing values and strip whitespace in one pass."""
+    return [
+        pl.when(pl.col(column) == "")
+        .then(None)
+        .otherwise(pl.col(column).str.strip_chars())
+        .alias(column)
+        for column in columns
+    ]
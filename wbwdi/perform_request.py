@@ -1,18 +1,57 @@
-import sys
-from typing import List, Optional, Union
+import asyncio
+import math
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain, islice
+from typing import (
+    AsyncIterator,
+    Callable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Union,
+)
 
 import httpx
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+from .wdi_observer import (
+    create_progress_observers,
+    emit,
+    get_pages,
+    parse_page_number,
+    submit_in_context,
+)
+from .wdi_observer import print_progress  # noqa: F401 (moved, kept importable here)
+
+BASE_URL = "https://api.worldbank.org/v2/"
+# With per_page="auto", a probe with the default page size returns the total number of
+# rows, and larger results are requested with pages of up to 10,000 rows (a few MB)
+AUTO_PROBE_PER_PAGE = 1000
+AUTO_MIN_PER_PAGE = 1000
+AUTO_MAX_PER_PAGE = 10000
+HEADERS = {
+    "User-Agent": "wbwdi Python library (https://github.com/tidy-intelligence/py-wbwdi)"
+}
+
 
 def perform_request(
     resource: str,
     language: Optional[str] = None,
-    per_page: int = 1000,
+    per_page: Union[int, str] = 1000,
     date: Optional[str] = None,
     most_recent_only: bool = False,
     source: Optional[str] = None,
     progress: bool = False,
-    base_url: str = "https://api.worldbank.org/v2/",
+    base_url: Optional[str] = None,
+    max_concurrency: int = 1,
+    client=None,
 ) -> Union[List[dict], None]:
     """
     Perform a request to the World Bank API with optional parameters for pagination,
@@ -28,16 +67,25 @@ def perform_request(
         The endpoint for the World Bank API resource (e.g., "incomeLevels", "lendingTypes").
     language : Optional[str], default=None
         The language code for the API response.
-    per_page : int, default=1000
-        The number of results per page for the API. Must be between 1 and 32,500.
+    per_page : Union[int, str], default=1000
+        The number of results per page for the API. Must be between 1 and 32,500, or
+        "auto" to choose the page size from the total number of results.
     date : Optional[str], default=None
         Date range of data to retrieve (e.g., "2000:2020"). If None, no date filtering is applied.
     source : Optional[str], default=None
         Specific data source for the API request. If None, no specific source is selected.
     progress : bool, default=False
-        Whether to display a progress bar for paginated requests.
-    base_url : str, default="https://api.worldbank.org/v2/"
-        The base URL of the World Bank API.
+        Whether to display a progress bar for paginated requests. Progress is printed
+        by an observer of the `page` events, see `wdi_observe()`.
+    base_url : Optional[str], default=None
+        The base URL of the World Bank API. If None, the base URL of the client is used,
+        which defaults to "https://api.worldbank.org/v2/".
+    max_concurrency : int, default=1
+        The maximum number of pages that are downloaded in parallel. With the
+        default of 1, pages are downloaded one after another.
+    client : Optional[WDIClient], default=None
+        The client whose connection pool is used for the requests. If None, the shared
+        default client is used.
 
     Returns:
     -------
@@ -49,48 +97,562 @@ def perform_request(
     ------
     - The function validates the `per_page` parameter.
     - Handles errors with descriptive messages when the API returns an error.
-    - For paginated results, iterates through all pages to gather complete data.
+    - For paginated results, iterates through all pages to gather complete data. The
+      first response is reused as page 1, and the remaining pages are fetched with up
+      to `max_concurrency` parallel requests. Results are always returned in page order.
+    - With `per_page="auto"`, a first request with 1,000 results per page returns the
+      total number of results. Larger results are then requested again with as few
+      pages of at most 10,000 results as possible, spread over up to `max_concurrency`
+      pages of at least 1,000 results each for parallel downloads.
+
+    Raises:
+    ------
+    ValueError
+        If `per_page` is not an integer between 1 and 32,500 or "auto", or if
+        `max_concurrency` is not a positive integer.
+    RuntimeError
+        If the API returns an error for any of the requested pages.
+    """
+
+    results = []
+    for page_results in iter_pages(
+        resource,
+        language,
+        per_page,
+        date,
+        most_recent_only,
+        source,
+        progress,
+        base_url,
+        max_concurrency,
+        client,
+    ):
+        results.extend(page_results)
+    return results
+
+
+def iter_pages(
+    resource: str,
+    language: Optional[str] = None,
+    per_page: Union[int, str] = 1000,
+    date: Optional[str] = None,
+    most_recent_only: bool = False,
+    source: Optional[str] = None,
+    progress: bool = False,
+    base_url: Optional[str] = None,
+    max_concurrency: int = 1,
+    client=None,
+    process: Optional[Callable] = None,
+) -> Iterator[List[dict]]:
+    """
+    Yield the records of a World Bank API request page by page.
+
+    This is the streaming version of `perform_request()`. It accepts the same
+    parameters, but yields the list of JSON objects of each page in page order as soon
+    as it is available, instead of collecting all pages. At most a few pages beyond
+    `max_concurrency` are held in memory at any time.
+
+    If a `process` function is given, it is applied to the records of each page on a
+    worker thread as soon as the page is downloaded, and its results are yielded
+    instead of the records. Processing then overlaps the downloads of the next pages.
 
     Raises:
     ------
     ValueError
-        If `per_page` is not an integer between 1 and 32,500.
+        If `per_page` is not an integer between 1 and 32,500 or "auto", or if
+        `max_concurrency` is not a positive integer.
+    RuntimeError
+        If the API returns an error for any of the requested pages.
     """
 
     validate_per_page(per_page)
+    validate_max_concurrency(max_concurrency)
+
+    client = resolve_client(client)
+    progress_observers = create_progress_observers(progress)
+    url, body = get_first_page(
+        client,
+        base_url or client.base_url,
+        resource,
+        language,
+        per_page,
+        date,
+        most_recent_only,
+        source,
+        max_concurrency,
+    )
+    pages = int(body[0]["pages"])
+    page_results = body[1] or []
+    del body
+
+    if process is not None:
+        processed = fetch_processed_pages(
+            client,
+            url,
+            resource,
+            page_results,
+            range(2, pages + 1),
+            max_concurrency,
+            process,
+        )
+        del page_results
+        for page, page_processed in enumerate(processed, start=1):
+            emit_page(
+                client, progress_observers, resource, page, pages, page_processed, page
+            )
+            yield page_processed
+        return
+
+    emit_page(client, progress_observers, resource, 1, pages, page_results, 1)
+    yield page_results
+
+    remaining = fetch_pages(client, url, resource, range(2, pages + 1), max_concurrency)
+    for page, page_results in enumerate(remaining, start=2):
+        emit_page(client, progress_observers, resource, page, pages, page_results, page)
+        yield page_results
+
+
+async def perform_request_async(
+    resource: str,
+    language: Optional[str] = None,
+    per_page: Union[int, str] = 1000,
+    date: Optional[str] = None,
+    most_recent_only: bool = False,
+    source: Optional[str] = None,
+    progress: bool = False,
+    base_url: Optional[str] = None,
+    max_concurrency: int = 1,
+    client=None,
+) -> Union[List[dict], None]:
+    """
+    Perform an asynchronous request to the World Bank API.
+
+    This is the asynchronous version of `perform_request()` built on the pooled
+    `httpx.AsyncClient` of the client. It accepts the same parameters and returns the
+    same list of JSON objects. The remaining pages of a paginated response are gathered
+    with `asyncio.gather`, with at most `max_concurrency` requests in flight at the
+    same time.
+
+    Raises:
+    ------
+    ValueError
+        If `per_page` is not an integer between 1 and 32,500 or "auto", or if
+        `max_concurrency` is not a positive integer.
+    RuntimeError
+        If the API returns an error for any of the requested pages.
+    """
+
+    validate_per_page(per_page)
+    validate_max_concurrency(max_concurrency)
+
+    client = resolve_client(client)
+    progress_observers = create_progress_observers(progress)
+    url, body = await get_first_page_async(
+        client,
+        base_url or client.base_url,
+        resource,
+        language,
+        per_page,
+        date,
+        most_recent_only,
+        source,
+        max_concurrency,
+    )
+    pages = int(body[0]["pages"])
+    # Empty results have 0 pages and no records
+    first_results = body[1] or []
+    emit_page(client, progress_observers, resource, 1, pages, first_results, 1)
+
+    if pages <= 1:
+        return first_results
+    else:
+        semaphore = asyncio.Semaphore(max_concurrency)
+        completed = 1
+
+        async def fetch_page(page: int) -> list:
+            nonlocal completed
+            async with semaphore:
+                page_body = await get_page_async(client, f"{url}&page={page}", resource)
+            completed += 1
+            emit_page(
+                client,
+                progress_observers,
+                resource,
+                page,
+                pages,
+                page_body[1],
+                completed,
+            )
+            return page_body[1]
+
+        remaining = await asyncio.gather(
+            *[fetch_page(page) for page in range(2, pages + 1)]
+        )
+        results = list(first_results)
+        for page_results in remaining:
+            results.extend(page_results)
+        return results
+
+
+async def iter_pages_async(
+    resource: str,
+    language: Optional[str] = None,
+    per_page: Union[int, str] = 1000,
+    date: Optional[str] = None,
+    most_recent_only: bool = False,
+    source: Optional[str] = None,
+    progress: bool = False,
+    base_url: Optional[str] = None,
+    max_concurrency: int = 1,
+    client=None,
+) -> AsyncIterator[List[dict]]:
+    """
+    Yield the records of a World Bank API request page by page asynchronously.
+
+    This is the asynchronous version of `iter_pages()`. It accepts the same parameters
+    and yields the same lists of JSON objects in page order, with at most
+    `max_concurrency` requests in flight at the same time.
+    """
+
+    validate_per_page(per_page)
+    validate_max_concurrency(max_concurrency)
+
+    client = resolve_client(client)
+    progress_observers = create_progress_observers(progress)
+    url, body = await get_first_page_async(
+        client,
+        base_url or client.base_url,
+        resource,
+        language,
+        per_page,
+        date,
+        most_recent_only,
+        source,
+        max_concurrency,
+    )
+    pages = int(body[0]["pages"])
+    page_results = body[1] or []
+    del body
+
+    emit_page(client, progress_observers, resource, 1, pages, page_results, 1)
+    yield page_results
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def fetch_page(page: int) -> list:
+        async with semaphore:
+            return await get_page_async(client, f"{url}&page={page}", resource)
+
+    page_numbers = iter(range(2, pages + 1))
+    tasks = deque(
+        asyncio.ensure_future(fetch_page(page))
+        for page in islice(page_numbers, 2 * max_concurrency)
+    )
+    try:
+        for page in range(2, pages + 1):
+            page_body = await tasks.popleft()
+            for next_page in islice(page_numbers, 1):
+                tasks.append(asyncio.ensure_future(fetch_page(next_page)))
+            emit_page(
+                client, progress_observers, resource, page, pages, page_body[1], page
+            )
+            yield page_body[1]
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+def get_first_page(
+    client,
+    base_url,
+    resource,
+    language,
+    per_page,
+    date,
+    most_recent_only,
+    source,
+    max_concurrency,
+):
+    """Return the URL of all pages and the body of the first page."""
+    if per_page == "auto":
+        url = create_request_url(
+            base_url,
+            resource,
+            language,
+            AUTO_PROBE_PER_PAGE,
+            date,
+            most_recent_only,
+            source,
+        )
+        body = get_page(client, url, resource)
+        if int(body[0]["pages"]) <= 1:
+            return url, body
+        per_page = create_auto_per_page(int(body[0]["total"]), max_concurrency)
+        # The probe is the first page if its page size is chosen
+        if per_page == AUTO_PROBE_PER_PAGE:
+            return url, body
 
     url = create_request_url(
         base_url, resource, language, per_page, date, most_recent_only, source
     )
+    return url, get_page(client, url, resource)
+
+
+async def get_first_page_async(
+    client,
+    base_url,
+    resource,
+    language,
+    per_page,
+    date,
+    most_recent_only,
+    source,
+    max_concurrency,
+):
+    if per_page == "auto":
+        url = create_request_url(
+            base_url,
+            resource,
+            language,
+            AUTO_PROBE_PER_PAGE,
+            date,
+            most_recent_only,
+            source,
+        )
+        body = await get_page_async(client, url, resource)
+        if int(body[0]["pages"]) <= 1:
+            return url, body
+        per_page = create_auto_per_page(int(body[0]["total"]), max_concurrency)
+        # The probe is the first page if its page size is chosen
+        if per_page == AUTO_PROBE_PER_PAGE:
+            return url, body
+
+    url = create_request_url(
+        base_url, resource, language, per_page, date, most_recent_only, source
+    )
+    return url, await get_page_async(client, url, resource)
+
+
+def create_auto_per_page(total: int, max_concurrency: int = 1) -> int:
+    """
+    Choose the page size for `total` rows with as few pages as possible, while pages
+    stay below `AUTO_MAX_PER_PAGE` rows. With parallel downloads, the rows are spread
+    over up to `max_concurrency` pages, as long as pages keep `AUTO_MIN_PER_PAGE` rows.
+    """
+    pages = max(
+        math.ceil(total / AUTO_MAX_PER_PAGE),
+        min(max_concurrency, total // AUTO_MIN_PER_PAGE),
+        1,
+    )
+    return max(1, math.ceil(total / pages))
+
+
+def resolve_client(client):
+    if client is None:
+        from .wdi_client import get_default_client
+
+        client = get_default_client()
+    return client
+
+
+def get_page(client, url: str, resource: str) -> list:
+    """
+    Download and decode a page. Concurrent requests for the same URL on a client share
+    one download and its decoded body, which callers must not modify.
+    """
+    return client.single_flight.do(url, lambda: download_page(client, url, resource))
+
+
+async def get_page_async(client, url: str, resource: str) -> list:
+    return await client.single_flight.do_async(
+        url, lambda: download_page_async(client, url, resource)
+    )
+
+
+def download_page(client, url: str, resource: str) -> list:
+    page = parse_page_number(url)
+    emit("request_start", client, url=url, resource=resource, page=page)
+    start = time.perf_counter()
+    response = client.scheduler.send(lambda: send_request(client, url, resource))
+    return process_page(client, url, resource, page, response, start)
+
+
+async def download_page_async(client, url: str, resource: str) -> list:
+    page = parse_page_number(url)
+    emit("request_start", client, url=url, resource=resource, page=page)
+    start = time.perf_counter()
+    response = await client.scheduler.send_async(
+        lambda: send_request_async(client, url, resource)
+    )
+    return process_page(client, url, resource, page, response, start)
+
+
+def process_page(client, url, resource, page, response, start) -> list:
+    duration = time.perf_counter() - start
+    start = time.perf_counter()
+    body = None if response.status_code >= 400 else decode_body(response)
+    decode_duration = time.perf_counter() - start
 
-    headers = {
-        "User-Agent": "wbwdi Python library (https://github.com/tidy-intelligence/py-wbwdi)"
-    }
+    emit(
+        "request_end",
+        client,
+        url=url,
+        resource=resource,
+        page=page,
+        pages=get_pages(body),
+        status=response.status_code,
+        bytes=len(response.content),
+        duration=duration,
+    )
+    if body is not None:
+        emit(
+            "decode",
+            client,
+            url=url,
+            bytes=len(response.content),
+            duration=decode_duration,
+        )
 
-    with httpx.Client() as client:
-        response = client.get(url, headers=headers)
-        if is_request_error(response):
-            handle_request_error(response)
+    if is_request_error(response, body):
+        handle_request_error(response, body)
+    return body
 
-        body = response.json()
-        pages = int(body[0]["pages"])
 
-        if pages == 1:
-            return body[1]
-        else:
-            results = []
-            for page in range(1, pages + 1):
-                paginated_url = f"{url}&page={page}"
-                page_response = client.get(paginated_url)
-                if progress:
-                    print_progress(page, pages)
-                results.extend(page_response.json()[1])
-            return results
+def send_request(client, url: str, resource: str) -> httpx.Response:
+    if client.cache is None:
+        return client.http_client.get(url)
+    return client.cache.get(client.http_client, url, resource)
 
 
-def validate_per_page(per_page: int):
+async def send_request_async(client, url: str, resource: str) -> httpx.Response:
+    if client.cache is None:
+        return await client.async_http_client.get(url)
+    return await client.cache.get_async(client.async_http_client, url, resource)
+
+
+def fetch_pages(
+    client, url: str, resource: str, pages: Iterable[int], max_concurrency: int
+) -> Iterable[list]:
+    """
+    Yield the records of the given pages in page order, downloading up to
+    `max_concurrency` pages at the same time.
+    """
+    if max_concurrency == 1:
+        for page in pages:
+            yield get_page(client, f"{url}&page={page}", resource)[1]
+        return
+
+    # Only a bounded window of pages is requested ahead, so a slow consumer does not
+    # accumulate all remaining pages in memory
+    pages = iter(pages)
+    executor = ThreadPoolExecutor(max_workers=max_concurrency)
+    try:
+        futures = deque(
+            submit_in_context(
+                executor, get_page, client, f"{url}&page={page}", resource
+            )
+            for page in islice(pages, 2 * max_concurrency)
+        )
+        while futures:
+            body = futures.popleft().result()
+            for page in islice(pages, 1):
+                futures.append(
+                    submit_in_context(
+                        executor, get_page, client, f"{url}&page={page}", resource
+                    )
+                )
+            yield body[1]
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def fetch_processed_pages(
+    client,
+    url: str,
+    resource: str,
+    page_results: list,
+    pages: Iterable[int],
+    max_concurrency: int,
+    process: Callable,
+) -> Iterable:
+    """
+    Yield `process()` of the records of the first page and of the given pages in page
+    order. Each page is processed on a worker thread right after it is downloaded.
+    """
+    if max_concurrency == 1:
+        # Pages are downloaded one after another, while a background thread processes
+        # the page before
+        downloads = (
+            get_page(client, f"{url}&page={page}", resource)[1] or [] for page in pages
+        )
+        yield from process_in_background(chain([page_results], downloads), process)
+        return
+
+    # Every worker decodes and processes the page it downloaded, with the same bounded
+    # window of pages as `fetch_pages()`
+    pages = iter(pages)
+    executor = ThreadPoolExecutor(max_workers=max_concurrency)
+    try:
+        futures = deque([submit_in_context(executor, process, page_results)])
+        del page_results
+        futures.extend(
+            submit_in_context(
+                executor, fetch_processed_page, client, url, page, resource, process
+            )
+            for page in islice(pages, 2 * max_concurrency)
+        )
+        while futures:
+            page_processed = futures.popleft().result()
+            for page in islice(pages, 1):
+                futures.append(
+                    submit_in_context(
+                        executor,
+                        fetch_processed_page,
+                        client,
+                        url,
+                        page,
+                        resource,
+                        process,
+                    )
+                )
+            yield page_processed
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def fetch_processed_page(client, url: str, page: int, resource: str, process):
+    return process(get_page(client, f"{url}&page={page}", resource)[1] or [])
+
+
+def process_in_background(items: Iterable, process: Callable) -> Iterable:
+    """Yield `process()` of each item in order, one item ahead on a worker thread."""
+    executor = ThreadPoolExecutor(max_workers=1)
+    try:
+        pending = None
+        for item in items:
+            future = submit_in_context(executor, process, item)
+            del item
+            if pending is not None:
+                yield pending.result()
+            pending = future
+        if pending is not None:
+            yield pending.result()
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def validate_per_page(per_page: Union[int, str]):
+    if per_page == "auto":
+        return
     if not isinstance(per_page, int) or not (1 <= per_page <= 32500):
-        raise ValueError("`per_page` must be an integer between 1 and 32,500.")
+        raise ValueError(
+            '`per_page` must be an integer between 1 and 32,500, or "auto".'
+        )
+
+
+def validate_max_concurrency(max_concurrency: int):
+    if not isinstance(max_concurrency, int) or max_concurrency < 1:
+        raise ValueError("`max_concurrency` must be a positive integer.")
 
 
 def create_request_url(
@@ -115,18 +677,30 @@ def create_request_url(
     return url
 
 
-def is_request_error(response: httpx.Response) -> bool:
+def decode_body(response: httpx.Response):
+    """
+    Decode a JSON response body with `orjson` if it is installed, which is several
+    times faster than the standard library for large pages.
+    """
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
+
+
+def is_request_error(response: httpx.Response, body=None) -> bool:
     if response.status_code >= 400:
         return True
-    body = response.json()
+    if body is None:
+        body = decode_body(response)
     if len(body) == 1 and "message" in body[0]:
         return True
     return False
 
 
-def check_for_body_error(response: httpx.Response) -> List[str]:
+def check_for_body_error(response: httpx.Response, body=None) -> List[str]:
     if "application/json" in response.headers.get("Content-Type", ""):
-        body = response.json()
+        if body is None:
+            body = decode_body(response)
         message_id = body[0]["message"][0]["id"]
         message_value = body[0]["message"][0]["value"]
         docs = (
@@ -137,10 +711,19 @@ def check_for_body_error(response: httpx.Response) -> List[str]:
     return []
 
 
-def handle_request_error(response: httpx.Response):
-    error_body = check_for_body_error(response)
+def handle_request_error(response: httpx.Response, body=None):
+    error_body = check_for_body_error(response, body)
     raise RuntimeError("\n".join(error_body))
 
 
-def print_progress(current: int, total: int):
-    print(f"Progress: {current}/{total}", end="\r")
+def emit_page(client, observers, resource, page, pages, page_results, completed):
+    emit(
+        "page",
+        client,
+        observers,
+        resource=resource,
+        page=page,
+        pages=pages,
+        rows=len(page_results) if page_results is not None else 0,
+        completed=completed,
+    )
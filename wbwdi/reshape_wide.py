@@ -0,0 +1,125 @@
+from typing import Iterable, List, Optional
+
+import polars as pl
+
+TIME_COLUMNS = ("year", "quarter", "month")
+
+
+def create_wide_keys(columns) -> List[str]:
+    """The columns that identify a row of the wide format, e.g., entity and quarter."""
+    return ["entity_id"] + [column for column in TIME_COLUMNS if column in columns]
+
+
+class WideJoiner:
+    """
+    Join long frames with one indicator each into the wide format as they arrive.
+
+    Every frame is turned into a single value column and joined to the columns before,
+    so the caller can release each long frame right after adding it. Only the wide
+    result and the frame that is being added are held at any time.
+    """
+
+    def __init__(self):
+        self.indicators_wide: Optional[pl.DataFrame] = None
+        self.keys: Optional[List[str]] = None
+
+    def add(self, indicator_parsed: pl.DataFrame):
+        if indicator_parsed.height == 0:
+            return
+        self.keys = self.keys or create_wide_keys(indicator_parsed.columns)
+        indicator_wide = widen_indicator(indicator_parsed, self.keys)
+        if self.indicators_wide is None:
+            self.indicators_wide = indicator_wide
+            return
+        self.indicators_wide = self.indicators_wide.join(
+            indicator_wide, on=self.keys, how="full", coalesce=True
+        )
+
+    def result(self, indicators: Optional[List[str]] = None) -> pl.DataFrame:
+        """The joined frame, with value columns in the order of `indicators`."""
+        if self.indicators_wide is None:
+            return pl.DataFrame(schema={"entity_id": pl.Utf8, "year": pl.Int32})
+        if indicators is None:
+            return self.indicators_wide
+        # Frames may arrive in any order, unexpected indicators are placed last
+        order = {indicator: position for position, indicator in enumerate(indicators)}
+        value_columns = sorted(
+            (
+                column
+                for column in self.indicators_wide.columns
+                if column not in self.keys
+            ),
+            key=lambda column: order.get(column, len(order)),
+        )
+        return self.indicators_wide.select(*self.keys, *value_columns)
+
+
+def widen_indicators(indicators_parsed: Iterable[pl.DataFrame]) -> pl.DataFrame:
+    """Build the wide format from long frames with one indicator each, in order."""
+    wide_joiner = WideJoiner()
+    for indicator_parsed in indicators_parsed:
+        wide_joiner.add(indicator_parsed)
+    return wide_joiner.result()
+
+
+def widen_indicator(indicator_parsed: pl.DataFrame, keys: List[str]) -> pl.DataFrame:
+    indicator_ids = indicator_parsed["indicator_id"].unique(maintain_order=True)
+    if len(indicator_ids) > 1:
+        return pivot_wide(indicator_parsed)
+    return indicator_parsed.select(*keys, pl.col("value").alias(indicator_ids[0]))
+
+
+def sort_wide(indicators_wide: pl.DataFrame) -> pl.DataFrame:
+    return indicators_wide.sort(create_wide_keys(indicators_wide.columns))
+
+
+def pivot_wide(indicators_processed: pl.DataFrame) -> pl.DataFrame:
+    """Reshape a long frame into the wide format with the time key of its frequency."""
+    return indicators_processed.pivot(
+        index=create_wide_keys(indicators_processed.columns),
+        on="indicator_id",
+        values="value",
+    )
+
+
+def pivot_wide_lazy(
+    indicators_scanned: pl.LazyFrame, indicators: Optional[List[str]] = None
+) -> pl.LazyFrame:
+    """
+    Reshape a long LazyFrame into the wide format without collecting it.
+
+    The columns of a lazy result must be known in advance, so each indicator becomes an
+    aggregation over the rows of its entity and period. This runs on the streaming
+    engine, which keeps memory bounded for very wide results. If `indicators` is None,
+    the indicators are read from the data first.
+    """
+    if indicators is None:
+        indicators = (
+            indicators_scanned.select(
+                pl.col("indicator_id").unique(maintain_order=True)
+            )
+            .collect()
+            .to_series()
+            .to_list()
+        )
+    keys = create_wide_keys(indicators_scanned.collect_schema().names())
+    return (
+        indicators_scanned.group_by(keys)
+        .agg(
+            pl.col("value")
+            .filter(pl.col("indicator_id") == indicator)
+            .first()
+            .alias(indicator)
+            for indicator in indicators
+        )
+        .sort(keys)
+    )
+
+
+def collect_streaming(indicators_scanned: pl.LazyFrame) -> pl.DataFrame:
+    try:
+        return indicators_scanned.collect(engine="streaming")
+    except (TypeError, ValueError):  # pragma: no cover
+        # Polars versions before the streaming engine collect in memory, as their
+        # older streaming mode does not support all plans
+        return indicators_scanned.collect()
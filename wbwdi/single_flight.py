@@ -0,0 +1,79 @@
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Hashable
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls with the same key into a single call.
+
+    The first caller of a key runs the function, and every caller that asks for the
+    same key while the call is in flight waits for it and receives the same result, or
+    the same exception. Results are not kept once the call has finished, so later
+    callers run the function again. Callers share the returned object and must not
+    modify it.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._async_calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, function: Callable[[], Any]) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = Future()
+        if not leader:
+            return call.result()
+
+        try:
+            result = function()
+        except BaseException as error:
+            call.set_exception(error)
+            raise
+        else:
+            call.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+    async def do_async(
+        self, key: Hashable, function: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        # Futures are bound to their event loop, so calls are only shared within a loop
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            call = self._async_calls.get((loop, key))
+            leader = call is None
+            if leader:
+                call = self._async_calls[(loop, key)] = loop.create_future()
+                # Mark the exception as retrieved if no other caller waits for it
+                call.add_done_callback(
+                    lambda call: call.cancelled() or call.exception()
+                )
+        if not leader:
+            return await asyncio.shield(call)
+
+        try:
+            result = await function()
+        except asyncio.CancelledError:
+            call.cancel()
+            raise
+        except BaseException as error:
+            call.set_exception(error)
+            raise
+        else:
+            call.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._async_calls[(loop, key)]
+
+    def __len__(self) -> int:
+        """The number of calls in flight."""
+        with self._lock:
+            return len(self._calls) + len(self._async_calls)
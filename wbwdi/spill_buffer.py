@@ -0,0 +1,82 @@
+import tempfile
+import threading
+from pathlib import Path
+from typing import Dict
+
+import polars as pl
+
+
+class SpillBuffer:
+    """
+    A buffer of DataFrames by position that keeps frames in memory up to a budget and
+    writes all further frames to Arrow IPC files in a temporary directory.
+
+    Frames can be added from multiple threads. `scan()` returns all frames in the
+    order of their positions as a single LazyFrame, so they can be combined by the
+    streaming engine without reading the spilled files into memory at once. The files
+    are removed when the buffer is closed.
+
+    Parameters
+    ----------
+    memory_budget (int): The number of bytes of frames that are kept in memory.
+    """
+
+    def __init__(self, memory_budget: int):
+        self.memory_budget = memory_budget
+        self.memory_size = 0
+        self._frames: Dict[int, pl.DataFrame] = {}
+        self._paths: Dict[int, Path] = {}
+        self._lock = threading.Lock()
+        self._directory = tempfile.TemporaryDirectory(prefix="wbwdi-spill-")
+
+    def __setitem__(self, position: int, frame: pl.DataFrame):
+        if frame.height == 0:
+            return
+        size = frame.estimated_size()
+        with self._lock:
+            if self.memory_size + size <= self.memory_budget:
+                self._frames[position] = frame
+                self.memory_size += size
+                return
+
+        path = Path(self._directory.name) / f"{position}.arrow"
+        frame.write_ipc(path, compression="lz4")
+        with self._lock:
+            self._paths[position] = path
+
+    def __len__(self):
+        with self._lock:
+            return len(self._frames) + len(self._paths)
+
+    @property
+    def spilled(self) -> int:
+        """The number of frames that were written to disk."""
+        with self._lock:
+            return len(self._paths)
+
+    def scan(self, schema: dict) -> pl.LazyFrame:
+        """Return all frames in position order, or an empty frame with `schema`."""
+        with self._lock:
+            frames = {
+                **{position: frame.lazy() for position, frame in self._frames.items()},
+                **{
+                    position: pl.scan_ipc(path)
+                    for position, path in self._paths.items()
+                },
+            }
+        if not frames:
+            return pl.LazyFrame(schema=schema)
+        return pl.concat([frames[position] for position in sorted(frames)])
+
+    def close(self):
+        with self._lock:
+            self._frames.clear()
+            self._paths.clear()
+            self.memory_size = 0
+        self._directory.cleanup()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
@@ -0,0 +1,350 @@
+import gzip
+import hashlib
+import json
+import os
+import re
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+import httpx
+import polars as pl
+
+DAY = 24 * 60 * 60
+
+# The API reports some errors with status 200 and a body like [{"message": [...]}]
+JSON_LIST_PATTERN = re.compile(rb"\s*\[")
+ERROR_BODY_PATTERN = re.compile(rb'\s*\[\s*\{\s*"message"\s*:')
+
+# Metadata changes rarely, while indicator data is updated with each source release
+DEFAULT_TTLS = {
+    "countries": 7 * DAY,
+    "indicators": 7 * DAY,
+    "incomeLevels": 7 * DAY,
+    "languages": 7 * DAY,
+    "lendingTypes": 7 * DAY,
+    "region": 7 * DAY,
+    "sources": 7 * DAY,
+    "topics": 7 * DAY,
+    "country": DAY,
+}
+
+
+class WDICache:
+    """
+    An on-disk cache for World Bank API responses.
+
+    The cache stores the compressed body of every successful page response, keyed on
+    the request URL including its page number. Fresh entries are returned without a
+    request. Expired entries are revalidated with `If-None-Match` and
+    `If-Modified-Since` headers if the API sent an `ETag` or `Last-Modified` header,
+    so unchanged data is not downloaded again. If the cache grows beyond `max_size`,
+    the least recently used entries are removed.
+
+    Parameters
+    ----------
+    directory (str or Path, optional): The directory that holds the cache. Defaults to
+        a `wbwdi` folder in the user cache directory.
+    max_size (int): The maximum total size of the compressed entries in bytes.
+        Defaults to 512 MB.
+    ttl (int or dict, optional): The number of seconds an entry stays fresh, either for
+        all resources or as a dictionary by resource (e.g., {"country": 3600}). Missing
+        resources use the defaults of 7 days for metadata and 1 day for indicator data.
+
+    Examples
+    --------
+    Cache all requests of the default client
+    >>> wdi_set_client(WDIClient(cache=WDICache()))
+
+    Inspect and clear the cache
+    >>> cache = WDICache()
+    >>> cache.info()
+    >>> cache.clear()
+    """
+
+    def __init__(
+        self,
+        directory: Optional[Union[str, Path]] = None,
+        max_size: int = 512 * 1024 * 1024,
+        ttl: Optional[Union[int, Dict[str, int]]] = None,
+    ):
+        validate_max_size(max_size)
+        self.directory = Path(directory or default_cache_directory() / "responses")
+        self.max_size = max_size
+        self.ttls = dict(DEFAULT_TTLS)
+        self.default_ttl = DAY
+        if isinstance(ttl, dict):
+            self.ttls.update(ttl)
+        elif ttl is not None:
+            self.ttls = {}
+            self.default_ttl = ttl
+        # The total size of the bodies is measured once and then tracked on each write
+        self._size: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def get(self, http_client: httpx.Client, url: str, resource: str) -> httpx.Response:
+        """Return the response for `url` from the cache or from the API."""
+        resource = create_resource_type(resource)
+        entry = self.load(url)
+        if entry is not None and self.is_fresh(entry, resource):
+            response = self.create_response(url, entry)
+            if response is not None:
+                return response
+            entry = None
+
+        response = http_client.get(url, headers=create_validators(entry))
+        response = self.handle_response(url, resource, entry, response)
+        if response is None:
+            # The body was evicted while the entry was revalidated
+            response = http_client.get(url)
+            response = self.handle_response(url, resource, None, response)
+        return response
+
+    async def get_async(
+        self, http_client: httpx.AsyncClient, url: str, resource: str
+    ) -> httpx.Response:
+        """Return the response for `url` from the cache or from the API asynchronously."""
+        resource = create_resource_type(resource)
+        entry = self.load(url)
+        if entry is not None and self.is_fresh(entry, resource):
+            response = self.create_response(url, entry)
+            if response is not None:
+                return response
+            entry = None
+
+        response = await http_client.get(url, headers=create_validators(entry))
+        response = self.handle_response(url, resource, entry, response)
+        if response is None:
+            # The body was evicted while the entry was revalidated
+            response = await http_client.get(url)
+            response = self.handle_response(url, resource, None, response)
+        return response
+
+    def info(self) -> pl.DataFrame:
+        """
+        List the entries in the cache.
+
+        Returns
+        -------
+        pl.DataFrame
+            A DataFrame with the following columns:
+            - `url`: The request URL including the page number.
+            - `resource`: The requested resource type (e.g., "country", "sources").
+            - `size`: The size of the compressed entry in bytes.
+            - `stored_at`: The time when the entry was last stored or revalidated.
+            - `is_fresh`: Whether the entry is returned without a request.
+        """
+        entries = [
+            entry
+            for path in self.directory.glob("*.json")
+            if (entry := read_metadata(path)) is not None
+        ]
+        return pl.DataFrame(
+            {
+                "url": [entry["url"] for entry in entries],
+                "resource": [entry["resource"] for entry in entries],
+                "size": [entry["size"] for entry in entries],
+                "stored_at": [entry["stored_at"] for entry in entries],
+                "is_fresh": [
+                    self.is_fresh(entry, entry["resource"]) for entry in entries
+                ],
+            },
+            schema={
+                "url": pl.Utf8,
+                "resource": pl.Utf8,
+                "size": pl.Int64,
+                "stored_at": pl.Float64,
+                "is_fresh": pl.Boolean,
+            },
+        ).with_columns(
+            stored_at=pl.from_epoch(
+                (pl.col("stored_at") * 1000).cast(pl.Int64), time_unit="ms"
+            )
+        )
+
+    def clear(self, resource: Optional[str] = None):
+        """
+        Remove entries from the cache.
+
+        Parameters
+        ----------
+        resource (str, optional): Only remove entries of this resource type (e.g.,
+            "country"). If None, all entries are removed.
+        """
+        with self._lock:
+            for path in list(self.directory.glob("*.json")):
+                entry = read_metadata(path)
+                if resource is None or (entry and entry["resource"] == resource):
+                    self.remove(path.with_suffix(""))
+            self._size = None
+
+    def ttl_for(self, resource: str) -> int:
+        return self.ttls.get(resource, self.default_ttl)
+
+    def is_fresh(self, entry: dict, resource: str) -> bool:
+        return time.time() - entry["stored_at"] < self.ttl_for(resource)
+
+    def handle_response(
+        self,
+        url: str,
+        resource: str,
+        entry: Optional[dict],
+        response: httpx.Response,
+    ) -> Optional[httpx.Response]:
+        if response.status_code == 304 and entry is not None:
+            cached_response = self.create_response(url, entry)
+            if cached_response is not None:
+                entry["stored_at"] = time.time()
+                write_atomic(
+                    self.path(url).with_suffix(".json"), json.dumps(entry).encode()
+                )
+            return cached_response
+        if response.status_code == 200 and is_cacheable(response):
+            self.store(url, resource, response)
+        return response
+
+    def load(self, url: str) -> Optional[dict]:
+        path = self.path(url)
+        entry = read_metadata(path.with_suffix(".json"))
+        if entry is None or not path.with_suffix(".gz").exists():
+            return None
+        return entry
+
+    def store(self, url: str, resource: str, response: httpx.Response):
+        path = self.path(url)
+        replaced_size = get_file_size(path.with_suffix(".gz"))
+        body = gzip.compress(response.content)
+        entry = {
+            "url": url,
+            "resource": resource,
+            "size": len(body),
+            "stored_at": time.time(),
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "content_type": response.headers.get("Content-Type", "application/json"),
+        }
+        write_atomic(path.with_suffix(".gz"), body)
+        write_atomic(path.with_suffix(".json"), json.dumps(entry).encode())
+        self.update_size(len(body) - replaced_size)
+
+    def create_response(self, url: str, entry: dict) -> Optional[httpx.Response]:
+        body_path = self.path(url).with_suffix(".gz")
+        # Another client or process may evict the body after the entry was loaded
+        try:
+            content = gzip.decompress(body_path.read_bytes())
+            # Touching the body marks the entry as recently used for the eviction
+            os.utime(body_path)
+        except FileNotFoundError:
+            return None
+        return httpx.Response(
+            200,
+            content=content,
+            headers={"Content-Type": entry["content_type"]},
+            request=httpx.Request("GET", url),
+        )
+
+    def update_size(self, size_change: int):
+        with self._lock:
+            if self._size is None:
+                self._size = sum(size for _, size, _ in self.list_bodies())
+            else:
+                self._size += size_change
+            if self._size > self.max_size:
+                self.evict()
+
+    def evict(self):
+        # The directory is only listed once the limit is crossed, which also corrects
+        # the tracked size for entries written or removed by other processes
+        bodies = self.list_bodies()
+        self._size = sum(size for _, size, _ in bodies)
+        for _, size, path in sorted(bodies):
+            if self._size <= self.max_size:
+                break
+            self.remove(path.with_suffix(""))
+            self._size -= size
+
+    def list_bodies(self):
+        bodies = []
+        for path in self.directory.glob("*.gz"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            bodies.append((stat.st_mtime, stat.st_size, path))
+        return bodies
+
+    def remove(self, path: Path):
+        for suffix in [".json", ".gz"]:
+            try:
+                path.with_suffix(suffix).unlink()
+            except FileNotFoundError:
+                pass
+
+    def path(self, url: str) -> Path:
+        return self.directory / hashlib.sha256(url.encode()).hexdigest()
+
+
+def validate_max_size(max_size):
+    if not isinstance(max_size, int) or max_size < 1:
+        raise ValueError("`max_size` must be a positive integer.")
+
+
+def get_file_size(path: Path) -> int:
+    try:
+        return path.stat().st_size
+    except FileNotFoundError:
+        return 0
+
+
+def default_cache_directory() -> Path:
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA", Path.home() / "AppData" / "Local")
+    elif sys.platform == "darwin":
+        base = Path.home() / "Library" / "Caches"
+    else:
+        base = os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")
+    return Path(base) / "wbwdi"
+
+
+def create_resource_type(resource: str) -> str:
+    return resource.split("/")[0]
+
+
+def create_validators(entry: Optional[dict]) -> Dict[str, str]:
+    if entry is None:
+        return {}
+    headers = {}
+    if entry.get("etag"):
+        headers["If-None-Match"] = entry["etag"]
+    if entry.get("last_modified"):
+        headers["If-Modified-Since"] = entry["last_modified"]
+    return headers
+
+
+def is_cacheable(response: httpx.Response) -> bool:
+    # Only the start of the body is checked, so pages are not decoded a second time
+    if not JSON_LIST_PATTERN.match(response.content):
+        return False
+    return not ERROR_BODY_PATTERN.match(response.content)
+
+
+def read_metadata(path: Path) -> Optional[dict]:
+    try:
+        return json.loads(path.read_bytes())
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def write_atomic(path: Path, content: bytes):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    file, temporary_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(file, "wb") as temporary_file:
+            temporary_file.write(content)
+        os.replace(temporary_path, path)
+    except BaseException:
+        os.unlink(temporary_path)
+        raise
@@ -0,0 +1,299 @@
+import asyncio
+import threading
+from typing import Callable, List, Optional
+
+import httpx
+
+from .perform_request import BASE_URL, HEADERS
+from .single_flight import SingleFlight
+from .wdi_cache import WDICache
+from .wdi_entity_snapshot import wdi_refresh_entity_snapshot
+from .wdi_get import wdi_get, wdi_get_async
+from .wdi_get_entities import wdi_get_entities, wdi_get_entities_async
+from .wdi_get_income_levels import wdi_get_income_levels, wdi_get_income_levels_async
+from .wdi_get_indicators import wdi_get_indicators, wdi_get_indicators_async
+from .wdi_get_languages import wdi_get_languages, wdi_get_languages_async
+from .wdi_get_lending_types import wdi_get_lending_types, wdi_get_lending_types_async
+from .wdi_get_regions import wdi_get_regions, wdi_get_regions_async
+from .wdi_get_sources import wdi_get_sources, wdi_get_sources_async
+from .wdi_get_topics import wdi_get_topics, wdi_get_topics_async
+from .wdi_iter import wdi_iter, wdi_iter_async
+from .wdi_scheduler import WDIScheduler
+from .wdi_search import wdi_search
+from .wdi_store import wdi_refresh
+
+DEFAULT_CLIENT = None
+DEFAULT_CLIENT_LOCK = threading.Lock()
+
+
+class WDIClient:
+    """
+    A reusable session for the World Bank API with a persistent connection pool.
+
+    Every download function of the package opens its connections through a client.
+    Reusing one client across calls keeps connections alive between requests, so
+    repeated calls (including the metadata lookups inside `wdi_get()`) do not pay for
+    a new TCP and TLS handshake each time. Threads or tasks that request the same URL
+    at the same time share a single download. All download functions are available as
+    methods. The module-level functions use a shared default client, see
+    `wdi_set_client()`.
+
+    Parameters
+    ----------
+    max_connections (int): The maximum number of concurrent connections in the pool.
+        Defaults to 10.
+    max_keepalive_connections (int): The maximum number of idle connections that are
+        kept alive. Defaults to 10.
+    keepalive_expiry (float): The number of seconds an idle connection is kept alive.
+        Defaults to 30.
+    timeout (float): The timeout in seconds for connecting to and reading from the API.
+        Defaults to 30.
+    http2 (bool): Whether to enable HTTP/2. Requires the `http2` extra
+        (`pip install wbwdi[http2]`). Defaults to False.
+    base_url (str): The base URL of the World Bank API.
+        Defaults to "https://api.worldbank.org/v2/".
+    cache (WDICache, optional): An on-disk cache for the API responses. Defaults to
+        None, which disables caching.
+    scheduler (WDIScheduler, optional): The scheduler that limits and retries
+        requests. Defaults to a `WDIScheduler` with `max_concurrency` equal to
+        `max_connections`.
+    observers (list of callable, optional): Functions that are called with the events
+        of every download of the client, see `wdi_observe()`. Defaults to None.
+
+    Examples
+    --------
+    Reuse connections across multiple downloads
+    >>> with WDIClient(max_connections=20) as client:
+    ...     client.wdi_get("all", "SP.POP.TOTL")
+    ...     client.wdi_get_sources()
+
+    Cache responses on disk
+    >>> client = WDIClient(cache=WDICache(max_size=1024**3))
+
+    Use the client from a coroutine
+    >>> async with WDIClient() as client:
+    ...     await client.wdi_get_async("USA", "SP.POP.TOTL")
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 10,
+        max_keepalive_connections: int = 10,
+        keepalive_expiry: float = 30.0,
+        timeout: float = 30.0,
+        http2: bool = False,
+        base_url: str = BASE_URL,
+        cache: Optional[WDICache] = None,
+        scheduler: Optional[WDIScheduler] = None,
+        observers: Optional[List[Callable[[dict], None]]] = None,
+    ):
+        self.base_url = base_url
+        self.cache = cache
+        self.scheduler = scheduler or WDIScheduler(max_concurrency=max_connections)
+        # Concurrent requests for the same URL share one download
+        self.single_flight = SingleFlight()
+        self.observers = list(observers or [])
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.timeout = httpx.Timeout(timeout)
+        self.http2 = http2
+        self._http_client = None
+        self._async_http_client = None
+        self._async_loop = None
+        self._lock = threading.Lock()
+
+    @property
+    def http_client(self) -> httpx.Client:
+        """The pooled synchronous `httpx.Client`, created on first use."""
+        with self._lock:
+            if self._http_client is None or self._http_client.is_closed:
+                self._http_client = httpx.Client(
+                    headers=HEADERS,
+                    limits=self.limits,
+                    timeout=self.timeout,
+                    http2=self.http2,
+                )
+            return self._http_client
+
+    @property
+    def async_http_client(self) -> httpx.AsyncClient:
+        """
+        The pooled `httpx.AsyncClient` of the running event loop, created on first use.
+
+        Asynchronous connections are bound to the event loop that opened them, so a new
+        pool is started when the client is used from a different event loop.
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if (
+                self._async_http_client is None
+                or self._async_http_client.is_closed
+                or self._async_loop is not loop
+            ):
+                self._async_http_client = httpx.AsyncClient(
+                    headers=HEADERS,
+                    limits=self.limits,
+                    timeout=self.timeout,
+                    http2=self.http2,
+                )
+                self._async_loop = loop
+            return self._async_http_client
+
+    def close(self):
+        """Close the synchronous connection pool."""
+        with self._lock:
+            if self._http_client is not None:
+                self._http_client.close()
+                self._http_client = None
+
+    async def aclose(self):
+        """Close the synchronous and asynchronous connection pools."""
+        self.close()
+        with self._lock:
+            async_http_client, self._async_http_client = self._async_http_client, None
+            self._async_loop = None
+        if async_http_client is not None:
+            await async_http_client.aclose()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.aclose()
+
+    def wdi_get(self, *args, **kwargs):
+        """Download indicator data with this client, see `wdi_get()`."""
+        return wdi_get(*args, client=self, **kwargs)
+
+    async def wdi_get_async(self, *args, **kwargs):
+        """Download indicator data with this client, see `wdi_get_async()`."""
+        return await wdi_get_async(*args, client=self, **kwargs)
+
+    def wdi_get_entities(self, *args, **kwargs):
+        """Download entities with this client, see `wdi_get_entities()`."""
+        return wdi_get_entities(*args, client=self, **kwargs)
+
+    async def wdi_get_entities_async(self, *args, **kwargs):
+        """Download entities with this client, see `wdi_get_entities_async()`."""
+        return await wdi_get_entities_async(*args, client=self, **kwargs)
+
+    def wdi_get_income_levels(self, *args, **kwargs):
+        """Download income levels with this client, see `wdi_get_income_levels()`."""
+        return wdi_get_income_levels(*args, client=self, **kwargs)
+
+    async def wdi_get_income_levels_async(self, *args, **kwargs):
+        """Download income levels with this client, see `wdi_get_income_levels_async()`."""
+        return await wdi_get_income_levels_async(*args, client=self, **kwargs)
+
+    def wdi_get_indicators(self, *args, **kwargs):
+        """Download indicators with this client, see `wdi_get_indicators()`."""
+        return wdi_get_indicators(*args, client=self, **kwargs)
+
+    async def wdi_get_indicators_async(self, *args, **kwargs):
+        """Download indicators with this client, see `wdi_get_indicators_async()`."""
+        return await wdi_get_indicators_async(*args, client=self, **kwargs)
+
+    def wdi_get_languages(self, *args, **kwargs):
+        """Download languages with this client, see `wdi_get_languages()`."""
+        return wdi_get_languages(*args, client=self, **kwargs)
+
+    async def wdi_get_languages_async(self, *args, **kwargs):
+        """Download languages with this client, see `wdi_get_languages_async()`."""
+        return await wdi_get_languages_async(*args, client=self, **kwargs)
+
+    def wdi_get_lending_types(self, *args, **kwargs):
+        """Download lending types with this client, see `wdi_get_lending_types()`."""
+        return wdi_get_lending_types(*args, client=self, **kwargs)
+
+    async def wdi_get_lending_types_async(self, *args, **kwargs):
+        """Download lending types with this client, see `wdi_get_lending_types_async()`."""
+        return await wdi_get_lending_types_async(*args, client=self, **kwargs)
+
+    def wdi_get_regions(self, *args, **kwargs):
+        """Download regions with this client, see `wdi_get_regions()`."""
+        return wdi_get_regions(*args, client=self, **kwargs)
+
+    async def wdi_get_regions_async(self, *args, **kwargs):
+        """Download regions with this client, see `wdi_get_regions_async()`."""
+        return await wdi_get_regions_async(*args, client=self, **kwargs)
+
+    def wdi_get_sources(self, *args, **kwargs):
+        """Download sources with this client, see `wdi_get_sources()`."""
+        return wdi_get_sources(*args, client=self, **kwargs)
+
+    async def wdi_get_sources_async(self, *args, **kwargs):
+        """Download sources with this client, see `wdi_get_sources_async()`."""
+        return await wdi_get_sources_async(*args, client=self, **kwargs)
+
+    def wdi_get_topics(self, *args, **kwargs):
+        """Download topics with this client, see `wdi_get_topics()`."""
+        return wdi_get_topics(*args, client=self, **kwargs)
+
+    async def wdi_get_topics_async(self, *args, **kwargs):
+        """Download topics with this client, see `wdi_get_topics_async()`."""
+        return await wdi_get_topics_async(*args, client=self, **kwargs)
+
+    def wdi_iter(self, *args, **kwargs):
+        """Download indicator data page by page with this client, see `wdi_iter()`."""
+        return wdi_iter(*args, client=self, **kwargs)
+
+    def wdi_iter_async(self, *args, **kwargs):
+        """Download indicator data page by page with this client, see `wdi_iter_async()`."""
+        return wdi_iter_async(*args, client=self, **kwargs)
+
+    def wdi_refresh(self, *args, **kwargs):
+        """Refresh a local store with this client, see `wdi_refresh()`."""
+        return wdi_refresh(*args, client=self, **kwargs)
+
+    def wdi_refresh_entity_snapshot(self, *args, **kwargs):
+        """Refresh the entity snapshot with this client, see `wdi_refresh_entity_snapshot()`."""
+        return wdi_refresh_entity_snapshot(*args, client=self, **kwargs)
+
+    def wdi_scan(self, *args, **kwargs):
+        """Scan indicator data lazily with this client, see `wdi_scan()`."""
+        # The IO plugin interface of Polars is only imported when a scan is requested
+        from .wdi_scan import wdi_scan
+
+        return wdi_scan(*args, client=self, **kwargs)
+
+    def wdi_search(self, *args, **kwargs):
+        """Search for keywords in a DataFrame, see `wdi_search()`."""
+        return wdi_search(*args, **kwargs)
+
+
+def get_default_client() -> WDIClient:
+    global DEFAULT_CLIENT
+    with DEFAULT_CLIENT_LOCK:
+        if DEFAULT_CLIENT is None:
+            DEFAULT_CLIENT = WDIClient()
+        return DEFAULT_CLIENT
+
+
+def wdi_set_client(client: Optional[WDIClient]):
+    """
+    Set the client that is shared by all module-level download functions.
+
+    Parameters
+    ----------
+    client (WDIClient, optional): The client to share. If None, a new client with
+        default settings is created on the next request.
+
+    Examples
+    --------
+    Use a larger connection pool with HTTP/2 for all downloads
+    >>> wdi_set_client(WDIClient(max_connections=50, http2=True))
+    """
+    if client is not None and not isinstance(client, WDIClient):
+        raise TypeError("`client` must be a `WDIClient` or `None`.")
+    global DEFAULT_CLIENT
+    with DEFAULT_CLIENT_LOCK:
+        DEFAULT_CLIENT = client
@@ -0,0 +1,143 @@
+import functools
+import json
+import os
+import tempfile
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+import polars as pl
+
+from .wdi_cache import default_cache_directory
+from .wdi_get_entities import get_entities, get_entities_async
+
+ENTITY_SNAPSHOT_VERSION = 1
+# Entities rarely change, so a snapshot is trusted for a year after it was created
+ENTITY_SNAPSHOT_MAX_AGE_DAYS = 365
+BUNDLED_ENTITY_SNAPSHOT = Path(__file__).parent / "data" / "entities.json"
+
+
+def wdi_refresh_entity_snapshot(path=None, client=None) -> Path:
+    """
+    Download the entities and save them as the entity snapshot of the user cache.
+
+    `wdi_get()` and the other indicator downloads map the ISO 2-country codes of the
+    API to ISO 3-country codes with a snapshot of the entity table that is shipped with
+    the package, so no request is sent for the mapping. The snapshot is used for a year
+    after it was created. Afterwards, or if a code is missing from the snapshot, the
+    entities are downloaded again. This function replaces the shipped snapshot with a
+    current one, which is used instead as long as it is newer.
+
+    Parameters
+    ----------
+    path (str or Path, optional): The file of the snapshot. Defaults to
+        `entities.json` in the user cache directory (see `WDICache`), which is the file
+        that is read by the indicator downloads.
+    client (WDIClient, optional): The client used to send requests. Defaults to the
+        shared client, see `WDIClient`.
+
+    Returns
+    -------
+    Path
+        The path of the saved snapshot.
+
+    Examples
+    --------
+    Refresh the snapshot after the World Bank added or renamed entities
+    >>> wdi_refresh_entity_snapshot()
+    """
+    path = Path(path) if path is not None else default_entity_snapshot_path()
+    write_entity_snapshot(path, create_entity_mapping(get_entities(client=client)))
+    return path
+
+
+def default_entity_snapshot_path() -> Path:
+    return default_cache_directory() / "entities.json"
+
+
+def create_entity_mapping(entities: pl.DataFrame) -> Dict[str, str]:
+    """Map the ISO 2-country codes of a table of entities to their ISO 3 codes."""
+    entities = entities.filter(
+        pl.col("entity_iso2code").is_not_null() & (pl.col("entity_iso2code") != "")
+    )
+    return dict(zip(entities["entity_iso2code"], entities["entity_id"]))
+
+
+def write_entity_snapshot(path: Path, entity_mapping: Dict[str, str]):
+    snapshot = {
+        "version": ENTITY_SNAPSHOT_VERSION,
+        "created_at": datetime.now(timezone.utc).date().isoformat(),
+        "entities": dict(sorted(entity_mapping.items())),
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Write to a temporary file first, so a running download never reads half a file
+    file, temporary_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    with os.fdopen(file, "w") as file:
+        json.dump(snapshot, file, separators=(",", ":"))
+    os.replace(temporary_path, path)
+
+
+def load_entity_snapshot() -> Optional[dict]:
+    """
+    Return the newer of the snapshot in the user cache and the shipped snapshot, or
+    None if neither can be read. On the same day, the refreshed snapshot is preferred.
+    """
+    snapshots = [
+        read_entity_snapshot(str(path), path.stat().st_mtime_ns)
+        for path in (default_entity_snapshot_path(), BUNDLED_ENTITY_SNAPSHOT)
+        if path.is_file()
+    ]
+    snapshots = [snapshot for snapshot in snapshots if snapshot is not None]
+    if not snapshots:
+        return None
+    return max(snapshots, key=lambda snapshot: snapshot["created_at"])
+
+
+@functools.lru_cache(maxsize=4)
+def read_entity_snapshot(path: str, modified: int) -> Optional[dict]:
+    # The modification time is part of the cache key, so refreshed files are read again
+    try:
+        with open(path) as file:
+            snapshot = json.load(file)
+        if snapshot["version"] != ENTITY_SNAPSHOT_VERSION:
+            return None
+        return {
+            "created_at": date.fromisoformat(snapshot["created_at"]),
+            "entities": dict(snapshot["entities"]),
+        }
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def is_stale(snapshot: dict, today: Optional[date] = None) -> bool:
+    today = today or datetime.now(timezone.utc).date()
+    return (today - snapshot["created_at"]).days > ENTITY_SNAPSHOT_MAX_AGE_DAYS
+
+
+def lookup_entity_mapping(codes: Iterable[str]) -> Optional[Dict[str, str]]:
+    """
+    Return the mapping of the snapshot if it is current and covers all codes, or None
+    if the entities must be downloaded.
+    """
+    snapshot = load_entity_snapshot()
+    if snapshot is None or is_stale(snapshot):
+        return None
+    entity_mapping = snapshot["entities"]
+    if any(code not in entity_mapping for code in codes if code is not None):
+        return None
+    return entity_mapping
+
+
+def get_entity_mapping(indicators_processed: pl.DataFrame, client=None):
+    """Map the ISO 2-country codes of the data, with a request only if necessary."""
+    entity_mapping = lookup_entity_mapping(indicators_processed["entity_id"].unique())
+    if entity_mapping is None:
+        entity_mapping = create_entity_mapping(get_entities(client=client))
+    return entity_mapping
+
+
+async def get_entity_mapping_async(indicators_processed: pl.DataFrame, client=None):
+    entity_mapping = lookup_entity_mapping(indicators_processed["entity_id"].unique())
+    if entity_mapping is None:
+        entity_mapping = create_entity_mapping(await get_entities_async(client=client))
+    return entity_mapping
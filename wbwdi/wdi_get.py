@@ -1,10 +1,54 @@
+import asyncio
+import functools
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
 import polars as pl
 
-from wbwdi.perform_request import perform_request
-from wbwdi.wdi_get_sources import wdi_get_sources
+from wbwdi.perform_request import (
+    iter_pages,
+    iter_pages_async,
+    perform_request,
+    perform_request_async,
+)
+from wbwdi.wdi_get_sources import get_sources, get_sources_async
 
 from .config import format_output
-from .wdi_get_entities import wdi_get_entities
+from .enum_keys import cast_indicator_keys
+from .reshape_wide import (
+    TIME_COLUMNS,
+    WideJoiner,
+    collect_streaming,
+    pivot_wide,
+    pivot_wide_lazy,
+    sort_wide,
+    widen_indicators,
+)
+from .spill_buffer import SpillBuffer
+from .wdi_entity_snapshot import get_entity_mapping, get_entity_mapping_async
+from .wdi_get_entities import get_entities, get_entities_async
+from .wdi_observer import create_progress_observers, emit, submit_in_context
+
+# The API accepts at most 60 indicators per request, and long paths are rejected
+MAX_INDICATORS_PER_REQUEST = 60
+MAX_RESOURCE_LENGTH = 1500
+# Long entity lists are split into chunks, or replaced by "all" and filtered locally
+# if they cover at least this share of all entities
+MAX_ENTITIES_LENGTH = 500
+ALL_ENTITIES_SHARE = 0.5
+
+RAW_INDICATOR_SCHEMA = {
+    "indicator_id": pl.Utf8,
+    "entity_id": pl.Utf8,
+    "date": pl.Utf8,
+    "value": pl.Float64,
+}
+INDICATOR_SCHEMA = {
+    "indicator_id": pl.Utf8,
+    "entity_id": pl.Utf8,
+    "value": pl.Float64,
+    "year": pl.Int32,
+}
 
 
 def wdi_get(
@@ -19,6 +63,14 @@ def wdi_get(
     progress=True,
     source=None,
     format="long",
+    max_concurrency=1,
+    max_workers=1,
+    batch=False,
+    client=None,
+    store=None,
+    categorical=False,
+    pipeline=False,
+    memory_budget=None,
 ):
     """
     Download World Bank indicator data for specific entities and time periods.
@@ -37,10 +89,18 @@ def wdi_get(
     most_recent_only (bool): A logical value indicating whether to download only the most recent value. In case of True, it overrides `start_year` and `end_year`. Defaults to False.
     frequency (str): The frequency of the data ("annual", "quarter", "month"). Defaults to "annual".
     language (str): The language for the request. See wdi_get_languages for options. Defaults to "en".
-    per_page (int): The number of results per page for the API. Defaults to 1000.
-    progress (bool): Whether to show progress messages during data download and parsing. Defaults to True.
+    per_page (int or str): The number of results per page for the API, or "auto" to choose the page size from the total number of results with as few requests as possible. Defaults to 1000.
+    progress (bool): Whether to show progress messages during data download and parsing. Progress is printed by a default observer, see `wdi_observe()` for other observers. Defaults to True.
     source (int, optional): The data source, see wdi_get_sources.
     format (str): Specifies whether the data is returned in "long" or "wide" format. Defaults to "long".
+    max_concurrency (int): The maximum number of result pages per indicator that are downloaded in parallel. Defaults to 1.
+    max_workers (int): The maximum number of indicators that are downloaded and parsed in parallel. Defaults to 1.
+    batch (bool): Whether to combine multiple indicators into a single request. Only applies if `source` is given. Defaults to False.
+    client (WDIClient, optional): The client used to send requests. Defaults to the shared client, see `WDIClient`.
+    store (str, Path or WDIStore, optional): A local store to read the data from. The store is refreshed first, see `wdi_refresh()`. Defaults to None.
+    categorical (bool): Whether to return `entity_id` and `indicator_id` as `pl.Enum` columns instead of strings, which takes much less memory and speeds up group-bys and joins on these keys. Defaults to False.
+    pipeline (bool): Whether to parse each result page on a worker thread as soon as it is downloaded, so parsing overlaps the downloads of the following pages. Defaults to False.
+    memory_budget (int, optional): The number of bytes of parsed data that is kept in memory before further requests are written to temporary files, for downloads that do not fit into memory. Defaults to None, which keeps all data in memory.
 
     Returns:
     -----------
@@ -62,7 +122,49 @@ def wdi_get(
     displayed during the request and parsing process.
 
     The function supports downloading multiple indicators by sending individual API requests
-    for each indicator and then combining the results into a single tidy DataFrame.
+    for each indicator and then combining the results into a single tidy DataFrame. Large
+    requests that span multiple result pages can be sped up by increasing `max_concurrency`.
+    With `max_workers` greater than 1, indicators are downloaded and parsed in parallel
+    threads, so finished indicators are parsed while others are still downloading. The
+    output keeps the order of `indicators`, and progress is reported per indicator.
+
+    By default, all pages of a request are downloaded before they are parsed. With
+    `pipeline` set to True, each page is decoded and parsed into a typed chunk on a
+    worker thread as soon as it arrives (by the thread that downloaded it if
+    `max_concurrency` is greater than 1), while the next pages are still downloading.
+    The chunks are combined without copying and sorted once at the end.
+
+    With a `memory_budget`, parsed requests are kept in memory only up to the budget,
+    and all further requests are written to temporary Arrow IPC files as soon as they
+    are parsed. The requests are then combined, mapped to ISO 3-country codes and, in
+    the "wide" format, pivoted by the streaming engine of Polars, which reads the
+    files in batches. The budget bounds the data held before the result is collected,
+    not the returned DataFrame itself. The temporary files are removed afterwards.
+
+    In the "wide" format, each indicator becomes a column as soon as it is parsed, and
+    the columns are joined on `entity_id` and the time columns (`year`, plus `quarter`
+    or `month` for sub-annual data), so the long data of all indicators is never held
+    at once. Rows are sorted by entity and time.
+
+    Long lists of entities are split into multiple requests that keep the request URL
+    short. If the list covers at least half of all entities, a single request for all
+    entities is sent instead, and the requested entities are selected afterwards.
+
+    If `batch` is True and a `source` is given, indicators are combined into requests of
+    up to 60 indicators each (as long as the request URL stays short enough), and the
+    returned rows are split by `indicator_id` again. Without a `source`, the API does
+    not support combined requests, so indicators are always requested one by one.
+
+    If a `store` is given, the indicators are first refreshed for all entities in the
+    local store, which only downloads indicators whose source was updated since the
+    last refresh and years that are not stored yet. The requested entities and years
+    are then read from the store. `most_recent_only` is not supported with a store.
+
+    If `categorical` is True, the categories of `entity_id` are all ISO 3-country codes
+    of the entity snapshot (see `wdi_refresh_entity_snapshot()`) in alphabetical order,
+    so outputs of different calls have the same type and can be concatenated or joined.
+    The categories of `indicator_id` are the requested indicators in their order. In
+    pandas, both columns become `category` columns.
 
     Examples:
     -----------
@@ -94,18 +196,325 @@ def wdi_get(
 
     # Download most recent value only
     >>> wdi_get("USA", "SP.POP.TOTL", most_recent_only=True)
+
+    # Download result pages in parallel
+    >>> wdi_get("all", "SP.POP.TOTL", max_concurrency=8)
+
+    # Download all entities with as few requests as possible
+    >>> wdi_get("all", "SP.POP.TOTL", per_page="auto", max_concurrency=4)
+
+    # Download multiple indicators in parallel
+    >>> wdi_get("all", ["NY.GDP.PCAP.KD", "SP.POP.TOTL", "SP.DYN.LE00.IN"], max_workers=3)
+
+    # Parse result pages while the next pages are downloading
+    >>> wdi_get("all", "SP.POP.TOTL", max_concurrency=4, pipeline=True)
+
+    # Download multiple indicators of the same source in a single request
+    >>> wdi_get("all", ["NY.GDP.PCAP.KD", "SP.POP.TOTL"], source=2, batch=True)
+
+    # Download hundreds of indicators with at most 2 GB of parsed data in memory
+    >>> wdi_get("all", indicators, format="wide", memory_budget=2 * 1024**3)
+
+    # Return the key columns as Enum columns for large panels
+    >>> wdi_get("all", ["NY.GDP.PCAP.KD", "SP.POP.TOTL"], categorical=True)
+
+    # Read indicators from a local store that is refreshed incrementally
+    >>> wdi_get(["USA", "CAN"], "SP.POP.TOTL", start_year=2000, end_year=2020, store="wdi-store")
     """
-    if isinstance(entities, str):
-        entities = [entities]
-    if isinstance(indicators, str):
-        indicators = [indicators]
+    start = time.perf_counter()
+    entities, indicators = normalize_inputs(entities, indicators)
 
     validate_most_recent_only(most_recent_only)
     validate_frequency(frequency)
     validate_progress(progress)
-    validate_source(source)
+    validate_source(source, client)
     validate_format(format)
+    validate_max_workers(max_workers)
+    validate_batch(batch)
+    validate_categorical(categorical)
+    validate_pipeline(pipeline)
+    validate_memory_budget(memory_budget)
+
+    if store is not None:
+        indicators_processed = read_store(
+            store,
+            entities,
+            indicators,
+            start_year,
+            end_year,
+            most_recent_only,
+            frequency,
+            language,
+            per_page,
+            progress,
+            source,
+            format,
+            max_workers,
+            client,
+        )
+        return finish_indicators(
+            indicators_processed, indicators, format, categorical, start, client
+        )
+
+    start_year, end_year = create_period_bounds(
+        start_year, end_year, most_recent_only, frequency
+    )
+
+    entity_chunks = create_entity_chunks(entities)
+    entity_filter = None
+    if len(entity_chunks) > 1:
+        entity_chunks, entity_filter = plan_entity_chunks(
+            entities, entity_chunks, get_entities(client=client)
+        )
+
+    if memory_budget is not None:
+        with SpillBuffer(memory_budget) as spill_buffer:
+            get_indicator_data(
+                indicators,
+                entity_chunks,
+                start_year,
+                end_year,
+                most_recent_only,
+                language,
+                per_page,
+                progress,
+                source,
+                max_concurrency,
+                max_workers,
+                batch,
+                client,
+                pipeline,
+                spill_buffer,
+            )
+            indicators_processed = combine_spilled(
+                spill_buffer,
+                create_requests(indicators, entity_chunks, source, batch)[0],
+                entity_chunks,
+                entity_filter,
+                format,
+                client,
+            )
+        return finish_indicators(
+            indicators_processed, indicators, format, categorical, start, client
+        )
+
+    # In the wide format, each indicator is joined as soon as it is downloaded
+    wide_requests = None
+    if format == "wide":
+        wide_requests = WideRequests(
+            create_requests(indicators, entity_chunks, source, batch)[0],
+            entity_chunks,
+            entity_filter,
+        )
+    requests_parsed = get_indicator_data(
+        indicators,
+        entity_chunks,
+        start_year,
+        end_year,
+        most_recent_only,
+        language,
+        per_page,
+        progress,
+        source,
+        max_concurrency,
+        max_workers,
+        batch,
+        client,
+        pipeline,
+        wide_requests,
+    )
+    if wide_requests is not None:
+        indicators_processed = wide_requests.result(client)
+    else:
+        indicators_processed = combine_indicators(
+            requests_parsed, entity_filter, format, client
+        )
+    del requests_parsed, wide_requests
+
+    if needs_entity_mapping(indicators_processed):
+        indicators_processed = map_entity_ids(
+            indicators_processed,
+            get_entity_mapping(indicators_processed, client),
+            client,
+        )
+
+    return finish_indicators(
+        indicators_processed, indicators, format, categorical, start, client
+    )
+
+
+async def wdi_get_async(
+    entities,
+    indicators,
+    start_year=None,
+    end_year=None,
+    most_recent_only=False,
+    frequency="annual",
+    language="en",
+    per_page=1000,
+    progress=True,
+    source=None,
+    format="long",
+    max_concurrency=1,
+    batch=False,
+    client=None,
+    categorical=False,
+    pipeline=False,
+):
+    """
+    Download World Bank indicator data asynchronously.
+
+    This is the asynchronous version of `wdi_get()`. It returns the same DataFrame, but
+    does not block the event loop while waiting for the API. All indicators are
+    requested concurrently with `asyncio.gather`, so there is no `max_workers`.
+
+    It accepts the parameters `entities`, `indicators`, `start_year`, `end_year`,
+    `most_recent_only`, `frequency`, `language`, `per_page`, `progress`, `source`,
+    `format`, `max_concurrency`, `batch`, `client`, `categorical` and `pipeline` of
+    `wdi_get()`. The local `store` and the spill-to-disk `memory_budget` are only
+    available in `wdi_get()`.
+
+    Examples:
+    -----------
+    # Download multiple indicators for multiple entities from a coroutine
+    >>> await wdi_get_async(["USA", "CAN", "GBR"], ["NY.GDP.PCAP.KD", "SP.POP.TOTL"])
+    """
+    start = time.perf_counter()
+    entities, indicators = normalize_inputs(entities, indicators)
+
+    validate_most_recent_only(most_recent_only)
+    validate_frequency(frequency)
+    validate_progress(progress)
+    await validate_source_async(source, client)
+    validate_format(format)
+    validate_batch(batch)
+    validate_categorical(categorical)
+    validate_pipeline(pipeline)
+
+    start_year, end_year = create_period_bounds(
+        start_year, end_year, most_recent_only, frequency
+    )
+
+    entity_chunks = create_entity_chunks(entities)
+    entity_filter = None
+    if len(entity_chunks) > 1:
+        entity_chunks, entity_filter = plan_entity_chunks(
+            entities, entity_chunks, await get_entities_async(client=client)
+        )
+
+    batches, requests = create_requests(indicators, entity_chunks, source, batch)
+    requests_parsed = await asyncio.gather(
+        *[
+            get_indicator_async(
+                ";".join(indicator_batch),
+                entity_chunk,
+                start_year,
+                end_year,
+                most_recent_only,
+                language,
+                per_page,
+                progress,
+                source,
+                max_concurrency,
+                client,
+                pipeline,
+            )
+            for indicator_batch, entity_chunk in requests
+        ]
+    )
+    indicators_processed = combine_indicators(
+        combine_requests(requests_parsed, batches, entity_chunks),
+        entity_filter,
+        format,
+        client,
+    )
+    del requests_parsed
+
+    if needs_entity_mapping(indicators_processed):
+        indicators_processed = map_entity_ids(
+            indicators_processed,
+            await get_entity_mapping_async(indicators_processed, client),
+            client,
+        )
+
+    return finish_indicators(
+        indicators_processed, indicators, format, categorical, start, client
+    )
+
+
+def read_store(
+    store,
+    entities,
+    indicators,
+    start_year,
+    end_year,
+    most_recent_only,
+    frequency,
+    language,
+    per_page,
+    progress,
+    source,
+    format,
+    max_workers,
+    client,
+):
+    from .wdi_store import resolve_store, wdi_refresh
+
+    if most_recent_only:
+        raise ValueError("`most_recent_only` is not supported with a `store`.")
 
+    store = resolve_store(store)
+    wdi_refresh(
+        store,
+        indicators,
+        start_year,
+        end_year,
+        frequency,
+        source,
+        language,
+        per_page,
+        progress,
+        max_workers,
+        client,
+    )
+    indicators_scanned = store.scan(indicators, frequency, start_year, end_year)
+
+    if entities != ["all"]:
+        entity_filter = create_entity_filter(entities, get_entities(client=client))
+        indicators_scanned = filter_entities(indicators_scanned, entity_filter)
+    if format == "wide":
+        # Stored indicators are reshaped by the streaming engine without reading all
+        # long rows into memory first
+        stored = [
+            indicator for indicator in indicators if store.entry(indicator, frequency)
+        ]
+        return collect_streaming(pivot_wide_lazy(indicators_scanned, stored))
+    return indicators_scanned.collect()
+
+
+def create_indicator_schema(frequency):
+    schema = {
+        "entity_id": pl.Utf8,
+        "indicator_id": pl.Utf8,
+        "value": pl.Float64,
+        "year": pl.Int32,
+    }
+    if frequency == "quarter":
+        schema["quarter"] = pl.Int32
+    elif frequency == "month":
+        schema["month"] = pl.Int32
+    return schema
+
+
+def normalize_inputs(entities, indicators):
+    if isinstance(entities, str):
+        entities = [entities]
+    if isinstance(indicators, str):
+        indicators = [indicators]
+    return entities, indicators
+
+
+def create_period_bounds(start_year, end_year, most_recent_only, frequency):
     if not most_recent_only:
         if frequency == "annual" and start_year and end_year:
             start_year = str(start_year)
@@ -116,52 +525,156 @@ def wdi_get(
         elif frequency == "month" and start_year and end_year:
             start_year = f"{start_year}M01"
             end_year = f"{end_year}M12"
+    return start_year, end_year
 
-    indicators_processed = pl.concat(
-        [
-            get_indicator(
-                indicator,
-                entities,
-                start_year,
-                end_year,
-                most_recent_only,
-                language,
-                per_page,
-                progress,
-                source,
+
+def combine_indicators(indicators_parsed, entity_filter, format, client=None):
+    indicators_parsed = [
+        filter_entities(indicator_parsed, entity_filter)
+        for indicator_parsed in indicators_parsed
+    ]
+    if format != "wide":
+        return pl.concat(indicators_parsed)
+
+    # Each indicator becomes a value column that is joined to the others by entity and
+    # period, so the long frames are never concatenated
+    start = time.perf_counter()
+    indicators_processed = widen_indicators(indicators_parsed)
+    emit(
+        "pivot",
+        client,
+        rows=indicators_processed.height,
+        duration=time.perf_counter() - start,
+    )
+    return indicators_processed
+
+
+def combine_spilled(
+    spill_buffer, batches, entity_chunks, entity_filter, format, client=None
+):
+    """
+    Combine the requests of a spill buffer like `combine_indicators()`, with the
+    streaming engine instead of in memory.
+    """
+    indicators_scanned = filter_entities(
+        spill_buffer.scan(INDICATOR_SCHEMA), entity_filter
+    )
+    if len(entity_chunks) > 1 or any(len(batch) > 1 for batch in batches):
+        # Restore the order of `combine_requests()`: by indicator in the requested
+        # order, then by period, with rows of the same period in the order of requests
+        indicator_order = {
+            indicator: position
+            for position, indicator in enumerate(
+                indicator for batch in batches for indicator in batch
             )
-            for indicator in indicators
+        }
+        time_columns = [
+            column
+            for column in TIME_COLUMNS
+            if column in indicators_scanned.collect_schema().names()
         ]
+        indicators_scanned = indicators_scanned.sort(
+            pl.col("indicator_id").replace_strict(
+                indicator_order, default=len(indicator_order), return_dtype=pl.UInt32
+            ),
+            *time_columns,
+            maintain_order=True,
+        )
+
+    entity_ids = collect_streaming(
+        indicators_scanned.select(pl.col("entity_id").unique())
+    )
+    if needs_entity_mapping(entity_ids):
+        entity_mapping = get_entity_mapping(entity_ids, client)
+        indicators_scanned = indicators_scanned.with_columns(
+            map_entity_id(entity_mapping)
+        )
+
+    if format != "wide":
+        return collect_streaming(indicators_scanned)
+
+    start = time.perf_counter()
+    indicators_processed = collect_streaming(pivot_wide_lazy(indicators_scanned))
+    emit(
+        "pivot",
+        client,
+        rows=indicators_processed.height,
+        duration=time.perf_counter() - start,
     )
+    return indicators_processed
+
 
+def finish_indicators(
+    indicators_processed, indicators, format, categorical, start, client
+):
     if format == "wide":
-        indicators_processed = indicators_processed.pivot(
-            index=["entity_id", "year"], on="indicator_id", values="value"
+        indicators_processed = sort_wide(indicators_processed)
+    indicators_processed = relocate_entity_id(indicators_processed)
+    if categorical:
+        indicators_processed = cast_indicator_keys(indicators_processed, indicators)
+    emit(
+        "wdi_get",
+        client,
+        rows=indicators_processed.height,
+        duration=time.perf_counter() - start,
+    )
+    return format_output(indicators_processed)
+
+
+def reshape_indicators(indicators_processed, format, client=None):
+    if format == "wide":
+        start = time.perf_counter()
+        indicators_processed = pivot_wide(indicators_processed)
+        emit(
+            "pivot",
+            client,
+            rows=indicators_processed.height,
+            duration=time.perf_counter() - start,
         )
+    return indicators_processed
 
-    if (
+
+def needs_entity_mapping(indicators_processed):
+    return (
         indicators_processed.height > 0
         and len(indicators_processed[0, "entity_id"]) == 2
-    ):
-        entities = wdi_get_entities()
-
-        indicators_processed = (
-            indicators_processed.rename({"entity_id": "entity_iso2code"})
-            .join(
-                entities.select(["entity_id", "entity_iso2code"]),
-                on="entity_iso2code",
-                how="left",
-            )
-            .drop("entity_iso2code")
-        )
+    )
+
 
-    indicators_processed = indicators_processed.select(
+def filter_entities(indicators_processed, entity_filter):
+    if entity_filter is None:
+        return indicators_processed
+    return indicators_processed.filter(
+        pl.col("entity_id").str.to_uppercase().is_in(entity_filter)
+    )
+
+
+def map_entity_ids(indicators_processed, entity_mapping, client=None):
+    start = time.perf_counter()
+    indicators_processed = indicators_processed.with_columns(
+        map_entity_id(entity_mapping)
+    )
+    emit(
+        "entity_join",
+        client,
+        rows=indicators_processed.height,
+        duration=time.perf_counter() - start,
+    )
+    return indicators_processed
+
+
+def map_entity_id(entity_mapping):
+    return pl.col("entity_id").replace_strict(
+        entity_mapping, default=None, return_dtype=pl.Utf8
+    )
+
+
+def relocate_entity_id(indicators_processed):
+    return indicators_processed.select(
         ["entity_id"]
         + [col for col in indicators_processed.columns if col != "entity_id"]
     )
 
-    return format_output(indicators_processed)
-
 
 def validate_most_recent_only(most_recent_only):
     if not isinstance(most_recent_only, bool):
@@ -179,9 +692,18 @@ def validate_progress(progress):
         raise ValueError("`progress` must be either True or False.")
 
 
-def validate_source(source):
+def validate_source(source, client=None):
+    if source is not None:
+        supported_sources = get_sources(client=client)
+        if source not in supported_sources["source_id"]:
+            raise ValueError(
+                "`source` is not supported. Please call `wdi_get_sources()`."
+            )
+
+
+async def validate_source_async(source, client=None):
     if source is not None:
-        supported_sources = wdi_get_sources()
+        supported_sources = await get_sources_async(client=client)
         if source not in supported_sources["source_id"]:
             raise ValueError(
                 "`source` is not supported. Please call `wdi_get_sources()`."
@@ -193,10 +715,283 @@ def validate_format(format):
         raise ValueError("`format` must be either 'long' or 'wide'.")
 
 
+def validate_max_workers(max_workers):
+    if not isinstance(max_workers, int) or max_workers < 1:
+        raise ValueError("`max_workers` must be a positive integer.")
+
+
+def validate_batch(batch):
+    if not isinstance(batch, bool):
+        raise ValueError("`batch` must be either True or False.")
+
+
+def validate_categorical(categorical):
+    if not isinstance(categorical, bool):
+        raise ValueError("`categorical` must be either True or False.")
+
+
+def validate_pipeline(pipeline):
+    if not isinstance(pipeline, bool):
+        raise ValueError("`pipeline` must be either True or False.")
+
+
+def validate_memory_budget(memory_budget):
+    if memory_budget is not None and (
+        not isinstance(memory_budget, int)
+        or isinstance(memory_budget, bool)
+        or memory_budget < 0
+    ):
+        raise ValueError("`memory_budget` must be a non-negative integer or None.")
+
+
 def create_date(start_year, end_year):
     return f"{start_year}:{end_year}" if start_year and end_year else None
 
 
+def get_indicator_data(
+    indicators,
+    entity_chunks,
+    start_year,
+    end_year,
+    most_recent_only,
+    language,
+    per_page,
+    progress,
+    source,
+    max_concurrency=1,
+    max_workers=1,
+    batch=False,
+    client=None,
+    pipeline=False,
+    requests_parsed=None,
+):
+    batches, requests = create_requests(indicators, entity_chunks, source, batch)
+    # A `SpillBuffer` or `WideRequests` takes the parsed requests by position instead
+    # of a list and is returned as is, to be combined by the caller
+    if requests_parsed is not None:
+        requests_sink = requests_parsed
+    else:
+        requests_sink = [None] * len(requests)
+
+    if max_workers == 1:
+        for position, (indicator_batch, entity_chunk) in enumerate(requests):
+            requests_sink[position] = get_indicator(
+                ";".join(indicator_batch),
+                entity_chunk,
+                start_year,
+                end_year,
+                most_recent_only,
+                language,
+                per_page,
+                progress,
+                source,
+                max_concurrency,
+                client,
+                pipeline,
+            )
+        if requests_parsed is not None:
+            return requests_parsed
+        return combine_requests(requests_sink, batches, entity_chunks)
+
+    # Page-level progress of parallel downloads would interleave, so progress is
+    # reported once per finished request instead
+    progress_observers = create_progress_observers(progress)
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        futures = {
+            submit_in_context(
+                executor,
+                get_indicator,
+                ";".join(indicator_batch),
+                entity_chunk,
+                start_year,
+                end_year,
+                most_recent_only,
+                language,
+                per_page,
+                False,
+                source,
+                max_concurrency,
+                client,
+                pipeline,
+            ): position
+            for position, (indicator_batch, entity_chunk) in enumerate(requests)
+        }
+        for completed, future in enumerate(as_completed(futures), start=1):
+            position = futures[future]
+            request_parsed = future.result()
+            rows = request_parsed.height
+            requests_sink[position] = request_parsed
+            # The future keeps its result, so it is released once it is stored
+            del futures[future], future, request_parsed
+            emit(
+                "indicator",
+                client,
+                progress_observers,
+                indicator=";".join(requests[position][0]),
+                rows=rows,
+                completed=completed,
+                total=len(requests),
+            )
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+    if requests_parsed is not None:
+        return requests_parsed
+    return combine_requests(requests_sink, batches, entity_chunks)
+
+
+class WideRequests:
+    """
+    The parsed requests of `get_indicator_data()` in the wide format, joined as they
+    arrive.
+
+    Once all entity chunks of an indicator batch are downloaded, the batch is split
+    into indicators, which are filtered and joined into the wide result right away.
+    Only the wide result and the requests of unfinished batches are kept in memory.
+    """
+
+    def __init__(self, batches, entity_chunks, entity_filter):
+        self.batches = batches
+        self.chunks = len(entity_chunks)
+        self.entity_filter = entity_filter
+        self.wide_joiner = WideJoiner()
+        self.pending = {}
+        self.duration = 0.0
+
+    def __setitem__(self, position, request_parsed):
+        batch_position, chunk_position = divmod(position, self.chunks)
+        chunks_parsed = self.pending.setdefault(batch_position, {})
+        chunks_parsed[chunk_position] = request_parsed
+        if len(chunks_parsed) < self.chunks:
+            return
+        del self.pending[batch_position]
+
+        start = time.perf_counter()
+        indicators_parsed = split_indicator_batches(
+            [merge_entity_chunks([chunks_parsed.pop(i) for i in range(self.chunks)])],
+            [self.batches[batch_position]],
+        )
+        for indicator_parsed in indicators_parsed:
+            self.wide_joiner.add(filter_entities(indicator_parsed, self.entity_filter))
+        self.duration += time.perf_counter() - start
+
+    def result(self, client=None):
+        indicators_processed = self.wide_joiner.result(
+            [indicator for batch in self.batches for indicator in batch]
+        )
+        emit("pivot", client, rows=indicators_processed.height, duration=self.duration)
+        return indicators_processed
+
+
+def create_entity_chunks(entities):
+    entity_chunks = []
+    entity_chunk = []
+    chunk_length = 0
+    for entity in entities:
+        if entity_chunk and chunk_length + 1 + len(entity) > MAX_ENTITIES_LENGTH:
+            entity_chunks.append(entity_chunk)
+            entity_chunk = []
+            chunk_length = 0
+        chunk_length += len(entity) + (1 if entity_chunk else 0)
+        entity_chunk.append(entity)
+    entity_chunks.append(entity_chunk)
+    return entity_chunks
+
+
+def plan_entity_chunks(entities, entity_chunks, entities_available):
+    codes = {entity.upper() for entity in entities}
+    if len(codes) < ALL_ENTITIES_SHARE * entities_available.height:
+        return entity_chunks, None
+
+    # A single request for all entities is cheaper than many chunks, as long as the
+    # rows of the requested entities can be selected by ISO2 or ISO3 code afterwards
+    return [["all"]], create_entity_filter(entities, entities_available)
+
+
+def create_entity_filter(entities, entities_available):
+    codes = {entity.upper() for entity in entities}
+    entities_requested = entities_available.filter(
+        pl.col("entity_id").str.to_uppercase().is_in(codes)
+        | pl.col("entity_iso2code").str.to_uppercase().is_in(codes)
+    )
+    entity_filter = (
+        codes
+        | set(entities_requested["entity_id"].str.to_uppercase())
+        | set(entities_requested["entity_iso2code"].str.to_uppercase())
+    )
+    return sorted(entity_filter)
+
+
+def create_requests(indicators, entity_chunks, source, batch):
+    longest_chunk = max(entity_chunks, key=lambda chunk: len(";".join(chunk)))
+    batches = create_indicator_batches(indicators, longest_chunk, source, batch)
+    requests = [
+        (indicator_batch, entity_chunk)
+        for indicator_batch in batches
+        for entity_chunk in entity_chunks
+    ]
+    return batches, requests
+
+
+def combine_requests(requests_parsed, batches, entity_chunks):
+    chunks = len(entity_chunks)
+    batches_parsed = [
+        merge_entity_chunks(
+            requests_parsed[position * chunks : (position + 1) * chunks]
+        )
+        for position in range(len(batches))
+    ]
+    return split_indicator_batches(batches_parsed, batches)
+
+
+def merge_entity_chunks(chunks_parsed):
+    if len(chunks_parsed) == 1:
+        return chunks_parsed[0]
+    indicator_parsed = pl.concat(chunks_parsed)
+    time_columns = [
+        column for column in TIME_COLUMNS if column in indicator_parsed.columns
+    ]
+    return indicator_parsed.sort(time_columns, maintain_order=True)
+
+
+def create_indicator_batches(indicators, entities, source, batch):
+    if not batch or source is None:
+        return [[indicator] for indicator in indicators]
+
+    entities_length = len(create_indicator_resource("", entities))
+    batches = []
+    indicator_batch = []
+    for indicator in indicators:
+        resource_length = entities_length + len(";".join(indicator_batch + [indicator]))
+        if indicator_batch and (
+            len(indicator_batch) == MAX_INDICATORS_PER_REQUEST
+            or resource_length > MAX_RESOURCE_LENGTH
+        ):
+            batches.append(indicator_batch)
+            indicator_batch = []
+        indicator_batch.append(indicator)
+    batches.append(indicator_batch)
+    return batches
+
+
+def split_indicator_batches(batches_parsed, batches):
+    indicators_parsed = []
+    for indicator_parsed, indicator_batch in zip(batches_parsed, batches):
+        if len(indicator_batch) == 1:
+            indicators_parsed.append(indicator_parsed)
+            continue
+        parts = indicator_parsed.partition_by(
+            "indicator_id", as_dict=True, maintain_order=True
+        )
+        # Keep the requested order and any unexpected indicator ids at the end
+        for indicator in indicator_batch:
+            if (indicator,) in parts:
+                indicators_parsed.append(parts.pop((indicator,)))
+        indicators_parsed.extend(parts.values())
+    return indicators_parsed
+
+
 def get_indicator(
     indicator,
     entities,
@@ -207,15 +1002,188 @@ def get_indicator(
     per_page,
     progress,
     source,
+    max_concurrency=1,
+    client=None,
+    pipeline=False,
 ):
     progress_req = f"Sending requests for indicator {indicator}" if progress else None
     date = create_date(start_year, end_year)
-    resource = f"country/{';'.join(entities)}/indicator/{indicator}"
+    resource = create_indicator_resource(indicator, entities)
+    if pipeline:
+        pages_parsed = iter_pages(
+            resource,
+            language,
+            per_page,
+            date,
+            most_recent_only,
+            source,
+            progress_req,
+            max_concurrency=max_concurrency,
+            client=client,
+            process=functools.partial(parse_indicator_page_timed, indicator, client),
+        )
+        return concat_indicator_pages(list(pages_parsed))
+
     indicator_raw = perform_request(
-        resource, language, per_page, date, most_recent_only, source, progress_req
+        resource,
+        language,
+        per_page,
+        date,
+        most_recent_only,
+        source,
+        progress_req,
+        max_concurrency=max_concurrency,
+        client=client,
+    )
+
+    return parse_indicator_timed(indicator, indicator_raw, client)
+
+
+async def get_indicator_async(
+    indicator,
+    entities,
+    start_year,
+    end_year,
+    most_recent_only,
+    language,
+    per_page,
+    progress,
+    source,
+    max_concurrency=1,
+    client=None,
+    pipeline=False,
+):
+    progress_req = f"Sending requests for indicator {indicator}" if progress else None
+    date = create_date(start_year, end_year)
+    resource = create_indicator_resource(indicator, entities)
+    if pipeline:
+        # Pages are parsed in worker threads while the event loop downloads the next
+        pages_parsed = [
+            asyncio.ensure_future(
+                asyncio.to_thread(
+                    parse_indicator_page_timed, indicator, client, page_results
+                )
+            )
+            async for page_results in iter_pages_async(
+                resource,
+                language,
+                per_page,
+                date,
+                most_recent_only,
+                source,
+                progress_req,
+                max_concurrency=max_concurrency,
+                client=client,
+            )
+        ]
+        return concat_indicator_pages(await asyncio.gather(*pages_parsed))
+
+    indicator_raw = await perform_request_async(
+        resource,
+        language,
+        per_page,
+        date,
+        most_recent_only,
+        source,
+        progress_req,
+        max_concurrency=max_concurrency,
+        client=client,
     )
 
-    indicator_parsed = (
+    return parse_indicator_timed(indicator, indicator_raw, client)
+
+
+def parse_indicator_timed(indicator, indicator_raw, client=None):
+    start = time.perf_counter()
+    indicator_parsed = parse_indicator(indicator_raw)
+    emit(
+        "parse",
+        client,
+        indicator=indicator,
+        rows=indicator_parsed.height,
+        duration=time.perf_counter() - start,
+    )
+    return indicator_parsed
+
+
+def parse_indicator_page_timed(indicator, client, page_results):
+    start = time.perf_counter()
+    page_parsed = parse_indicator_page(page_results)
+    emit(
+        "parse",
+        client,
+        indicator=indicator,
+        rows=page_parsed.height,
+        duration=time.perf_counter() - start,
+    )
+    return page_parsed
+
+
+def concat_indicator_pages(pages_parsed):
+    pages_parsed = [page_parsed for page_parsed in pages_parsed if page_parsed.height]
+    if not pages_parsed:
+        return pl.DataFrame(schema=INDICATOR_SCHEMA)
+    # The pages are only combined by the sort, which writes each column once
+    return sort_indicator(pl.concat(pages_parsed, rechunk=False))
+
+
+def create_indicator_resource(indicator, entities):
+    return f"country/{';'.join(entities)}/indicator/{indicator}"
+
+
+def parse_indicator(indicator_raw):
+    return sort_indicator(parse_indicator_page(indicator_raw))
+
+
+def parse_indicator_page(indicator_raw):
+    """Parse records into typed columns, in the order of the records."""
+    if not indicator_raw:
+        return pl.DataFrame(schema=INDICATOR_SCHEMA)
+
+    try:
+        indicator_parsed = create_indicator_columns(indicator_raw)
+    except (KeyError, TypeError):
+        indicator_parsed = parse_indicator_legacy(indicator_raw)
+
+    if "Q" in indicator_parsed["date"][0]:
+        return indicator_parsed.with_columns(
+            year=pl.col("date").str.slice(0, 4).cast(pl.Int32),
+            quarter=pl.col("date").str.slice(5, 6).cast(pl.Int32),
+        ).drop("date")
+    elif "M" in indicator_parsed["date"][0]:
+        return indicator_parsed.with_columns(
+            year=pl.col("date").str.slice(0, 4).cast(pl.Int32),
+            month=pl.col("date").str.slice(5, 7).cast(pl.Int32),
+        ).drop("date")
+    return indicator_parsed.with_columns(year=pl.col("date").cast(pl.Int32)).drop(
+        "date"
+    )
+
+
+def sort_indicator(indicator_parsed):
+    # The sort is stable, so rows of the same period keep the order of the API
+    return indicator_parsed.sort(
+        [column for column in TIME_COLUMNS if column in indicator_parsed.columns],
+        maintain_order=True,
+    )
+
+
+def create_indicator_columns(indicator_raw):
+    # Building the columns directly with a fixed schema avoids inferring and
+    # unnesting the `indicator` and `country` structs of every record
+    return pl.DataFrame(
+        {
+            "indicator_id": [record["indicator"]["id"] for record in indicator_raw],
+            "entity_id": [record["country"]["id"] for record in indicator_raw],
+            "date": [record["date"] for record in indicator_raw],
+            "value": [record["value"] for record in indicator_raw],
+        },
+        schema=RAW_INDICATOR_SCHEMA,
+    )
+
+
+def parse_indicator_legacy(indicator_raw):
+    return (
         pl.DataFrame(indicator_raw)
         .rename({"value": "_value"})
         .unnest("indicator")
@@ -228,30 +1196,3 @@ def get_indicator(
         .rename({"_value": "value"})
         .with_columns(value=pl.col("value").cast(pl.Float64))
     )
-
-    if "Q" in indicator_parsed["date"][0]:
-        indicator_parsed = (
-            indicator_parsed.with_columns(
-                year=pl.col("date").str.slice(0, 4).cast(pl.Int32),
-                quarter=pl.col("date").str.slice(5, 6).cast(pl.Int32),
-            )
-            .drop("date")
-            .sort(["year", "quarter"])
-        )
-    elif "M" in indicator_parsed["date"][0]:
-        indicator_parsed = (
-            indicator_parsed.with_columns(
-                year=pl.col("date").str.slice(0, 4).cast(pl.Int32),
-                month=pl.col("date").str.slice(5, 7).cast(pl.Int32),
-            )
-            .drop("date")
-            .sort(["year", "month"])
-        )
-    else:
-        indicator_parsed = (
-            indicator_parsed.with_columns(year=pl.col("date").cast(pl.Int32))
-            .drop("date")
-            .sort("year")
-        )
-
-    return indicator_parsed
@@ -1,10 +1,72 @@
 import polars as pl
 
 from .config import format_output
-from .perform_request import perform_request
+from .metadata_cache import memoize_metadata
+from .parse_records import clean_strings, parse_records
+from .perform_request import perform_request, perform_request_async
 
+ENTITIES_FIELDS = {
+    "entity_id": ("id",),
+    "entity_name": ("name",),
+    "entity_iso2code": ("iso2Code",),
+    "capital_city": ("capitalCity",),
+    "region_id": ("region", "id"),
+    "region_name": ("region", "value"),
+    "region_iso2code": ("region", "iso2code"),
+    "admin_region_id": ("adminregion", "id"),
+    "admin_region_name": ("adminregion", "value"),
+    "admin_region_iso2code": ("adminregion", "iso2code"),
+    "income_level_id": ("incomeLevel", "id"),
+    "income_level_name": ("incomeLevel", "value"),
+    "income_level_iso2code": ("incomeLevel", "iso2code"),
+    "lending_type_id": ("lendingType", "id"),
+    "lending_type_name": ("lendingType", "value"),
+    "lending_type_iso2code": ("lendingType", "iso2code"),
+    "longitude": ("longitude",),
+    "latitude": ("latitude",),
+}
+ENTITIES_SCHEMA = {
+    "entity_id": pl.Utf8,
+    "entity_name": pl.Utf8,
+    "entity_iso2code": pl.Utf8,
+    "entity_type": pl.Utf8,
+    "capital_city": pl.Utf8,
+    "region_id": pl.Utf8,
+    "region_name": pl.Utf8,
+    "region_iso2code": pl.Utf8,
+    "admin_region_id": pl.Utf8,
+    "admin_region_name": pl.Utf8,
+    "admin_region_iso2code": pl.Utf8,
+    "income_level_id": pl.Utf8,
+    "income_level_name": pl.Utf8,
+    "income_level_iso2code": pl.Utf8,
+    "lending_type_id": pl.Utf8,
+    "lending_type_name": pl.Utf8,
+    "lending_type_iso2code": pl.Utf8,
+    "longitude": pl.Float64,
+    "latitude": pl.Float64,
+}
+# Columns whose values repeat across many entities
+ENTITIES_KEY_COLUMNS = (
+    "entity_type",
+    "region_id",
+    "region_name",
+    "region_iso2code",
+    "admin_region_id",
+    "admin_region_name",
+    "admin_region_iso2code",
+    "income_level_id",
+    "income_level_name",
+    "income_level_iso2code",
+    "lending_type_id",
+    "lending_type_name",
+    "lending_type_iso2code",
+)
 
-def wdi_get_entities(language="en", per_page=1000) -> pl.DataFrame:
+
+def wdi_get_entities(
+    language="en", per_page=1000, client=None, categorical=False
+) -> pl.DataFrame:
     """
     Download all countries and regions from the World Bank API.
 
@@ -20,6 +82,11 @@ def wdi_get_entities(language="en", per_page=1000) -> pl.DataFrame:
                     (Spanish), "fr" (French), and others depending on the API.
     per_page (int): An integer specifying the number of records to fetch per request.
                     Defaults to 1000.
+    client (WDIClient, optional): The client used to send requests. Defaults to the
+        shared client, see `WDIClient`.
+    categorical (bool): Whether to return the region, administrative region, income
+        level and lending type columns and `entity_type` as `pl.Enum` columns instead
+        of strings that repeat for many entities. Defaults to False.
 
     Returns
     -------
@@ -64,95 +131,70 @@ def wdi_get_entities(language="en", per_page=1000) -> pl.DataFrame:
 
     Download all entities in Spanish
     >>> wdi_get_entities(language="es")
+
+    Count the entities per region with Enum columns
+    >>> wdi_get_entities(categorical=True).group_by("region_name").len()
     """
-    entities_raw = perform_request("countries/all", language, per_page)
+    entities_processed = get_entities(language, per_page, client)
+    if categorical:
+        entities_processed = cast_entities_keys(entities_processed)
+    return format_output(entities_processed)
 
-    entities_processed = (
-        pl.DataFrame(entities_raw)
-        .rename(
-            {"id": "entity_id", "iso2Code": "entity_iso2code", "name": "entity_name"}
-        )
-        .unnest("region")
-        .rename(
-            {"id": "region_id", "iso2code": "region_iso2code", "value": "region_name"}
-        )
-        .unnest("adminregion")
-        .rename(
-            {
-                "id": "admin_region_id",
-                "iso2code": "admin_region_iso2code",
-                "value": "admin_region_name",
-            }
-        )
-        .unnest("incomeLevel")
-        .rename(
-            {
-                "id": "income_level_id",
-                "iso2code": "income_level_iso2code",
-                "value": "income_level_name",
-            }
-        )
-        .unnest("lendingType")
-        .rename(
-            {
-                "id": "lending_type_id",
-                "iso2code": "lending_type_iso2code",
-                "value": "lending_type_name",
-            }
-        )
-        .rename({"capitalCity": "capital_city"})
+
+async def wdi_get_entities_async(
+    language="en", per_page=1000, client=None, categorical=False
+) -> pl.DataFrame:
+    """
+    Download all countries and regions from the World Bank API asynchronously.
+
+    This is the asynchronous version of `wdi_get_entities()`. It accepts the
+    same parameters and returns the same DataFrame, but does not block the event
+    loop while waiting for the API.
+
+    Examples
+    --------
+    >>> await wdi_get_entities_async()
+    """
+    entities_processed = await get_entities_async(language, per_page, client)
+    if categorical:
+        entities_processed = cast_entities_keys(entities_processed)
+    return format_output(entities_processed)
+
+
+@memoize_metadata("entities")
+def get_entities(language="en", per_page=1000, client=None) -> pl.DataFrame:
+    entities_raw = perform_request("countries/all", language, per_page, client=client)
+
+    return process_entities(entities_raw)
+
+
+@memoize_metadata("entities")
+async def get_entities_async(language="en", per_page=1000, client=None) -> pl.DataFrame:
+    entities_raw = await perform_request_async(
+        "countries/all", language, per_page, client=client
+    )
+
+    return process_entities(entities_raw)
+
+
+def process_entities(entities_raw) -> pl.DataFrame:
+    return (
+        parse_records(entities_raw, ENTITIES_FIELDS)
         .with_columns(
-            longitude=pl.when(pl.col("longitude") == "")
-            .then(None)
-            .otherwise(pl.col("longitude"))
-            .cast(pl.Float64),
-            latitude=pl.when(pl.col("latitude") == "")
-            .then(None)
-            .otherwise(pl.col("latitude"))
-            .cast(pl.Float64),
+            *clean_strings(*ENTITIES_FIELDS),
             entity_type=pl.when(pl.col("region_name") == "Aggregates")
             .then(pl.lit("aggregate"))
             .otherwise(pl.lit("country")),
         )
+        .select(ENTITIES_SCHEMA.keys())
+        .cast(ENTITIES_SCHEMA)
     )
 
-    entities_processed = (
-        entities_processed.with_columns(
-            [
-                pl.when(pl.col(column) == "")
-                .then(None)
-                .otherwise(pl.col(column))
-                .alias(column)
-                for column in entities_processed.select(pl.col(pl.Utf8)).columns
-            ]
-        )
-        .with_columns(
-            [
-                pl.col(column).str.strip_chars().alias(column)
-                for column in entities_processed.select(pl.col(pl.Utf8)).columns
-            ]
-        )
-        .select(
-            pl.col("entity_id"),
-            pl.col("entity_name"),
-            pl.col("entity_iso2code"),
-            pl.col("entity_type"),
-            pl.col("capital_city"),
-            pl.col("region_id"),
-            pl.col("region_name"),
-            pl.col("region_iso2code"),
-            pl.col("admin_region_id"),
-            pl.col("admin_region_name"),
-            pl.col("admin_region_iso2code"),
-            pl.col("income_level_id"),
-            pl.col("income_level_name"),
-            pl.col("income_level_iso2code"),
-            pl.col("lending_type_id"),
-            pl.col("lending_type_name"),
-            pl.col("lending_type_iso2code"),
-            pl.col("longitude"),
-            pl.col("latitude"),
-        )
-    )
 
-    return format_output(entities_processed)
+def cast_entities_keys(entities_processed) -> pl.DataFrame:
+    return entities_processed.cast(
+        {
+            column: pl.Enum(sorted(entities_processed[column].drop_nulls().unique()))
+            for column in ENTITIES_KEY_COLUMNS
+        }
+    )
@@ -1,10 +1,18 @@
 import polars as pl
 
 from .config import format_output
-from .perform_request import perform_request
+from .metadata_cache import memoize_metadata
+from .parse_records import parse_records
+from .perform_request import perform_request, perform_request_async
 
+INCOME_LEVELS_FIELDS = {
+    "income_level_id": ("id",),
+    "income_level_iso2code": ("iso2code",),
+    "income_level_name": ("value",),
+}
 
-def wdi_get_income_levels(language: str = "en") -> pl.DataFrame:
+
+def wdi_get_income_levels(language: str = "en", client=None) -> pl.DataFrame:
     """
     Download income levels from the World Bank API.
 
@@ -16,6 +24,8 @@ def wdi_get_income_levels(language: str = "en") -> pl.DataFrame:
     ----------
     language (str): A string specifying the language code for the API response
                     (default is "en" for English).
+    client (WDIClient, optional): The client used to send requests. Defaults to the
+        shared client, see `WDIClient`.
 
     Returns
     -------
@@ -41,14 +51,43 @@ def wdi_get_income_levels(language: str = "en") -> pl.DataFrame:
     Download all income levels in English
     >>> wdi_get_income_levels()
     """
-    income_levels_raw = perform_request("incomeLevels", language=language)
-
-    income_levels_processed = pl.DataFrame(income_levels_raw).rename(
-        {
-            "id": "income_level_id",
-            "iso2code": "income_level_iso2code",
-            "value": "income_level_name",
-        }
+    return format_output(get_income_levels(language, client))
+
+
+async def wdi_get_income_levels_async(
+    language: str = "en", client=None
+) -> pl.DataFrame:
+    """
+    Download income levels from the World Bank API asynchronously.
+
+    This is the asynchronous version of `wdi_get_income_levels()`. It accepts the
+    same parameters and returns the same DataFrame, but does not block the event
+    loop while waiting for the API.
+
+    Examples
+    --------
+    >>> await wdi_get_income_levels_async()
+    """
+    return format_output(await get_income_levels_async(language, client))
+
+
+@memoize_metadata("income_levels")
+def get_income_levels(language: str = "en", client=None) -> pl.DataFrame:
+    income_levels_raw = perform_request(
+        "incomeLevels", language=language, client=client
+    )
+
+    return process_income_levels(income_levels_raw)
+
+
+@memoize_metadata("income_levels")
+async def get_income_levels_async(language: str = "en", client=None) -> pl.DataFrame:
+    income_levels_raw = await perform_request_async(
+        "incomeLevels", language=language, client=client
     )
 
-    return format_output(income_levels_processed)
+    return process_income_levels(income_levels_raw)
+
+
+def process_income_levels(income_levels_raw) -> pl.DataFrame:
+    return parse_records(income_levels_raw, INCOME_LEVELS_FIELDS)
@@ -1,10 +1,30 @@
 import polars as pl
 
 from .config import format_output
-from .perform_request import perform_request
+from .metadata_cache import memoize_metadata
+from .parse_records import parse_records
+from .perform_request import perform_request, perform_request_async
 
+INDICATORS_FIELDS = {
+    "indicator_id": ("id",),
+    "indicator_name": ("name",),
+    "source_id": ("source", "id"),
+    "source_name": ("source", "value"),
+    "source_note": ("sourceNote",),
+    "source_organization": ("sourceOrganization",),
+}
+INDICATORS_SCHEMA = {
+    "indicator_id": pl.Utf8,
+    "indicator_name": pl.Utf8,
+    "source_id": pl.Int64,
+    "source_name": pl.Utf8,
+    "source_note": pl.Utf8,
+    "source_organization": pl.Utf8,
+    "topics": pl.List(pl.Struct({"topic_id": pl.Int64, "topic_name": pl.Utf8})),
+}
 
-def wdi_get_indicators(language="en", per_page=32500) -> pl.DataFrame:
+
+def wdi_get_indicators(language="en", per_page=32500, client=None) -> pl.DataFrame:
     """
     Download all available World Bank indicators.
 
@@ -19,6 +39,8 @@ def wdi_get_indicators(language="en", per_page=32500) -> pl.DataFrame:
         response (default is "en" for English).
     per_page (int): An integer specifying the number of results per page for the
         API. Defaults to 32,500. Must be a value between 1 and 32,500.
+    client (WDIClient, optional): The client used to send requests. Defaults to the
+        shared client, see `WDIClient`.
 
     Returns
     -------
@@ -50,23 +72,54 @@ def wdi_get_indicators(language="en", per_page=32500) -> pl.DataFrame:
     >>> wdi_get_indicators(language="es")
     """
 
-    indicators_raw = perform_request("indicators", language=language, per_page=per_page)
-
-    indicators_processed = (
-        pl.DataFrame(indicators_raw)
-        .rename({"id": "indicator_id", "name": "indicator_name"})
-        .unnest("source")
-        .rename(
-            {
-                "id": "source_id",
-                "value": "source_name",
-                "sourceNote": "source_note",
-                "sourceOrganization": "source_organization",
-            }
-        )
-        .drop("unit")
+    return format_output(get_indicators(language, per_page, client))
+
+
+async def wdi_get_indicators_async(
+    language="en", per_page=32500, client=None
+) -> pl.DataFrame:
+    """
+    Download all available World Bank indicators asynchronously.
+
+    This is the asynchronous version of `wdi_get_indicators()`. It accepts the
+    same parameters and returns the same DataFrame, but does not block the event
+    loop while waiting for the API.
+
+    Examples
+    --------
+    >>> await wdi_get_indicators_async()
+    """
+    return format_output(await get_indicators_async(language, per_page, client))
+
+
+@memoize_metadata("indicators")
+def get_indicators(language="en", per_page=32500, client=None) -> pl.DataFrame:
+    indicators_raw = perform_request(
+        "indicators", language=language, per_page=per_page, client=client
+    )
+
+    return process_indicators(indicators_raw)
+
+
+@memoize_metadata("indicators")
+async def get_indicators_async(
+    language="en", per_page=32500, client=None
+) -> pl.DataFrame:
+    indicators_raw = await perform_request_async(
+        "indicators", language=language, per_page=per_page, client=client
+    )
+
+    return process_indicators(indicators_raw)
+
+
+def process_indicators(indicators_raw) -> pl.DataFrame:
+    return (
+        parse_records(indicators_raw, INDICATORS_FIELDS)
+        .with_row_index("row")
+        .join(create_topics(indicators_raw), on="row", how="left")
+        .sort("row")
+        .drop("row")
         .with_columns(
-            source_id=pl.col("source_id").cast(pl.Int64),
             source_note=pl.when(pl.col("source_note") == "")
             .then(None)
             .otherwise(pl.col("source_note")),
@@ -74,23 +127,29 @@ def wdi_get_indicators(language="en", per_page=32500) -> pl.DataFrame:
             .then(None)
             .otherwise(pl.col("source_organization")),
         )
+        .cast(INDICATORS_SCHEMA)
     )
 
-    topics = (
-        indicators_processed.select(pl.col("indicator_id", "topics"))
-        .explode("topics")
-        .unnest("topics")
-        .rename({"id": "topic_id", "value": "topic_name"})
-        .with_columns(
-            topic_id=pl.col("topic_id").cast(pl.Int64),
-            topic_name=pl.col("topic_name").str.strip_chars(),
-        )
-        .group_by("indicator_id")
-        .agg(topics=pl.struct(["topic_id", "topic_name"]))
-    )
 
-    indicators_processed = indicators_processed.drop("topics").join(
-        topics, on="indicator_id", how="left"
+def create_topics(indicators_raw) -> pl.DataFrame:
+    # Topics are collected into flat columns and nested once per indicator, which is
+    # much faster than building or exploding nested Python objects
+    rows, topic_ids, topic_names = [], [], []
+    for row, indicator in enumerate(indicators_raw or []):
+        for topic in indicator.get("topics") or []:
+            rows.append(row)
+            topic_ids.append(topic.get("id") or None)
+            topic_names.append(topic.get("value"))
+    return (
+        pl.DataFrame(
+            {"row": rows, "topic_id": topic_ids, "topic_name": topic_names},
+            schema={"row": pl.UInt32, "topic_id": pl.Utf8, "topic_name": pl.Utf8},
+        )
+        .group_by("row", maintain_order=True)
+        .agg(
+            topics=pl.struct(
+                pl.col("topic_id").cast(pl.Int64),
+                pl.col("topic_name").str.strip_chars(),
+            )
+        )
     )
-
-    return format_output(indicators_processed)
@@ -1,10 +1,18 @@
 import polars as pl
 
 from .config import format_output
-from .perform_request import perform_request
+from .metadata_cache import memoize_metadata
+from .parse_records import parse_records
+from .perform_request import perform_request, perform_request_async
 
+LANGUAGES_FIELDS = {
+    "language_code": ("code",),
+    "language_name": ("name",),
+    "native_form": ("nativeForm",),
+}
 
-def wdi_get_languages() -> pl.DataFrame:
+
+def wdi_get_languages(client=None) -> pl.DataFrame:
     """
     Download languages from the World Bank API.
 
@@ -12,6 +20,11 @@ def wdi_get_languages() -> pl.DataFrame:
     World Bank API. The supported languages include English, Spanish, French,
     Arabic, Chinese, and others.
 
+    Parameters
+    ----------
+    client (WDIClient, optional): The client used to send requests. Defaults to the
+        shared client, see `WDIClient`.
+
     Returns
     -------
      pl.DataFrame
@@ -38,21 +51,40 @@ def wdi_get_languages() -> pl.DataFrame:
     >>> wdi_get_languages()
     """
 
-    langauges_raw = perform_request("languages")
-
-    languages_processed = (
-        pl.DataFrame(langauges_raw)
-        .rename(
-            {
-                "code": "language_code",
-                "name": "language_name",
-                "nativeForm": "native_form",
-            }
-        )
-        .with_columns(
-            language_name=pl.col("language_name").str.strip_chars_end(),
-            native_form=pl.col("native_form").str.strip_chars_end(),
-        )
-    )
+    return format_output(get_languages(client))
+
+
+async def wdi_get_languages_async(client=None) -> pl.DataFrame:
+    """
+    Download languages from the World Bank API asynchronously.
+
+    This is the asynchronous version of `wdi_get_languages()`. It accepts the
+    same parameters and returns the same DataFrame, but does not block the event
+    loop while waiting for the API.
 
-    return format_output(languages_processed)
+    Examples
+    --------
+    >>> await wdi_get_languages_async()
+    """
+    return format_output(await get_languages_async(client))
+
+
+@memoize_metadata("languages")
+def get_languages(client=None) -> pl.DataFrame:
+    langauges_raw = perform_request("languages", client=client)
+
+    return process_languages(langauges_raw)
+
+
+@memoize_metadata("languages")
+async def get_languages_async(client=None) -> pl.DataFrame:
+    langauges_raw = await perform_request_async("languages", client=client)
+
+    return process_languages(langauges_raw)
+
+
+def process_languages(langauges_raw) -> pl.DataFrame:
+    return parse_records(langauges_raw, LANGUAGES_FIELDS).with_columns(
+        language_name=pl.col("language_name").str.strip_chars_end(),
+        native_form=pl.col("native_form").str.strip_chars_end(),
+    )
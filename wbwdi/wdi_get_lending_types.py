@@ -1,10 +1,18 @@
 import polars as pl
 
 from .config import format_output
-from .perform_request import perform_request
+from .metadata_cache import memoize_metadata
+from .parse_records import parse_records
+from .perform_request import perform_request, perform_request_async
 
+LENDING_TYPES_FIELDS = {
+    "lending_type_id": ("id",),
+    "lending_type_iso2code": ("iso2code",),
+    "lending_type_name": ("value",),
+}
 
-def wdi_get_lending_types(language="en") -> pl.DataFrame:
+
+def wdi_get_lending_types(language="en", client=None) -> pl.DataFrame:
     """
     Download lending types from the World Bank API.
 
@@ -16,6 +24,8 @@ def wdi_get_lending_types(language="en") -> pl.DataFrame:
     ----------
     language (str): A character string specifying the language code for the API
         response (default is "en" for English).
+    client (WDIClient, optional): The client used to send requests. Defaults to the
+        shared client, see `WDIClient`.
 
     Returns
     -------
@@ -41,14 +51,41 @@ def wdi_get_lending_types(language="en") -> pl.DataFrame:
     >>> wdi_get_lending_types()
     """
 
-    lending_types_raw = perform_request("lendingTypes", language=language)
+    return format_output(get_lending_types(language, client))
+
+
+async def wdi_get_lending_types_async(language="en", client=None) -> pl.DataFrame:
+    """
+    Download lending types from the World Bank API asynchronously.
+
+    This is the asynchronous version of `wdi_get_lending_types()`. It accepts the
+    same parameters and returns the same DataFrame, but does not block the event
+    loop while waiting for the API.
+
+    Examples
+    --------
+    >>> await wdi_get_lending_types_async()
+    """
+    return format_output(await get_lending_types_async(language, client))
+
 
-    lending_types_processed = pl.DataFrame(lending_types_raw).rename(
-        {
-            "id": "lending_type_id",
-            "iso2code": "lending_type_iso2code",
-            "value": "lending_type_name",
-        }
+@memoize_metadata("lending_types")
+def get_lending_types(language="en", client=None) -> pl.DataFrame:
+    lending_types_raw = perform_request(
+        "lendingTypes", language=language, client=client
     )
 
-    return format_output(lending_types_processed)
+    return process_lending_types(lending_types_raw)
+
+
+@memoize_metadata("lending_types")
+async def get_lending_types_async(language="en", client=None) -> pl.DataFrame:
+    lending_types_raw = await perform_request_async(
+        "lendingTypes", language=language, client=client
+    )
+
+    return process_lending_types(lending_types_raw)
+
+
+def process_lending_types(lending_types_raw) -> pl.DataFrame:
+    return parse_records(lending_types_raw, LENDING_TYPES_FIELDS)
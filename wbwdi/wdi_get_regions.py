@@ -1,10 +1,25 @@
 import polars as pl
 
 from .config import format_output
-from .perform_request import perform_request
+from .metadata_cache import memoize_metadata
+from .parse_records import parse_records
+from .perform_request import perform_request, perform_request_async
 
+REGIONS_FIELDS = {
+    "region_id": ("id",),
+    "region_code": ("code",),
+    "region_iso2code": ("iso2code",),
+    "region_name": ("name",),
+}
+REGIONS_SCHEMA = {
+    "region_id": pl.Int64,
+    "region_code": pl.Utf8,
+    "region_iso2code": pl.Utf8,
+    "region_name": pl.Utf8,
+}
 
-def wdi_get_regions(language: str = "en") -> pl.DataFrame:
+
+def wdi_get_regions(language: str = "en", client=None) -> pl.DataFrame:
     """
     Download regions from the World Bank API.
 
@@ -16,6 +31,8 @@ def wdi_get_regions(language: str = "en") -> pl.DataFrame:
     ----------
     language (str): A string specifying the language code for the API response
         (default is "en" for English).
+    client (WDIClient, optional): The client used to send requests. Defaults to the
+        shared client, see `WDIClient`.
 
     Returns
     -------
@@ -41,26 +58,49 @@ def wdi_get_regions(language: str = "en") -> pl.DataFrame:
     Download all regions in English
     >>> wdi_get_regions()
     """
-    regions_raw = perform_request("region", language=language)
+    return format_output(get_regions(language, client))
+
+
+async def wdi_get_regions_async(language: str = "en", client=None) -> pl.DataFrame:
+    """
+    Download regions from the World Bank API asynchronously.
+
+    This is the asynchronous version of `wdi_get_regions()`. It accepts the
+    same parameters and returns the same DataFrame, but does not block the event
+    loop while waiting for the API.
+
+    Examples
+    --------
+    >>> await wdi_get_regions_async()
+    """
+    return format_output(await get_regions_async(language, client))
+
 
+@memoize_metadata("regions")
+def get_regions(language: str = "en", client=None) -> pl.DataFrame:
+    regions_raw = perform_request("region", language=language, client=client)
+
+    return process_regions(regions_raw)
+
+
+@memoize_metadata("regions")
+async def get_regions_async(language: str = "en", client=None) -> pl.DataFrame:
+    regions_raw = await perform_request_async(
+        "region", language=language, client=client
+    )
+
+    return process_regions(regions_raw)
+
+
+def process_regions(regions_raw) -> pl.DataFrame:
     # id is non-missing for 7 entries
-    regions_processed = (
-        pl.DataFrame(regions_raw)
-        .rename(
-            {
-                "id": "region_id",
-                "code": "region_code",
-                "iso2code": "region_iso2code",
-                "name": "region_name",
-            }
-        )
+    return (
+        parse_records(regions_raw, REGIONS_FIELDS)
         .with_columns(
             region_id=pl.when(pl.col("region_id") == "")
             .then(None)
-            .otherwise(pl.col("region_id"))
-            .cast(pl.Int64),
+            .otherwise(pl.col("region_id")),
             region_name=pl.col("region_name").str.strip_chars(),
         )
+        .cast(REGIONS_SCHEMA)
     )
-
-    return format_output(regions_processed)
@@ -1,10 +1,31 @@
 import polars as pl
 
 from .config import format_output
-from .perform_request import perform_request
+from .metadata_cache import memoize_metadata
+from .parse_records import parse_records
+from .perform_request import perform_request, perform_request_async
 
+SOURCES_FIELDS = {
+    "source_id": ("id",),
+    "source_code": ("code",),
+    "source_name": ("name",),
+    "update_date": ("lastupdated",),
+    "is_data_available": ("dataavailability",),
+    "is_metadata_available": ("metadataavailability",),
+    "concepts": ("concepts",),
+}
+SOURCES_SCHEMA = {
+    "source_id": pl.Int64,
+    "source_code": pl.Utf8,
+    "source_name": pl.Utf8,
+    "update_date": pl.Date,
+    "is_data_available": pl.Boolean,
+    "is_metadata_available": pl.Boolean,
+    "concepts": pl.Int64,
+}
 
-def wdi_get_sources(language: str = "en") -> pl.DataFrame:
+
+def wdi_get_sources(language: str = "en", client=None) -> pl.DataFrame:
     """
     Download data sources from the World Bank API.
 
@@ -16,6 +37,8 @@ def wdi_get_sources(language: str = "en") -> pl.DataFrame:
     ----------
     language (str): A string specifying the language code for the API response
                     (default is "en" for English).
+    client (WDIClient, optional): The client used to send requests. Defaults to the
+        shared client, see `WDIClient`.
 
     Returns
     -------
@@ -44,38 +67,48 @@ def wdi_get_sources(language: str = "en") -> pl.DataFrame:
     Download all available data sources in English
     >>> wdi_get_sources()
     """
-    sources_raw = perform_request("sources", language=language)
-
-    sources_processed = (
-        pl.DataFrame(sources_raw)
-        .rename(
-            {
-                "id": "source_id",
-                "code": "source_code",
-                "name": "source_name",
-                "lastupdated": "update_date",
-                "dataavailability": "is_data_available",
-                "metadataavailability": "is_metadata_available",
-                "concepts": "concepts",
-            }
-        )
+    return format_output(get_sources(language, client))
+
+
+async def wdi_get_sources_async(language: str = "en", client=None) -> pl.DataFrame:
+    """
+    Download data sources from the World Bank API asynchronously.
+
+    This is the asynchronous version of `wdi_get_sources()`. It accepts the
+    same parameters and returns the same DataFrame, but does not block the event
+    loop while waiting for the API.
+
+    Examples
+    --------
+    >>> await wdi_get_sources_async()
+    """
+    return format_output(await get_sources_async(language, client))
+
+
+@memoize_metadata("sources")
+def get_sources(language: str = "en", client=None) -> pl.DataFrame:
+    sources_raw = perform_request("sources", language=language, client=client)
+
+    return process_sources(sources_raw)
+
+
+@memoize_metadata("sources")
+async def get_sources_async(language: str = "en", client=None) -> pl.DataFrame:
+    sources_raw = await perform_request_async(
+        "sources", language=language, client=client
+    )
+
+    return process_sources(sources_raw)
+
+
+def process_sources(sources_raw) -> pl.DataFrame:
+    return (
+        parse_records(sources_raw, SOURCES_FIELDS)
         .with_columns(
-            source_id=pl.col("source_id").cast(pl.Int64),
             source_name=pl.col("source_name").str.strip_chars(),
             update_date=pl.col("update_date").str.to_date(),
             is_data_available=pl.col("is_data_available") == "Y",
             is_metadata_available=pl.col("is_metadata_available") == "Y",
-            concepts=pl.col("concepts").cast(pl.Int64),
-        )
-        .select(
-            pl.col("source_id"),
-            pl.col("source_code"),
-            pl.col("source_name"),
-            pl.col("update_date"),
-            pl.col("is_data_available"),
-            pl.col("is_metadata_available"),
-            pl.col("concepts"),
         )
+        .cast(SOURCES_SCHEMA)
     )
-
-    return format_output(sources_processed)
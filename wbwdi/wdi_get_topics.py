@@ -1,10 +1,23 @@
 import polars as pl
 
 from .config import format_output
-from .perform_request import perform_request
+from .metadata_cache import memoize_metadata
+from .parse_records import parse_records
+from .perform_request import perform_request, perform_request_async
 
+TOPICS_FIELDS = {
+    "topic_id": ("id",),
+    "topic_name": ("value",),
+    "topic_note": ("sourceNote",),
+}
+TOPICS_SCHEMA = {
+    "topic_id": pl.Int64,
+    "topic_name": pl.Utf8,
+    "topic_note": pl.Utf8,
+}
 
-def wdi_get_topics(language: str = "en") -> pl.DataFrame:
+
+def wdi_get_topics(language: str = "en", client=None) -> pl.DataFrame:
     """
     This function returns a tibble of supported topics for querying the World
     Bank API. Topics represent the broad subject areas covered by the World
@@ -14,6 +27,8 @@ def wdi_get_topics(language: str = "en") -> pl.DataFrame:
     ----------
     language (str): A string specifying the language code for the API response
         (default is "en" for English).
+    client (WDIClient, optional): The client used to send requests. Defaults to the
+        shared client, see `WDIClient`.
 
     Returns
     -------
@@ -38,16 +53,44 @@ def wdi_get_topics(language: str = "en") -> pl.DataFrame:
     Download all available topics in English
     >>> wdi_get_topics()
     """
-    topics_raw = perform_request("topics", language=language)
+    return format_output(get_topics(language, client))
+
+
+async def wdi_get_topics_async(language: str = "en", client=None) -> pl.DataFrame:
+    """
+    Download topics from the World Bank API asynchronously.
+
+    This is the asynchronous version of `wdi_get_topics()`. It accepts the
+    same parameters and returns the same DataFrame, but does not block the event
+    loop while waiting for the API.
+
+    Examples
+    --------
+    >>> await wdi_get_topics_async()
+    """
+    return format_output(await get_topics_async(language, client))
 
-    topics_processed = (
-        pl.DataFrame(topics_raw)
-        .rename({"id": "topic_id", "value": "topic_name", "sourceNote": "topic_note"})
+
+@memoize_metadata("topics")
+def get_topics(language: str = "en", client=None) -> pl.DataFrame:
+    topics_raw = perform_request("topics", language=language, client=client)
+
+    return process_topics(topics_raw)
+
+
+@memoize_metadata("topics")
+async def get_topics_async(language: str = "en", client=None) -> pl.DataFrame:
+    topics_raw = await perform_request_async("topics", language=language, client=client)
+
+    return process_topics(topics_raw)
+
+
+def process_topics(topics_raw) -> pl.DataFrame:
+    return (
+        parse_records(topics_raw, TOPICS_FIELDS)
         .with_columns(
-            topic_id=pl.col("topic_id").cast(pl.Int64),
             topic_name=pl.col("topic_name").str.strip_chars(),
             topic_note=pl.col("topic_note").str.strip_chars(),
         )
+        .cast(TOPICS_SCHEMA)
     )
-
-    return format_output(topics_processed)
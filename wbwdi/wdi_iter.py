@@ -0,0 +1,257 @@
+from typing import AsyncIterator, Iterator
+
+from .config import format_output
+from .perform_request import (
+    iter_pages,
+    iter_pages_async,
+    validate_max_concurrency,
+    validate_per_page,
+)
+from .wdi_get import (
+    create_date,
+    create_entity_chunks,
+    create_indicator_resource,
+    create_period_bounds,
+    create_requests,
+    filter_entities,
+    map_entity_ids,
+    needs_entity_mapping,
+    normalize_inputs,
+    parse_indicator,
+    plan_entity_chunks,
+    relocate_entity_id,
+    validate_batch,
+    validate_frequency,
+    validate_most_recent_only,
+    validate_source,
+    validate_source_async,
+)
+from .wdi_entity_snapshot import get_entity_mapping, get_entity_mapping_async
+from .wdi_get_entities import get_entities, get_entities_async
+
+
+def wdi_iter(
+    entities,
+    indicators,
+    start_year=None,
+    end_year=None,
+    most_recent_only=False,
+    frequency="annual",
+    language="en",
+    per_page=1000,
+    source=None,
+    max_concurrency=1,
+    batch=False,
+    client=None,
+) -> Iterator:
+    """
+    Download World Bank indicator data page by page.
+
+    This function sends the same requests as `wdi_get()`, but instead of collecting all
+    result pages into one DataFrame, it yields one parsed DataFrame per result page as
+    soon as the page is downloaded. Memory use is therefore bounded by `per_page`
+    rather than by the size of the whole download, and each page can be processed or
+    written out before the next one arrives.
+
+    Parameters:
+    -----------
+    entities (list of str): A list of ISO 2-country codes, or "all" to retrieve data for all entities.
+    indicators (list of str): A list specifying one or more World Bank indicators to download (e.g., ["NY.GDP.PCAP.KD", "SP.POP.TOTL"]).
+    start_year (int, optional): The starting year for the data.
+    end_year (int, optional): The ending year for the data.
+    most_recent_only (bool): A logical value indicating whether to download only the most recent value. In case of True, it overrides `start_year` and `end_year`. Defaults to False.
+    frequency (str): The frequency of the data ("annual", "quarter", "month"). Defaults to "annual".
+    language (str): The language for the request. See wdi_get_languages for options. Defaults to "en".
+    per_page (int or str): The number of results per page for the API, i.e., the maximum number of rows per yielded DataFrame, or "auto" to choose the page size from the total number of results. Defaults to 1000.
+    source (int, optional): The data source, see wdi_get_sources.
+    max_concurrency (int): The maximum number of result pages per indicator that are downloaded in parallel. Defaults to 1.
+    batch (bool): Whether to combine multiple indicators into a single request. Only applies if `source` is given. Defaults to False.
+    client (WDIClient, optional): The client used to send requests. Defaults to the shared client, see `WDIClient`.
+
+    Returns:
+    -----------
+    Iterator
+        An iterator of DataFrames in the long format of `wdi_get()`, with the columns
+        `entity_id`, `indicator_id`, `value`, `year` and `quarter` or `month` for
+        sub-annual frequencies. Indicators are requested one after another, and the
+        pages of each request are yielded in page order. Pages without any rows for
+        the requested entities are skipped.
+
+    Examples:
+    -----------
+    # Write all entities of an indicator to Parquet files, one page at a time
+    >>> for page, indicator_page in enumerate(wdi_iter("all", "SP.POP.TOTL")):
+    ...     indicator_page.write_parquet(f"population-{page}.parquet")
+
+    # Use larger pages with parallel downloads
+    >>> for indicator_page in wdi_iter("all", "SP.POP.TOTL", per_page=10000, max_concurrency=4):
+    ...     print(indicator_page.height)
+    """
+    entities, indicators = normalize_inputs(entities, indicators)
+
+    validate_most_recent_only(most_recent_only)
+    validate_frequency(frequency)
+    validate_source(source, client)
+    validate_batch(batch)
+    validate_per_page(per_page)
+    validate_max_concurrency(max_concurrency)
+
+    start_year, end_year = create_period_bounds(
+        start_year, end_year, most_recent_only, frequency
+    )
+
+    entity_chunks = create_entity_chunks(entities)
+    entity_filter = None
+    if len(entity_chunks) > 1:
+        entity_chunks, entity_filter = plan_entity_chunks(
+            entities, entity_chunks, get_entities(client=client)
+        )
+    _, requests = create_requests(indicators, entity_chunks, source, batch)
+
+    # Inputs are validated when `wdi_iter()` is called, and requests are sent lazily
+    return iter_indicator_pages(
+        requests,
+        entity_filter,
+        create_date(start_year, end_year),
+        most_recent_only,
+        language,
+        per_page,
+        source,
+        max_concurrency,
+        client,
+    )
+
+
+def wdi_iter_async(
+    entities,
+    indicators,
+    start_year=None,
+    end_year=None,
+    most_recent_only=False,
+    frequency="annual",
+    language="en",
+    per_page=1000,
+    source=None,
+    max_concurrency=1,
+    batch=False,
+    client=None,
+) -> AsyncIterator:
+    """
+    Download World Bank indicator data page by page asynchronously.
+
+    This is the asynchronous version of `wdi_iter()`. It accepts the same parameters
+    and returns an asynchronous iterator of the same DataFrames. Inputs are validated
+    when `wdi_iter_async()` is called, except that `source` is checked against the
+    supported sources when the iteration starts, since this requires a request.
+
+    Examples:
+    -----------
+    # Process the pages of an indicator from a coroutine
+    >>> async for indicator_page in wdi_iter_async("all", "SP.POP.TOTL"):
+    ...     print(indicator_page.height)
+    """
+    entities, indicators = normalize_inputs(entities, indicators)
+
+    validate_most_recent_only(most_recent_only)
+    validate_frequency(frequency)
+    validate_batch(batch)
+    validate_per_page(per_page)
+    validate_max_concurrency(max_concurrency)
+
+    start_year, end_year = create_period_bounds(
+        start_year, end_year, most_recent_only, frequency
+    )
+
+    return iter_indicator_pages_async(
+        entities,
+        indicators,
+        start_year,
+        end_year,
+        most_recent_only,
+        language,
+        per_page,
+        source,
+        max_concurrency,
+        batch,
+        client,
+    )
+
+
+def iter_indicator_pages(
+    requests,
+    entity_filter,
+    date,
+    most_recent_only,
+    language,
+    per_page,
+    source,
+    max_concurrency,
+    client,
+):
+    for indicator_batch, entity_chunk in requests:
+        pages = iter_pages(
+            create_indicator_resource(";".join(indicator_batch), entity_chunk),
+            language,
+            per_page,
+            date,
+            most_recent_only,
+            source,
+            max_concurrency=max_concurrency,
+            client=client,
+        )
+        for page_raw in pages:
+            page_parsed = filter_entities(parse_indicator(page_raw), entity_filter)
+            if page_parsed.height == 0:
+                continue
+            if needs_entity_mapping(page_parsed):
+                page_parsed = map_entity_ids(
+                    page_parsed, get_entity_mapping(page_parsed, client), client
+                )
+            yield format_output(relocate_entity_id(page_parsed))
+
+
+async def iter_indicator_pages_async(
+    entities,
+    indicators,
+    start_year,
+    end_year,
+    most_recent_only,
+    language,
+    per_page,
+    source,
+    max_concurrency,
+    batch,
+    client,
+):
+    await validate_source_async(source, client)
+
+    entity_chunks = create_entity_chunks(entities)
+    entity_filter = None
+    if len(entity_chunks) > 1:
+        entity_chunks, entity_filter = plan_entity_chunks(
+            entities, entity_chunks, await get_entities_async(client=client)
+        )
+    _, requests = create_requests(indicators, entity_chunks, source, batch)
+
+    for indicator_batch, entity_chunk in requests:
+        pages = iter_pages_async(
+            create_indicator_resource(";".join(indicator_batch), entity_chunk),
+            language,
+            per_page,
+            create_date(start_year, end_year),
+            most_recent_only,
+            source,
+            max_concurrency=max_concurrency,
+            client=client,
+        )
+        async for page_raw in pages:
+            page_parsed = filter_entities(parse_indicator(page_raw), entity_filter)
+            if page_parsed.height == 0:
+                continue
+            if needs_entity_mapping(page_parsed):
+                page_parsed = map_entity_ids(
+                    page_parsed,
+                    await get_entity_mapping_async(page_parsed, client),
+                    client,
+                )
+            yield format_output(relocate_entity_id(page_parsed))
@@ -0,0 +1,182 @@
+import hashlib
+import os
+import shutil
+import tempfile
+import zipfile
+from pathlib import Path
+from typing import Optional
+
+import polars as pl
+
+from .config import format_output
+from .reshape_wide import pivot_wide_lazy
+from .wdi_cache import default_cache_directory
+from .wdi_get import relocate_entity_id, reshape_indicators, validate_format
+
+# Data files of the bulk archives, e.g., WDICSV.csv or the older WDIData.csv
+BULK_DATA_SUFFIXES = ("csv.csv", "data.csv")
+BULK_ID_COLUMNS = {"Country Code": "entity_id", "Indicator Code": "indicator_id"}
+
+
+def wdi_load_bulk(
+    path,
+    indicators=None,
+    entities="all",
+    start_year: Optional[int] = None,
+    end_year: Optional[int] = None,
+    format="long",
+    lazy=False,
+):
+    """
+    Load World Bank indicator data from a downloaded bulk archive.
+
+    The World Bank publishes all World Development Indicators as a single ZIP archive
+    of CSV files (e.g., https://databank.worldbank.org/data/download/WDI_CSV.zip).
+    This function reads such an archive, or the data CSV file extracted from it,
+    without sending any request, and returns the data in the same format as
+    `wdi_get()`.
+
+    Parameters
+    ----------
+    path (str or Path): The path of the ZIP archive or of its data CSV file.
+    indicators (list of str, optional): The indicators to load. If None, all
+        indicators in the archive are loaded.
+    entities (list of str): A list of ISO 3-country codes, or "all" to load data for
+        all entities. Defaults to "all".
+    start_year (int, optional): The first year to load.
+    end_year (int, optional): The last year to load.
+    format (str): Specifies whether the data is returned in "long" or "wide" format.
+        Defaults to "long".
+    lazy (bool): Whether to return a `pl.LazyFrame` instead of collecting the data.
+        In the "wide" format, the lazy result has one column per requested indicator,
+        or per indicator in the archive if `indicators` is None, which are read with an
+        extra pass over the file. Defaults to False.
+
+    Returns
+    -------
+    pl.DataFrame
+        A DataFrame with the columns of `wdi_get()`: `entity_id` (ISO3 code),
+        `indicator_id`, `value` and `year` in the long format, or `entity_id`, `year`
+        and one column per indicator in the wide format.
+
+    Details
+    -------
+    The data CSV file is read with `pl.scan_csv()`, and the year columns are reshaped
+    into rows lazily, so only the requested years are parsed and the filters on
+    indicators and entities are applied while scanning. ZIP archives are extracted
+    once into the `bulk` folder of the user cache directory and reused as long as
+    the archive does not change. Like `wdi_get()`, missing values are kept as rows.
+
+    Examples
+    --------
+    Load two indicators for all entities from a downloaded archive
+    >>> wdi_load_bulk("WDI_CSV.zip", ["NY.GDP.PCAP.KD", "SP.POP.TOTL"])
+
+    Load all indicators for a few entities in wide format
+    >>> wdi_load_bulk("WDI_CSV.zip", entities=["USA", "CAN"], format="wide")
+
+    Filter the data further before collecting it
+    >>> wdi_load_bulk("WDI_CSV.zip", lazy=True).filter(pl.col("value") > 0).collect()
+
+    Reshape many indicators into the wide format with the streaming engine
+    >>> wdi_load_bulk("WDI_CSV.zip", format="wide", lazy=True).collect(engine="streaming")
+    """
+    if isinstance(indicators, str):
+        indicators = [indicators]
+    if isinstance(entities, str):
+        entities = [entities]
+
+    validate_format(format)
+
+    indicators_scanned = scan_bulk(
+        resolve_bulk_csv(Path(path)), indicators, entities, start_year, end_year
+    )
+    if lazy and format == "wide":
+        return pivot_wide_lazy(indicators_scanned, indicators)
+    if lazy:
+        return indicators_scanned
+
+    indicators_processed = reshape_indicators(indicators_scanned.collect(), format)
+    return format_output(relocate_entity_id(indicators_processed))
+
+
+def scan_bulk(csv_path, indicators, entities, start_year, end_year) -> pl.LazyFrame:
+    columns = pl.scan_csv(csv_path, infer_schema_length=0).collect_schema().names()
+    year_columns = [
+        column
+        for column in columns
+        if column.isdigit()
+        and (start_year is None or int(column) >= start_year)
+        and (end_year is None or int(column) <= end_year)
+    ]
+    # Values are parsed as floats by the reader, and all other columns as strings
+    indicators_scanned = pl.scan_csv(
+        csv_path,
+        infer_schema_length=0,
+        schema_overrides={column: pl.Float64 for column in columns if column.isdigit()},
+    )
+
+    if indicators is not None:
+        indicators_scanned = indicators_scanned.filter(
+            pl.col("Indicator Code").is_in(indicators)
+        )
+    if entities != ["all"]:
+        indicators_scanned = indicators_scanned.filter(
+            pl.col("Country Code").is_in([entity.upper() for entity in entities])
+        )
+
+    return (
+        indicators_scanned.select(*BULK_ID_COLUMNS, *year_columns)
+        .rename(BULK_ID_COLUMNS)
+        .unpivot(
+            index=["entity_id", "indicator_id"],
+            on=year_columns,
+            variable_name="year",
+            value_name="value",
+        )
+        .select(
+            pl.col("entity_id"),
+            pl.col("indicator_id"),
+            pl.col("value"),
+            pl.col("year").cast(pl.Int32),
+        )
+    )
+
+
+def resolve_bulk_csv(path: Path) -> Path:
+    if not zipfile.is_zipfile(path):
+        return path
+
+    with zipfile.ZipFile(path) as archive:
+        member = find_bulk_member(archive)
+        stat = path.stat()
+        key = hashlib.sha256(
+            f"{path.resolve()}:{stat.st_size}:{stat.st_mtime_ns}:{member}".encode()
+        ).hexdigest()[:16]
+        csv_path = default_cache_directory() / "bulk" / f"{key}-{Path(member).name}"
+        if not csv_path.exists():
+            extract_member(archive, member, csv_path)
+    return csv_path
+
+
+def find_bulk_member(archive: zipfile.ZipFile) -> str:
+    members = [name for name in archive.namelist() if name.lower().endswith(".csv")]
+    for member in members:
+        if Path(member).name.lower().endswith(BULK_DATA_SUFFIXES):
+            return member
+    if not members:
+        raise ValueError("The archive does not contain a CSV file.")
+    # Without a known name, the data file is by far the largest file in the archive
+    return max(members, key=lambda member: archive.getinfo(member).file_size)
+
+
+def extract_member(archive: zipfile.ZipFile, member: str, csv_path: Path):
+    csv_path.parent.mkdir(parents=True, exist_ok=True)
+    file, temporary_path = tempfile.mkstemp(dir=csv_path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(file, "wb") as temporary_file, archive.open(member) as source:
+            shutil.copyfileobj(source, temporary_file, 1024 * 1024)
+        os.replace(temporary_path, csv_path)
+    except BaseException:
+        os.unlink(temporary_path)
+        raise
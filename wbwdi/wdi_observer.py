@@ -0,0 +1,198 @@
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterable, List, Optional
+
+import polars as pl
+
+# Observers registered with `wdi_observe()` for the current thread or task
+OBSERVERS = contextvars.ContextVar("wbwdi_observers", default=())
+
+TIMINGS_SCHEMA = {
+    "event": pl.Utf8,
+    "count": pl.UInt32,
+    "duration": pl.Float64,
+    "rows": pl.Int64,
+    "bytes": pl.Int64,
+}
+
+
+@contextmanager
+def wdi_observe(*observers: Callable[[dict], None]):
+    """
+    Send the events of all downloads inside the block to the given observers.
+
+    An observer is a function that is called with every event as a dictionary. Each
+    event has the keys `event` (the name of the event) and `time` (the Unix time of
+    the event), plus keys that depend on the event:
+
+    - `request_start`: `url`, `resource` and `page` of a request to the API.
+    - `request_end`: `url`, `resource`, `page`, `pages` (the total number of pages, if
+      known), `status`, `bytes` (the size of the response body) and `duration` (the
+      latency in seconds, including retries).
+    - `decode`: `url`, `bytes` and `duration` of decoding a response body.
+    - `page`: `resource`, `page`, `pages`, `rows` and `completed` (the number of
+      delivered pages) of each page that is delivered.
+    - `parse`: `indicator`, `rows` and `duration` of parsing an indicator.
+    - `indicator`: `indicator`, `rows`, `completed` and `total` of each finished
+      indicator request when `wdi_get()` downloads indicators in parallel.
+    - `refresh`: `indicator`, `action`, `rows`, `completed` and `total` of each
+      indicator of `wdi_refresh()`.
+    - `pivot`: `rows` and `duration` of reshaping the data into the wide format.
+    - `entity_join`: `rows` and `duration` of mapping ISO2 to ISO3 codes.
+    - `wdi_get`: `rows` and `duration` of a whole `wdi_get()` call.
+
+    Observers are called in the thread that emits the event, so they must be thread
+    safe if indicators or pages are downloaded in parallel. Observers that apply to all
+    downloads of a client can be passed to `WDIClient(observers=...)` instead.
+
+    Parameters
+    ----------
+    *observers (callable): The functions that are called with each event.
+
+    Examples
+    --------
+    Log the latency of every request
+    >>> def log_request(event):
+    ...     if event["event"] == "request_end":
+    ...         print(event["url"], event["status"], event["duration"])
+    >>> with wdi_observe(log_request):
+    ...     wdi_get("USA", "SP.POP.TOTL")
+    """
+    token = OBSERVERS.set(OBSERVERS.get() + observers)
+    try:
+        yield
+    finally:
+        OBSERVERS.reset(token)
+
+
+class WDITimings:
+    """
+    An observer that collects events and summarizes where the time of downloads goes.
+
+    Use the collector as a context manager around one or more calls, or pass it to
+    `WDIClient(observers=...)` to record all downloads of a client.
+
+    Examples
+    --------
+    Find out whether a download spends its time in requests, parsing or reshaping
+    >>> with WDITimings() as timings:
+    ...     wdi_get("all", ["SP.POP.TOTL", "NY.GDP.PCAP.KD"], format="wide")
+    >>> timings.summary()
+
+    Inspect the individual requests
+    >>> timings.events().filter(pl.col("event") == "request_end")
+    """
+
+    def __init__(self):
+        self.records: List[dict] = []
+        self._lock = threading.Lock()
+        self._context = None
+
+    def __call__(self, event: dict):
+        with self._lock:
+            self.records.append(event)
+
+    def __enter__(self):
+        self._context = wdi_observe(self)
+        self._context.__enter__()
+        return self
+
+    def __exit__(self, *args):
+        self._context.__exit__(*args)
+        self._context = None
+
+    def events(self) -> pl.DataFrame:
+        """Return all collected events, one row per event."""
+        with self._lock:
+            records = list(self.records)
+        if not records:
+            return pl.DataFrame(schema={"event": pl.Utf8, "time": pl.Float64})
+        return pl.from_dicts(records, infer_schema_length=None)
+
+    def summary(self) -> pl.DataFrame:
+        """
+        Return the number of events, the total duration in seconds and the number of
+        rows and bytes per timed event, sorted by duration. Durations of parallel
+        requests overlap, so their sum can exceed the wall time of a call.
+        """
+        events = self.events()
+        if "duration" not in events.columns:
+            return pl.DataFrame(schema=TIMINGS_SCHEMA)
+        for column in ("rows", "bytes"):
+            if column not in events.columns:
+                events = events.with_columns(pl.lit(None, pl.Int64).alias(column))
+        return (
+            events.filter(pl.col("duration").is_not_null())
+            .group_by("event", maintain_order=True)
+            .agg(
+                count=pl.len().cast(pl.UInt32),
+                duration=pl.col("duration").sum(),
+                rows=pl.col("rows").sum().cast(pl.Int64),
+                bytes=pl.col("bytes").sum().cast(pl.Int64),
+            )
+            .sort("duration", descending=True, maintain_order=True)
+            .cast(TIMINGS_SCHEMA)
+        )
+
+    def clear(self):
+        """Remove all collected events."""
+        with self._lock:
+            self.records.clear()
+
+
+def emit(event: str, client=None, observers: Iterable = (), **fields):
+    """
+    Send an event to the observers of the current context, of the client and to the
+    given observers. Nothing is built if there is no observer.
+    """
+    observers = (*OBSERVERS.get(), *get_client_observers(client), *observers)
+    if not observers:
+        return
+    record = {"event": event, "time": time.time(), **fields}
+    for observer in observers:
+        observer(record)
+
+
+def get_client_observers(client) -> tuple:
+    if client is None:
+        # Without a client, the shared client is used, but not created just for events
+        from . import wdi_client
+
+        client = wdi_client.DEFAULT_CLIENT
+    return tuple(client.observers) if client is not None else ()
+
+
+def create_progress_observers(progress) -> tuple:
+    return (print_progress_observer,) if progress else ()
+
+
+def print_progress_observer(event: dict):
+    """The default observer of `progress=True`, which prints the completed pages."""
+    if event["event"] == "page":
+        if event["pages"] > 1:
+            print_progress(event["completed"], event["pages"])
+    elif event["event"] in ("indicator", "refresh"):
+        print_progress(event["completed"], event["total"])
+
+
+def print_progress(current: int, total: int):
+    print(f"Progress: {current}/{total}", end="\r")
+
+
+def submit_in_context(executor, function, *args):
+    """Submit a function to an executor with the observers of the current context."""
+    return executor.submit(contextvars.copy_context().run, function, *args)
+
+
+def parse_page_number(url: str) -> int:
+    _, _, page = url.rpartition("&page=")
+    return int(page) if page.isdigit() else 1
+
+
+def get_pages(body: Optional[list]) -> Optional[int]:
+    try:
+        return int(body[0]["pages"])
+    except (IndexError, KeyError, TypeError, ValueError):
+        return None
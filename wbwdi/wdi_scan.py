@@ -0,0 +1,366 @@
+import io
+import json
+import warnings
+from typing import Optional
+
+import polars as pl
+
+from .perform_request import iter_pages
+from .wdi_get import (
+    create_date,
+    create_entity_chunks,
+    create_indicator_resource,
+    create_indicator_schema,
+    create_period_bounds,
+    filter_entities,
+    map_entity_ids,
+    needs_entity_mapping,
+    parse_indicator,
+    plan_entity_chunks,
+    validate_frequency,
+    validate_source,
+)
+from .wdi_entity_snapshot import get_entity_mapping
+from .wdi_get_entities import get_entities
+
+# The serialized expressions that filters are read from have a known format since
+# Polars 1.32. With older versions, filters are applied after the download only.
+PUSHDOWN_MIN_POLARS_VERSION = (1, 32)
+# Errors of serialized expressions in an unknown format
+PREDICATE_ERRORS = (
+    AttributeError,
+    KeyError,
+    TypeError,
+    ValueError,
+    json.JSONDecodeError,
+    pl.exceptions.ComputeError,
+)
+# Only filters on these columns are pushed into the request
+PUSHDOWN_COLUMNS = {"entity_id", "indicator_id", "year"}
+COMPARISONS = {"Eq", "Gt", "GtEq", "Lt", "LtEq"}
+FLIPPED_COMPARISONS = {
+    "Eq": "Eq",
+    "Gt": "Lt",
+    "GtEq": "LtEq",
+    "Lt": "Gt",
+    "LtEq": "GtEq",
+}
+
+
+def wdi_scan(
+    indicators,
+    entities="all",
+    start_year=None,
+    end_year=None,
+    frequency="annual",
+    language="en",
+    per_page=1000,
+    source=None,
+    max_concurrency=1,
+    client=None,
+) -> pl.LazyFrame:
+    """
+    Lazily scan World Bank indicator data.
+
+    This function returns a `pl.LazyFrame` with the long format of `wdi_get()` without
+    sending any data request. When the frame is collected, filters on `indicator_id`,
+    `entity_id` and `year` are translated into the API request, so only the requested
+    indicators, entities and years are downloaded. Pages are parsed as they arrive, and
+    if `entity_id` is not selected, the mapping of ISO2 to ISO3 codes is skipped.
+
+    Parameters:
+    -----------
+    indicators (list of str): The indicators that can be scanned (e.g., ["NY.GDP.PCAP.KD", "SP.POP.TOTL"]). Filters on `indicator_id` restrict the download to a subset.
+    entities (list of str): The entities that can be scanned, or "all". Filters on `entity_id` restrict the download to a subset. Defaults to "all".
+    start_year (int, optional): The first year that can be scanned.
+    end_year (int, optional): The last year that can be scanned. The range is requested from the API if both years are given, whatever the filters of the frame.
+    frequency (str): The frequency of the data ("annual", "quarter", "month"). Defaults to "annual".
+    language (str): The language for the request. See wdi_get_languages for options. Defaults to "en".
+    per_page (int or str): The number of results per page for the API, or "auto" to choose the page size from the total number of results with as few requests as possible. Defaults to 1000.
+    source (int, optional): The data source, see wdi_get_sources.
+    max_concurrency (int): The maximum number of result pages per indicator that are downloaded in parallel. Defaults to 1.
+    client (WDIClient, optional): The client used to send requests. Defaults to the shared client, see `WDIClient`.
+
+    Returns:
+    -----------
+    pl.LazyFrame
+        A LazyFrame with the columns `entity_id` (ISO3 code), `indicator_id`, `value`,
+        `year`, and `quarter` or `month` for sub-annual frequencies.
+
+    Details:
+    -----------
+    Filters are pushed into the request if they are combined with `&` and compare a
+    column with literals: `==`, `is_in()`, `<`, `<=`, `>`, `>=` and `is_between()`. A
+    `year` filter is only pushed down if it bounds both the first and the last year.
+    All filters are applied to the downloaded rows again, so filters that cannot be
+    pushed down (e.g., combined with `|`) still return the correct result, but may
+    download more data. `entity_id` filters compare against ISO3 codes.
+
+    Filters are read from the serialized expression of Polars, whose format is not
+    stable across versions, so they are only pushed down with Polars 1.32 or later.
+    With older versions, or if a filter cannot be read, a warning is shown and the
+    download is only restricted by `indicators`, `entities`, `start_year` and
+    `end_year`, so pass these arguments to bound large scans explicitly.
+
+    Examples:
+    -----------
+    # Download only two entities and one decade
+    >>> (
+    ...     wdi_scan(["NY.GDP.PCAP.KD", "SP.POP.TOTL"])
+    ...     .filter(
+    ...         pl.col("entity_id").is_in(["USA", "CAN"]),
+    ...         pl.col("year").is_between(2010, 2019),
+    ...         pl.col("indicator_id") == "SP.POP.TOTL",
+    ...     )
+    ...     .collect()
+    ... )
+
+    # Bound the download explicitly, independent of the filters
+    >>> wdi_scan("SP.POP.TOTL", ["USA", "CAN"], start_year=2010, end_year=2019).collect()
+
+    # Skip the entity mapping by selecting other columns only
+    >>> wdi_scan("SP.POP.TOTL").filter(pl.col("year") == 2020).select("value").collect()
+    """
+    if isinstance(indicators, str):
+        indicators = [indicators]
+    if isinstance(entities, str):
+        entities = [entities]
+
+    validate_frequency(frequency)
+    validate_source(source, client)
+
+    try:
+        from polars.io.plugins import register_io_source
+    except ImportError as error:  # pragma: no cover
+        raise ImportError("`wdi_scan()` requires Polars 1.4 or later.") from error
+
+    schema = create_indicator_schema(frequency)
+
+    def scan_indicators(
+        with_columns: Optional[list],
+        predicate: Optional[pl.Expr],
+        n_rows: Optional[int],
+        batch_size: Optional[int],
+    ):
+        columns = list(schema) if with_columns is None else with_columns
+        filters = parse_predicate(predicate)
+
+        scan_entities = entities
+        if entities == ["all"] and filters.get("entity_id") is not None:
+            scan_entities = sorted(filters["entity_id"])
+        indicators_scanned = [
+            indicator
+            for indicator in indicators
+            if filters.get("indicator_id") is None
+            or indicator in filters["indicator_id"]
+        ]
+        scan_start_year, scan_end_year = intersect_bounds(
+            (start_year, end_year), filters.get("year")
+        )
+        if not scan_entities or (
+            scan_start_year is not None
+            and scan_end_year is not None
+            and scan_start_year > scan_end_year
+        ):
+            return
+
+        date = create_date(
+            *create_period_bounds(scan_start_year, scan_end_year, False, frequency)
+        )
+        entity_chunks = create_entity_chunks(scan_entities)
+        entity_filter = None
+        if len(entity_chunks) > 1:
+            entity_chunks, entity_filter = plan_entity_chunks(
+                scan_entities, entity_chunks, get_entities(client=client)
+            )
+
+        for indicator in indicators_scanned:
+            for entity_chunk in entity_chunks:
+                pages = iter_pages(
+                    create_indicator_resource(indicator, entity_chunk),
+                    language,
+                    per_page,
+                    date,
+                    False,
+                    source,
+                    max_concurrency=max_concurrency,
+                    client=client,
+                )
+                for page_raw in pages:
+                    page_parsed = filter_entities(
+                        parse_indicator(page_raw), entity_filter
+                    )
+                    if page_parsed.height == 0:
+                        continue
+                    if "entity_id" in columns and needs_entity_mapping(page_parsed):
+                        page_parsed = map_entity_ids(
+                            page_parsed, get_entity_mapping(page_parsed, client), client
+                        )
+                    page_parsed = filter_years(page_parsed, start_year, end_year)
+                    page_parsed = page_parsed.select(columns).cast(
+                        {column: schema[column] for column in columns}
+                    )
+                    if predicate is not None:
+                        page_parsed = page_parsed.filter(predicate)
+                    if n_rows is not None:
+                        page_parsed = page_parsed.head(n_rows)
+                        n_rows -= page_parsed.height
+                    yield page_parsed
+                    if n_rows == 0:
+                        return
+
+    return register_io_source(scan_indicators, schema=schema)
+
+
+def parse_predicate(predicate: Optional[pl.Expr]) -> dict:
+    """
+    Extract the values of `entity_id` and `indicator_id` and the range of `year` that
+    a predicate requires. Columns without a supported filter are missing from the result.
+    """
+    if predicate is None:
+        return {}
+    if get_polars_version() < PUSHDOWN_MIN_POLARS_VERSION:
+        warnings.warn(
+            "The filters of `wdi_scan()` are pushed into the request with Polars 1.32 "
+            "or later, so they are applied after downloading all data within the "
+            "arguments of `wdi_scan()`.",
+            stacklevel=2,
+        )
+        return {}
+    try:
+        tree = json.loads(predicate.meta.serialize(format="json"))
+        conditions = [parse_condition(node) for node in split_conjunctions(tree)]
+    except PREDICATE_ERRORS as error:
+        warnings.warn(
+            f"The filters of `wdi_scan()` could not be read ({error!r}), so they are "
+            "applied after downloading all data within the arguments of `wdi_scan()`.",
+            stacklevel=2,
+        )
+        return {}
+
+    filters = {}
+    for condition in conditions:
+        if condition is None:
+            continue
+        column, values, bounds = condition
+        if column in ("entity_id", "indicator_id") and values is not None:
+            values = {
+                str(value).upper() if column == "entity_id" else str(value)
+                for value in values
+            }
+            filters[column] = values & filters.get(column, values)
+        elif column == "year" and bounds is not None:
+            filters["year"] = intersect_bounds(filters.get("year"), bounds)
+    return filters
+
+
+def intersect_bounds(bounds, other) -> tuple:
+    start_year, end_year = bounds or (None, None)
+    other_start_year, other_end_year = other or (None, None)
+    if other_start_year is not None:
+        start_year = (
+            other_start_year
+            if start_year is None
+            else max(start_year, other_start_year)
+        )
+    if other_end_year is not None:
+        end_year = other_end_year if end_year is None else min(end_year, other_end_year)
+    return start_year, end_year
+
+
+def filter_years(indicator_parsed: pl.DataFrame, start_year, end_year) -> pl.DataFrame:
+    if start_year is not None:
+        indicator_parsed = indicator_parsed.filter(pl.col("year") >= start_year)
+    if end_year is not None:
+        indicator_parsed = indicator_parsed.filter(pl.col("year") <= end_year)
+    return indicator_parsed
+
+
+def get_polars_version() -> tuple:
+    return tuple(int(part) for part in pl.__version__.split(".")[:2])
+
+
+def split_conjunctions(node: dict) -> list:
+    binary = node.get("BinaryExpr")
+    if binary is not None and binary["op"] in ("And", "LogicalAnd"):
+        return split_conjunctions(binary["left"]) + split_conjunctions(binary["right"])
+    return [node]
+
+
+def parse_condition(node: dict):
+    """Return the column, the allowed values and the bounds of a simple condition."""
+    binary = node.get("BinaryExpr")
+    if binary is not None and binary["op"] in COMPARISONS:
+        op = binary["op"]
+        column, literal = binary["left"].get("Column"), binary["right"].get("Literal")
+        if column is None:
+            op = FLIPPED_COMPARISONS[op]
+            column, literal = (
+                binary["right"].get("Column"),
+                binary["left"].get("Literal"),
+            )
+        if column not in PUSHDOWN_COLUMNS or literal is None:
+            return None
+        value = parse_literal(literal)
+        if op == "Eq":
+            return column, [value], create_bounds(value, value)
+        if op == "Gt":
+            return column, None, create_bounds(value, None, lower_offset=1)
+        if op == "GtEq":
+            return column, None, create_bounds(value, None)
+        if op == "Lt":
+            return column, None, create_bounds(None, value, upper_offset=-1)
+        return column, None, create_bounds(None, value)
+
+    function = node.get("Function")
+    if function is not None:
+        inputs = function["input"]
+        if not inputs or inputs[0].get("Column") not in PUSHDOWN_COLUMNS:
+            return None
+        column = inputs[0]["Column"]
+        boolean = function["function"].get("Boolean", {})
+        if "IsIn" in boolean and len(inputs) == 2 and "Literal" in inputs[1]:
+            values = parse_literal(inputs[1]["Literal"])
+            if isinstance(values, list):
+                return column, values, None
+        if (
+            "IsBetween" in boolean
+            and len(inputs) == 3
+            and all("Literal" in bound for bound in inputs[1:])
+        ):
+            closed = boolean["IsBetween"].get("closed", "Both")
+            lower = parse_literal(inputs[1]["Literal"])
+            upper = parse_literal(inputs[2]["Literal"])
+            bounds = create_bounds(
+                lower,
+                upper,
+                lower_offset=1 if closed in ("Right", "None") else 0,
+                upper_offset=-1 if closed in ("Left", "None") else 0,
+            )
+            return column, None, bounds
+    return None
+
+
+def parse_literal(literal: dict):
+    """Read a serialized literal, raising ValueError on an unknown format."""
+    for kind in ("Dyn", "Scalar"):
+        if kind in literal and len(literal[kind]) == 1:
+            ((dtype, value),) = literal[kind].items()
+            if dtype == "List":
+                # List literals are serialized as an Arrow IPC stream of their values
+                return (
+                    pl.read_ipc_stream(io.BytesIO(bytes(value))).to_series().to_list()
+                )
+            return value
+    raise ValueError(f"Unsupported literal {sorted(literal)}.")
+
+
+def create_bounds(lower, upper, lower_offset=0, upper_offset=0):
+    if (lower is not None and not isinstance(lower, int)) or (
+        upper is not None and not isinstance(upper, int)
+    ):
+        return None
+    return (
+        None if lower is None else lower + lower_offset,
+        None if upper is None else upper + upper_offset,
+    )
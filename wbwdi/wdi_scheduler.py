@@ -0,0 +1,210 @@
+import asyncio
+import random
+import threading
+import time
+import weakref
+from email.utils import parsedate_to_datetime
+from typing import Awaitable, Callable, Optional
+
+import httpx
+
+# Rate limits and temporary server errors are retried, all other errors are final
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+THROTTLE_STATUS_CODES = {429, 503}
+# Failed connections (e.g., no network or an unknown host) are not temporary, so they
+# are raised at once instead of after all retries
+FINAL_TRANSPORT_ERRORS = (httpx.ConnectError,)
+
+
+class WDIScheduler:
+    """
+    An adaptive scheduler that limits and retries the requests of a client.
+
+    The scheduler keeps the number of requests in flight below a limit that adapts to
+    the API (additive increase, multiplicative decrease): every successful response
+    raises the limit slowly up to `max_concurrency`, while every rate limit response
+    (429 or 503) halves it. Rate limits, temporary server errors and network errors
+    such as timeouts are retried for each page separately, after the delay of the
+    `Retry-After` header or an exponential backoff with random jitter. Failed
+    connections, e.g., without network access, are raised without retrying.
+
+    Parameters
+    ----------
+    max_concurrency (int): The maximum number of requests in flight. Defaults to 10.
+    min_concurrency (int): The number of requests in flight that is always allowed,
+        even after repeated rate limits. Defaults to 1.
+    max_retries (int): The maximum number of retries per request. Use 0 to disable
+        retries. Defaults to 5.
+    backoff_base (float): The maximum delay in seconds before the first retry, which
+        doubles with every further retry. Defaults to 0.5.
+    backoff_max (float): The maximum delay in seconds between retries without a
+        `Retry-After` header. Defaults to 30.
+
+    Examples
+    --------
+    Retry more often and allow more parallel requests
+    >>> wdi_set_client(WDIClient(scheduler=WDIScheduler(max_concurrency=20, max_retries=10)))
+
+    Disable retries
+    >>> client = WDIClient(scheduler=WDIScheduler(max_retries=0))
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 10,
+        min_concurrency: int = 1,
+        max_retries: int = 5,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+    ):
+        validate_scheduler(
+            max_concurrency, min_concurrency, max_retries, backoff_base, backoff_max
+        )
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = min_concurrency
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.limit = float(max_concurrency)
+        self.in_flight = 0
+        self._condition = threading.Condition()
+        # Coroutines wait on an event of their own loop, which is set on a free slot
+        self._events: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+    @property
+    def concurrency(self) -> int:
+        """The current number of requests that may be in flight."""
+        return max(self.min_concurrency, int(self.limit))
+
+    def send(self, request: Callable[[], httpx.Response]) -> httpx.Response:
+        """Send a request with `request()`, waiting for a free slot and retrying."""
+        for attempt in range(self.max_retries + 1):
+            with self._condition:
+                self._condition.wait_for(lambda: self.in_flight < self.concurrency)
+                self.in_flight += 1
+            try:
+                response = request()
+            except httpx.TransportError as error:
+                if attempt == self.max_retries or is_final_error(error):
+                    raise
+                response = None
+            finally:
+                self.release()
+
+            if not self.should_retry(response, attempt):
+                return response
+            time.sleep(self.create_delay(response, attempt))
+
+    async def send_async(
+        self, request: Callable[[], Awaitable[httpx.Response]]
+    ) -> httpx.Response:
+        """Send a request with `await request()`, waiting for a free slot and retrying."""
+        for attempt in range(self.max_retries + 1):
+            await self.acquire_async()
+            try:
+                response = await request()
+            except httpx.TransportError as error:
+                if attempt == self.max_retries or is_final_error(error):
+                    raise
+                response = None
+            finally:
+                self.release()
+
+            if not self.should_retry(response, attempt):
+                return response
+            await asyncio.sleep(self.create_delay(response, attempt))
+
+    async def acquire_async(self):
+        # Waiting on the condition would block the event loop, so coroutines wait on an
+        # event of their loop instead. It is cleared before the check, so a slot that
+        # is released in between sets it again.
+        loop = asyncio.get_running_loop()
+        with self._condition:
+            event = self._events.setdefault(loop, asyncio.Event())
+        while True:
+            event.clear()
+            with self._condition:
+                if self.in_flight < self.concurrency:
+                    self.in_flight += 1
+                    return
+            await event.wait()
+
+    def release(self):
+        with self._condition:
+            self.in_flight -= 1
+            self._condition.notify()
+        self.notify_loops()
+
+    def notify_loops(self):
+        with self._condition:
+            events = list(self._events.items())
+        for loop, event in events:
+            try:
+                loop.call_soon_threadsafe(event.set)
+            except RuntimeError:  # The loop is closed
+                with self._condition:
+                    self._events.pop(loop, None)
+
+    def should_retry(self, response: Optional[httpx.Response], attempt: int) -> bool:
+        if response is not None and response.status_code in THROTTLE_STATUS_CODES:
+            self.decrease()
+        elif response is not None and response.status_code < 500:
+            self.increase()
+        if response is not None and response.status_code not in RETRY_STATUS_CODES:
+            return False
+        return attempt < self.max_retries
+
+    def increase(self):
+        with self._condition:
+            self.limit = min(self.max_concurrency, self.limit + 1 / self.concurrency)
+            self._condition.notify_all()
+        self.notify_loops()
+
+    def decrease(self):
+        with self._condition:
+            self.limit = max(self.min_concurrency, self.limit / 2)
+
+    def create_delay(self, response: Optional[httpx.Response], attempt: int) -> float:
+        retry_after = None
+        if response is not None:
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+        if retry_after is not None:
+            return retry_after
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2**attempt))
+
+
+def is_final_error(error: httpx.TransportError) -> bool:
+    return isinstance(error, FINAL_TRANSPORT_ERRORS)
+
+
+def validate_scheduler(
+    max_concurrency, min_concurrency, max_retries, backoff_base, backoff_max
+):
+    if not isinstance(max_concurrency, int) or max_concurrency < 1:
+        raise ValueError("`max_concurrency` must be a positive integer.")
+    if not isinstance(min_concurrency, int) or not (
+        1 <= min_concurrency <= max_concurrency
+    ):
+        raise ValueError(
+            "`min_concurrency` must be a positive integer not greater than "
+            "`max_concurrency`."
+        )
+    if not isinstance(max_retries, int) or max_retries < 0:
+        raise ValueError("`max_retries` must be a non-negative integer.")
+    if backoff_base < 0 or backoff_max < 0:
+        raise ValueError("`backoff_base` and `backoff_max` must be non-negative.")
+
+
+def parse_retry_after(retry_after: Optional[str]) -> Optional[float]:
+    """Parse a `Retry-After` header in seconds or as an HTTP date."""
+    if not retry_after:
+        return None
+    try:
+        return max(0.0, float(retry_after))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(retry_after)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
@@ -0,0 +1,472 @@
+import json
+import os
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional, Union
+
+import polars as pl
+
+from .perform_request import perform_request
+from .reshape_wide import TIME_COLUMNS
+from .wdi_cache import write_atomic
+from .wdi_get import (
+    create_indicator_schema,
+    create_period_bounds,
+    get_indicator,
+    map_entity_ids,
+    needs_entity_mapping,
+    validate_frequency,
+    validate_max_workers,
+    validate_progress,
+)
+from .wdi_entity_snapshot import get_entity_mapping
+from .wdi_get_indicators import process_indicators
+from .wdi_get_sources import get_sources
+from .wdi_observer import create_progress_observers, emit, submit_in_context
+
+MANIFEST_VERSION = 1
+
+REFRESH_SCHEMA = {
+    "indicator_id": pl.Utf8,
+    "frequency": pl.Utf8,
+    "action": pl.Utf8,
+    "rows": pl.Int64,
+}
+
+
+class WDIStore:
+    """
+    A local store of indicator data in partitioned Parquet files.
+
+    The store keeps one Parquet file per indicator and frequency under
+    `frequency=<frequency>/indicator_id=<indicator>/data.parquet`, always for all
+    entities. A JSON manifest records for each partition the source and its
+    `update_date` at the time of the download, and the range of years covered. Data
+    and manifest are written atomically, so readers never see partial files.
+
+    Parameters
+    ----------
+    path (str or Path): The directory of the store. It is created on the first write.
+
+    Examples
+    --------
+    Refresh indicators in a store and read them
+    >>> store = WDIStore("wdi-store")
+    >>> wdi_refresh(store, ["NY.GDP.PCAP.KD", "SP.POP.TOTL"])
+    >>> store.read(["NY.GDP.PCAP.KD", "SP.POP.TOTL"], start_year=2000, end_year=2020)
+
+    Inspect the partitions of a store
+    >>> store.info()
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+    @property
+    def manifest_path(self) -> Path:
+        return self.path / "manifest.json"
+
+    def manifest(self) -> dict:
+        try:
+            manifest = json.loads(self.manifest_path.read_bytes())
+        except FileNotFoundError:
+            return {"version": MANIFEST_VERSION, "partitions": {}}
+        if manifest.get("version") != MANIFEST_VERSION:
+            raise ValueError(
+                f"Unsupported store manifest version {manifest.get('version')}."
+            )
+        return manifest
+
+    def entry(self, indicator: str, frequency: str) -> Optional[dict]:
+        return self.manifest()["partitions"].get(
+            create_partition_key(indicator, frequency)
+        )
+
+    def partition_path(self, indicator: str, frequency: str) -> Path:
+        return (
+            self.path
+            / f"frequency={frequency}"
+            / f"indicator_id={indicator}"
+            / "data.parquet"
+        )
+
+    def read(
+        self,
+        indicators,
+        frequency: str = "annual",
+        start_year: Optional[int] = None,
+        end_year: Optional[int] = None,
+    ) -> pl.DataFrame:
+        """
+        Read stored indicator data in the long format of `wdi_get()`.
+
+        Parameters
+        ----------
+        indicators (list of str): The indicators to read.
+        frequency (str): The frequency of the data ("annual", "quarter", "month").
+            Defaults to "annual".
+        start_year (int, optional): The first year to read.
+        end_year (int, optional): The last year to read.
+
+        Returns
+        -------
+        pl.DataFrame
+            A DataFrame with the columns `entity_id` (ISO3 code), `indicator_id`,
+            `value`, `year`, and `quarter` or `month` for sub-annual frequencies.
+            Indicators that are not stored are missing from the result.
+        """
+        return self.scan(indicators, frequency, start_year, end_year).collect()
+
+    def scan(
+        self,
+        indicators,
+        frequency: str = "annual",
+        start_year: Optional[int] = None,
+        end_year: Optional[int] = None,
+    ) -> pl.LazyFrame:
+        """Lazily scan stored indicator data, see `read()`."""
+        if isinstance(indicators, str):
+            indicators = [indicators]
+        paths = [
+            self.partition_path(indicator, frequency)
+            for indicator in indicators
+            if self.partition_path(indicator, frequency).exists()
+        ]
+        schema = create_indicator_schema(frequency)
+        if not paths:
+            return pl.LazyFrame(schema=schema)
+
+        # Selecting the columns also aligns partitions written in an older column order
+        indicators_stored = pl.concat(
+            [pl.scan_parquet(path).select(schema.keys()) for path in paths]
+        )
+        if start_year is not None:
+            indicators_stored = indicators_stored.filter(pl.col("year") >= start_year)
+        if end_year is not None:
+            indicators_stored = indicators_stored.filter(pl.col("year") <= end_year)
+        return indicators_stored
+
+    def write(
+        self,
+        indicator: str,
+        frequency: str,
+        indicator_data: pl.DataFrame,
+        entry: dict,
+    ):
+        path = self.partition_path(indicator, frequency)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        file, temporary_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        os.close(file)
+        try:
+            indicator_data.write_parquet(temporary_path)
+            os.replace(temporary_path, path)
+        except BaseException:
+            os.unlink(temporary_path)
+            raise
+
+        with self._lock:
+            manifest = self.manifest()
+            manifest["partitions"][create_partition_key(indicator, frequency)] = entry
+            write_atomic(self.manifest_path, json.dumps(manifest, indent=2).encode())
+
+    def info(self) -> pl.DataFrame:
+        """
+        List the partitions of the store.
+
+        Returns
+        -------
+        pl.DataFrame
+            A DataFrame with one row per stored indicator and frequency and the columns
+            `indicator_id`, `frequency`, `source_id`, `source_update_date`,
+            `start_year`, `end_year` (both missing if all years are stored), `rows`
+            and `refreshed_at`.
+        """
+        entries = list(self.manifest()["partitions"].values())
+        return pl.DataFrame(
+            entries,
+            schema={
+                "indicator_id": pl.Utf8,
+                "frequency": pl.Utf8,
+                "source_id": pl.Int64,
+                "source_update_date": pl.Utf8,
+                "start_year": pl.Int64,
+                "end_year": pl.Int64,
+                "rows": pl.Int64,
+                "refreshed_at": pl.Utf8,
+            },
+        ).with_columns(
+            source_update_date=pl.col("source_update_date").str.to_date(),
+            refreshed_at=pl.col("refreshed_at").str.to_datetime(time_zone="UTC"),
+        )
+
+
+def wdi_refresh(
+    store,
+    indicators,
+    start_year=None,
+    end_year=None,
+    frequency="annual",
+    source=None,
+    language="en",
+    per_page=1000,
+    progress=True,
+    max_workers=1,
+    client=None,
+):
+    """
+    Refresh indicator data for all entities in a local store.
+
+    This function brings the stored data of the given indicators up to date. An
+    indicator is downloaded again only if its source has been updated since the last
+    refresh (according to `update_date` in `wdi_get_sources()`), or if it is not
+    stored yet. Otherwise, only the years that are requested but not stored yet are
+    downloaded and added to the stored data.
+
+    Parameters
+    ----------
+    store (str, Path or WDIStore): The store or the directory of the store.
+    indicators (list of str): The indicators to refresh.
+    start_year (int, optional): The first year that the store should contain.
+    end_year (int, optional): The last year that the store should contain. If
+        `start_year` or `end_year` is None, all available years are stored.
+    frequency (str): The frequency of the data ("annual", "quarter", "month").
+        Defaults to "annual".
+    source (int, optional): The data source of the indicators, see wdi_get_sources. If
+        None, the source of each indicator is looked up with one metadata request per
+        indicator.
+    language (str): The language for the request. Defaults to "en".
+    per_page (int or str): The number of results per page for the API, or "auto" to choose the page size from the total number of results with as few requests as possible. Defaults to 1000.
+    progress (bool): Whether to show the number of refreshed indicators. Defaults to True.
+    max_workers (int): The maximum number of indicators that are downloaded in
+        parallel. Defaults to 1.
+    client (WDIClient, optional): The client used to send requests. Defaults to the
+        shared client, see `WDIClient`.
+
+    Returns
+    -------
+    pl.DataFrame
+        A DataFrame with one row per indicator and the columns `indicator_id`,
+        `frequency`, `action` ("full" for a complete download, "incremental" for
+        missing years only, or "skipped" if the store is up to date) and `rows` (the
+        number of stored rows).
+
+    Examples
+    --------
+    Store all years of two indicators and refresh them, e.g., in a nightly job
+    >>> wdi_refresh("wdi-store", ["NY.GDP.PCAP.KD", "SP.POP.TOTL"])
+
+    Store a range of years and extend it later
+    >>> wdi_refresh("wdi-store", "SP.POP.TOTL", start_year=2010, end_year=2020)
+    >>> wdi_refresh("wdi-store", "SP.POP.TOTL", start_year=2000, end_year=2020)
+    """
+    store = resolve_store(store)
+    if isinstance(indicators, str):
+        indicators = [indicators]
+
+    validate_frequency(frequency)
+    validate_progress(progress)
+    validate_max_workers(max_workers)
+
+    if not (start_year and end_year):
+        start_year = end_year = None
+
+    source_versions = get_source_versions(indicators, source, language, client)
+
+    def refresh_indicator(indicator):
+        source_id, source_update_date = source_versions[indicator]
+        entry = store.entry(indicator, frequency)
+        action, year_ranges, coverage = plan_refresh(
+            entry, source_id, source_update_date, start_year, end_year
+        )
+        if action == "skipped":
+            return indicator, action, entry["rows"]
+
+        indicators_downloaded = [
+            download_indicator(
+                indicator,
+                year_range,
+                frequency,
+                source,
+                language,
+                per_page,
+                client,
+            )
+            for year_range in year_ranges
+        ]
+        if action == "incremental":
+            indicators_downloaded.insert(
+                0, pl.read_parquet(store.partition_path(indicator, frequency))
+            )
+        indicator_data = merge_indicator_data(indicators_downloaded, frequency)
+
+        store.write(
+            indicator,
+            frequency,
+            indicator_data,
+            {
+                "indicator_id": indicator,
+                "frequency": frequency,
+                "source_id": source_id,
+                "source_update_date": source_update_date,
+                "start_year": coverage[0],
+                "end_year": coverage[1],
+                "rows": indicator_data.height,
+                "refreshed_at": datetime.now(timezone.utc).isoformat(),
+            },
+        )
+        return indicator, action, indicator_data.height
+
+    progress_observers = create_progress_observers(progress)
+    refreshed = {}
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        futures = [
+            submit_in_context(executor, refresh_indicator, indicator)
+            for indicator in indicators
+        ]
+        for completed, future in enumerate(as_completed(futures), start=1):
+            indicator, action, rows = future.result()
+            refreshed[indicator] = (action, rows)
+            emit(
+                "refresh",
+                client,
+                progress_observers,
+                indicator=indicator,
+                action=action,
+                rows=rows,
+                completed=completed,
+                total=len(indicators),
+            )
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+    return pl.DataFrame(
+        [(indicator, frequency, *refreshed[indicator]) for indicator in indicators],
+        schema=REFRESH_SCHEMA,
+        orient="row",
+    )
+
+
+def resolve_store(store) -> WDIStore:
+    if isinstance(store, WDIStore):
+        return store
+    if isinstance(store, (str, Path)):
+        return WDIStore(store)
+    raise TypeError("`store` must be a path or a `WDIStore`.")
+
+
+def create_partition_key(indicator: str, frequency: str) -> str:
+    return f"{frequency}/{indicator}"
+
+
+def get_source_versions(indicators, source, language, client):
+    sources = get_sources(language, client)
+    update_dates = {
+        source_id: update_date.isoformat() if update_date else None
+        for source_id, update_date in zip(sources["source_id"], sources["update_date"])
+    }
+    if source is not None:
+        source_ids = {indicator: int(source) for indicator in indicators}
+    else:
+        source_ids = {
+            indicator: get_indicator_source(indicator, language, client)
+            for indicator in indicators
+        }
+    return {
+        indicator: (source_id, update_dates.get(source_id))
+        for indicator, source_id in source_ids.items()
+    }
+
+
+def get_indicator_source(indicator, language, client) -> Optional[int]:
+    # The metadata of a single indicator avoids downloading the whole catalog
+    indicator_metadata = process_indicators(
+        perform_request(f"indicator/{indicator}", language=language, client=client)
+    )
+    if indicator_metadata.height == 0:
+        return None
+    return indicator_metadata["source_id"][0]
+
+
+def plan_refresh(entry, source_id, source_update_date, start_year, end_year):
+    """
+    Decide how to bring a stored indicator up to date.
+
+    Returns the action, the ranges of years to download and the range of years that
+    the store covers afterwards, where (None, None) stands for all years.
+    """
+    if entry is None:
+        return "full", [(start_year, end_year)], (start_year, end_year)
+
+    stored_start, stored_end = entry["start_year"], entry["end_year"]
+    if stored_start is None or start_year is None:
+        coverage = (None, None)
+    else:
+        coverage = (min(start_year, stored_start), max(end_year, stored_end))
+
+    # Without a known update date, the stored data cannot be trusted to be current
+    if (
+        source_update_date is None
+        or entry["source_update_date"] is None
+        or entry["source_id"] != source_id
+        or source_update_date > entry["source_update_date"]
+    ):
+        return "full", [coverage], coverage
+
+    if stored_start is None:
+        return "skipped", [], coverage
+    if start_year is None:
+        return "full", [coverage], coverage
+
+    year_ranges = []
+    if start_year < stored_start:
+        year_ranges.append((start_year, stored_start - 1))
+    if end_year > stored_end:
+        year_ranges.append((stored_end + 1, end_year))
+    if not year_ranges:
+        return "skipped", [], coverage
+    return "incremental", year_ranges, coverage
+
+
+def download_indicator(
+    indicator, year_range, frequency, source, language, per_page, client
+):
+    start_year, end_year = create_period_bounds(*year_range, False, frequency)
+    indicator_parsed = get_indicator(
+        indicator,
+        ["all"],
+        start_year,
+        end_year,
+        False,
+        language,
+        per_page,
+        False,
+        source,
+        client=client,
+    )
+    schema = create_indicator_schema(frequency)
+    # Empty results are parsed without the `quarter` or `month` column
+    if indicator_parsed.height == 0:
+        return pl.DataFrame(schema=schema)
+    if needs_entity_mapping(indicator_parsed):
+        indicator_parsed = map_entity_ids(
+            indicator_parsed, get_entity_mapping(indicator_parsed, client), client
+        )
+    return indicator_parsed.select(schema.keys()).cast(schema)
+
+
+def merge_indicator_data(indicators_downloaded, frequency):
+    time_columns = [
+        column
+        for column in TIME_COLUMNS
+        if column in create_indicator_schema(frequency)
+    ]
+    return (
+        pl.concat(indicators_downloaded)
+        .unique(["entity_id", *time_columns], keep="last", maintain_order=True)
+        .sort(time_columns, maintain_order=True)
+    )